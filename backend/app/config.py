@@ -1,5 +1,7 @@
 """Application settings loaded from environment variables."""
 
+from typing import Literal
+
 from pydantic_settings import BaseSettings
 
 
@@ -11,6 +13,80 @@ class Settings(BaseSettings):
     ALLOWED_ORIGINS: str = "http://localhost:3000,http://localhost:5173,http://localhost:8080,https://portal.financecrew.ai"
     ENVIRONMENT: str = "development"
 
+    # Headless Chromium pool used by website scraping (0 disables the pool)
+    BROWSER_POOL_SIZE: int = 2
+    BROWSER_MAX_CONTEXTS: int = 4
+    BROWSER_RECYCLE_AFTER_PAGES: int = 50
+    BROWSER_HEALTH_CHECK_INTERVAL_S: int = 60
+
+    # HTTP-first scraping: below this many extracted chars, render in Chromium
+    SCRAPE_HTTP_MIN_TEXT_LENGTH: int = 500
+    # Third-party hosts (and their subdomains) never loaded during Chromium scrapes
+    SCRAPE_BLOCKED_HOSTS: str = (
+        "google-analytics.com,googletagmanager.com,doubleclick.net,googlesyndication.com,"
+        "facebook.net,hotjar.com,clarity.ms,segment.com,mixpanel.com,hubspot.com,"
+        "hs-scripts.com,hs-analytics.net,rdstation.com.br,intercom.io,zdassets.com,"
+        "zendesk.com,tawk.to,jivosite.com,crisp.chat,tiktok.com,linkedin.com"
+    )
+
+    # Same-origin crawl of high-value pages (sobre, produtos, pagamento, ...)
+    CRAWL_MAX_PAGES: int = 4
+    CRAWL_DEADLINE_S: float = 8.0
+    CRAWL_PER_HOST_CONCURRENCY: int = 2
+
+    # Domain-keyed cache of scraped text + extracted CompanyProfile
+    SCRAPE_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+    SCRAPE_CACHE_MAX_ENTRIES: int = 1000
+
+    # Shared OpenAI client connection pool
+    LLM_MAX_CONNECTIONS: int = 20
+    LLM_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    LLM_KEEPALIVE_EXPIRY_S: float = 60.0
+    # Needs the optional 'h2' package (httpx[http2]); ignored with a warning without it
+    LLM_HTTP2: bool = False
+    LLM_TIMEOUT_S: float = 180.0
+    LLM_CONNECT_TIMEOUT_S: float = 5.0
+
+    # LLM gateway retries: full-jitter exponential backoff bounded by a per-call deadline
+    LLM_RETRY_BASE_DELAY_S: float = 0.5
+    LLM_RETRY_MAX_DELAY_S: float = 8.0
+    LLM_MAX_ATTEMPTS: int = 5
+    LLM_DEFAULT_DEADLINE_S: float = 60.0
+    LLM_INTERACTIVE_DEADLINE_S: float = 20.0
+    LLM_BULK_DEADLINE_S: float = 180.0
+
+    # LLM admission control: in-flight requests per model and token budget per minute
+    LLM_MAX_CONCURRENCY_PER_MODEL: int = 8
+    LLM_TOKENS_PER_MINUTE: int = 200_000
+
+    # SQLite cache of LLM responses for deterministic prompts (opt-in per call site)
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_MAX_BYTES: int = 50 * 1024 * 1024
+
+    # Report generation: one call for the whole report, or concurrent calls per section
+    REPORT_GENERATION_MODE: Literal["single", "sectioned"] = "single"
+    # Output schema in report/simulation prompts: full | compact | typescript, or
+    # "structured" to send it as a json_schema response_format instead
+    PROMPT_SCHEMA_FORMAT: Literal["full", "compact", "typescript", "structured"] = "compact"
+
+    # Interview answer pre-filter (0..1 scores): at or above SUFFICIENT the follow-up
+    # LLM call is skipped, below VAGUE a templated follow-up is asked without it
+    ANSWER_QUALITY_SUFFICIENT_SCORE: float = 0.7
+    ANSWER_QUALITY_VAGUE_SCORE: float = 0.15
+
+    # Interview events replayed at most before a fresh state snapshot is written
+    INTERVIEW_SNAPSHOT_INTERVAL: int = 10
+
+    # Speculative follow-up evaluation of draft answers (POST /interview/draft)
+    FOLLOW_UP_SPECULATION_ENABLED: bool = True
+    FOLLOW_UP_SPECULATION_MAX_ENTRIES: int = 1000
+    FOLLOW_UP_SPECULATION_TTL_S: float = 600.0
+
+    # Background enrichment jobs (POST /enrich?background=true)
+    ENRICHMENT_WORKERS: int = 4
+    ENRICHMENT_MAX_QUEUED_JOBS: int = 50
+    ENRICHMENT_JOB_HISTORY: int = 500
+
     model_config = {"env_file": ".env", "env_file_encoding": "utf-8"}
 
 
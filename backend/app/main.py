@@ -1,5 +1,6 @@
 """FastAPI application initialization."""
 
+import logging
 from contextlib import asynccontextmanager
 
 from fastapi import Depends, FastAPI, Request
@@ -9,17 +10,40 @@ from slowapi.errors import RateLimitExceeded
 from slowapi.middleware import SlowAPIMiddleware
 
 from app.config import settings
-from app.database import Base, engine
+from app.database import Base, SessionLocal, engine
 from app.dependencies import verify_api_key
 from app.limiter import limiter
 from app.models import orm as _orm  # noqa: F401 — register models with Base
-from app.routers import agent, audio, enrichment, interview, sessions, simulation
+from app.routers import agent, audio, enrichment, interview, metrics, sessions, simulation
+from app.services import interview_store
+from app.services.browser_pool import browser_pool
+from app.services.enrichment_jobs import enrichment_jobs, reset_interrupted_enrichments
+from app.services.follow_up_speculation import follow_up_speculator
+from app.services.http_client import close_http_client
+from app.services.llm_client import close_llm_client, get_llm_client
+
+logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):  # type: ignore[no-untyped-def]
     Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        interview_store.migrate_legacy_states(db)
+        reset_interrupted_enrichments(db)
+    if settings.OPENAI_API_KEY:
+        get_llm_client()  # create the shared pool up front
+    try:
+        await browser_pool.start()
+    except Exception as exc:
+        # Scrapes fall back to launching a browser per request
+        logger.warning("Browser pool failed to start: %s", exc)
     yield
+    await enrichment_jobs.close()
+    await follow_up_speculator.close()
+    await browser_pool.close()
+    await close_http_client()
+    await close_llm_client()
 
 
 _is_production = settings.ENVIRONMENT == "production"
@@ -61,6 +85,7 @@ app.include_router(interview.router, dependencies=_auth)
 app.include_router(audio.router, dependencies=_auth)
 app.include_router(agent.router, dependencies=_auth)
 app.include_router(simulation.router, dependencies=_auth)
+app.include_router(metrics.router, dependencies=_auth)
 
 
 @app.get("/health")
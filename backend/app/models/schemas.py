@@ -62,6 +62,15 @@ class SubmitAnswerRequest(BaseModel):
     source: Literal["text", "audio"] = "text"
 
 
+class SubmitAnswersBatchRequest(BaseModel):
+    answers: list[SubmitAnswerRequest] = Field(..., min_length=1, max_length=20)
+
+
+class DraftAnswerRequest(BaseModel):
+    question_id: str = Field(..., min_length=1, max_length=100)
+    answer: str = Field(..., min_length=1, max_length=10000)
+
+
 class InterviewProgressResponse(BaseModel):
     phase: str
     total_answered: int
@@ -124,6 +133,16 @@ class CreateSessionResponse(BaseModel):
     status: str
 
 
+class EnrichmentJobResponse(BaseModel):
+    job_id: str
+    session_id: str
+    status: str
+    error: str | None = None
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+
+
 # --- OnboardingReport schemas (replaces AgentConfig) ---
 
 
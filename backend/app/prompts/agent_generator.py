@@ -1,6 +1,8 @@
 """Prompt for generating a complete OnboardingReport from onboarding data."""
 
 import json
+from functools import lru_cache
+from typing import Any
 
 from app.models.schemas import OnboardingReport
 from app.prompts.interview import (
@@ -8,12 +10,15 @@ from app.prompts.interview import (
     DEFAULT_GUARDRAILS,
     DEFAULT_TONE,
 )
+from app.prompts.schema_compact import SchemaFormat, render_schema
+from app.utils.text_signals import normalize, normalized_set
 
-_REPORT_SCHEMA = json.dumps(
-    OnboardingReport.model_json_schema(), indent=2, ensure_ascii=False
-)
+REPORT_JSON_SCHEMA: dict[str, Any] = OnboardingReport.model_json_schema()
 
-SYSTEM_PROMPT = (
+# Answers meaning "skipped" for optional questions (compared normalized: "Não" == "nao")
+SKIP_ANSWERS = normalized_set({"nao", "passo", "n", "nao respondida"})
+
+_SYSTEM_PROMPT_BODY = (
     "You are an expert debt collection consultant for Brazilian businesses. "
     "You receive structured data about a company (from website analysis and a detailed interview) "
     "and generate a complete OnboardingReport JSON — a structured SOP document that captures "
@@ -39,9 +44,75 @@ SYSTEM_PROMPT = (
     "- communication.tone_style: use 'friendly' as default. "
     "Map detected tones: 'formal' → 'formal', 'empático' → 'empathetic', "
     "'direto/assertivo' → 'assertive'.\n"
-    "- Always respond with valid JSON matching the OnboardingReport schema exactly."
 )
 
+SYSTEM_PROMPT = (
+    _SYSTEM_PROMPT_BODY
+    + "- Always respond with valid JSON matching the OnboardingReport schema exactly."
+)
+
+# Sectioned generation: independent slices of the report generated concurrently
+REPORT_SECTIONS: dict[str, tuple[str, ...]] = {
+    "profile": ("agent_identity", "company", "enrichment_summary", "collection_profile"),
+    "policies": ("collection_policies", "communication", "guardrails"),
+    "expert": ("expert_recommendations",),
+}
+
+SECTION_SYSTEM_PROMPT = (
+    _SYSTEM_PROMPT_BODY
+    + "- You are generating only PART of the report; other parts are generated separately. "
+    "Respond with a JSON object containing exactly the requested top-level fields, "
+    "matching the given schema slice."
+)
+
+
+def _collect_refs(node: object, refs: set[str]) -> None:
+    if isinstance(node, dict):
+        ref = node.get("$ref")
+        if isinstance(ref, str):
+            refs.add(ref.rsplit("/", 1)[-1])
+        for value in node.values():
+            _collect_refs(value, refs)
+    elif isinstance(node, list):
+        for value in node:
+            _collect_refs(value, refs)
+
+
+def _schema_slice(fields: tuple[str, ...]) -> dict[str, Any]:
+    """OnboardingReport JSON schema restricted to ``fields`` and the $defs they use."""
+    schema = REPORT_JSON_SCHEMA
+    properties = {name: schema["properties"][name] for name in fields}
+    all_defs = schema.get("$defs", {})
+    defs: dict[str, object] = {}
+    pending: set[str] = set()
+    _collect_refs(properties, pending)
+    while pending:
+        name = pending.pop()
+        if name in defs or name not in all_defs:
+            continue
+        defs[name] = all_defs[name]
+        _collect_refs(all_defs[name], pending)
+
+    sliced: dict[str, object] = {
+        "type": "object",
+        "properties": properties,
+        "required": [name for name in schema.get("required", []) if name in fields],
+    }
+    if defs:
+        sliced["$defs"] = dict(sorted(defs.items()))
+    return sliced
+
+
+SECTION_JSON_SCHEMAS: dict[str, dict[str, Any]] = {
+    name: _schema_slice(fields) for name, fields in REPORT_SECTIONS.items()
+}
+
+
+def report_schema(section: str | None = None) -> dict[str, Any]:
+    """JSON schema of the full report, or of one REPORT_SECTIONS slice."""
+    return REPORT_JSON_SCHEMA if section is None else SECTION_JSON_SCHEMAS[section]
+
+
 ADJUSTMENT_SYSTEM_PROMPT = (
     "You are an expert debt collection consultant for Brazilian businesses. "
     "A user has just adjusted an existing onboarding report. "
@@ -174,32 +245,99 @@ def _format_policy_answer(responses: list[dict], question_id: str, policy_name:
     return f"- {policy_name}: {answer}"
 
 
+@lru_cache(maxsize=None)
+def static_prefix(section: str | None = None, schema_format: SchemaFormat = "compact") -> str:
+    """Session-independent part of the user message: instructions, defaults and schema.
+
+    Built once per (section, schema_format): byte-identical across sessions
+    so the provider can cache the prefix.
+    """
+    parts: list[str] = []
+
+    if section is None:
+        parts.append(
+            "Gere um OnboardingReport JSON completo para documentar a operação de cobrança "
+            "com base nos dados da sessão, no final desta mensagem."
+        )
+    else:
+        fields = ", ".join(REPORT_SECTIONS[section])
+        parts.append(
+            "Gere APENAS os seguintes campos do OnboardingReport para documentar a "
+            f"operação de cobrança com base nos dados da sessão, no final desta mensagem: "
+            f"{fields}."
+        )
+
+    parts.append(
+        "## Dicas de Mapeamento\n"
+        "Use estas correspondências ao preencher o JSON:\n"
+        '- communication.tone_style: use "friendly" como padrão (amigável mas firme). '
+        'Se enrichment detectar tom diferente, mapear: '
+        '"formal" → "formal", "empático" → "empathetic", '
+        '"direto/assertivo" → "assertive"\n'
+        "- collection_profile: infira debt_type, typical_debtor_profile, "
+        "business_specific_objections, payment_verification_process e "
+        "sector_regulations com base no segmento e contexto da empresa\n"
+        "- collection_policies.collection_flow_description: resuma o fluxo de cobrança "
+        "descrito pelo cliente na entrevista"
+    )
+
+    defaults = ["## Padrões da Operação", f"- Tom padrão: {DEFAULT_TONE}"]
+    defaults.append("\n### Gatilhos de escalação (padrão)")
+    defaults.extend(f"- {trigger}" for trigger in DEFAULT_ESCALATION_TRIGGERS)
+    defaults.append("\n### O que o agente NUNCA deve fazer (padrão)")
+    defaults.extend(f"- {guardrail}" for guardrail in DEFAULT_GUARDRAILS)
+    parts.append("\n".join(defaults))
+
+    title = "OnboardingReport" if section is None else f"parte do OnboardingReport: {section}"
+    schema_text = render_schema(report_schema(section), schema_format)
+    if schema_text is None:
+        parts.append(
+            f"## Esquema JSON de Saída ({title})\n"
+            "Gere EXATAMENTE um JSON válido no formato de resposta estruturada da requisição."
+        )
+    else:
+        language = "typescript" if schema_format == "typescript" else "json"
+        parts.append(
+            f"## Esquema JSON de Saída ({title})\n"
+            "Gere EXATAMENTE um JSON válido que se encaixe neste schema:\n\n"
+            f"```{language}\n{schema_text}\n```"
+        )
+
+    parts.append("# Dados da Sessão")
+    return "\n\n".join(parts)
+
+
 def build_prompt(
     company_profile: dict | None,
     interview_responses: list[dict],
+    section: str | None = None,
+    schema_format: SchemaFormat = "compact",
 ) -> str:
     """Assemble all onboarding data into a structured prompt for OnboardingReport generation.
 
+    Static content (instructions, mapping hints, defaults, schema) comes
+    first and is identical for every session; session data follows it, so
+    consecutive generations share a cacheable prompt prefix.
+
     Args:
         company_profile: CompanyProfile dict from enrichment (or None).
         interview_responses: List of answer dicts, each with question_id,
             question_text, answer, source.
+        section: A key of REPORT_SECTIONS to ask only for that slice of the
+            report (sent alongside SECTION_SYSTEM_PROMPT), or None for the
+            full report.
+        schema_format: How the output schema is rendered (see
+            ``schema_compact.SchemaFormat``); "structured" leaves it out for
+            the json_schema response_format to carry.
 
     Returns:
         The full user message to send to the LLM alongside SYSTEM_PROMPT.
     """
-    sections: list[str] = []
-
-    # Intro
-    sections.append(
-        "Gere um OnboardingReport JSON completo para documentar a operação de cobrança "
-        "com base nos dados abaixo."
-    )
+    sections: list[str] = [static_prefix(section, schema_format)]
 
     # Section 0: Agent Identity (conditional — only if client named the agent)
     agent_name = _get_answer_by_id(interview_responses, "core_0")
-    skip_names = {"nao", "não", "passo", "n", "nao respondida", "não respondida"}
-    if agent_name.strip() and agent_name.strip().lower() not in skip_names:
+    if normalize(agent_name) and normalize(agent_name) not in SKIP_ANSWERS:
         sections.append(
             f"## 0. Identidade do Agente\n"
             f"- Nome escolhido para o agente: {agent_name}"
@@ -230,16 +368,14 @@ def build_prompt(
     )
     sections.append("\n".join(s3_lines))
 
-    # Section 4: Tom e Comunicação (default + enrichment override)
+    # Section 4: Tom e Comunicação (enrichment override of the default tone)
     s4_lines = ["## 4. Tom e Comunicação"]
-    tone = DEFAULT_TONE
     if company_profile and company_profile.get("communication_tone"):
         detected_tone = company_profile["communication_tone"].strip()
         s4_lines.append(f"- Tom detectado no site: {detected_tone}")
-        s4_lines.append(f"- Tom padrão: {DEFAULT_TONE}")
         s4_lines.append("- Use o tom detectado no site se disponível, senão use o padrão.")
     else:
-        s4_lines.append(f"- Tom padrão: {tone}")
+        s4_lines.append("- Nenhum tom detectado no site: use o tom padrão.")
     sections.append("\n".join(s4_lines))
 
     # Section 5: Políticas de Negociação (core_2-5 + follow-ups)
@@ -250,19 +386,13 @@ def build_prompt(
     s5_lines.append(_format_policy_answer(interview_responses, "core_5", "Multa por atraso"))
     sections.append("\n".join(s5_lines))
 
-    # Section 6: Guardrails e Escalação (defaults + core_6 optional text)
+    # Section 6: Guardrails e Escalação (core_6 optional text on top of the defaults)
     s6_lines = ["## 6. Guardrails e Escalação"]
-    s6_lines.append("### Gatilhos de escalação (padrão)")
-    for trigger in DEFAULT_ESCALATION_TRIGGERS:
-        s6_lines.append(f"- {trigger}")
-    # Add client-specified escalation triggers if provided
     core_6_answer = _get_answer_by_id(interview_responses, "core_6")
-    skip_answers = {"nao", "não", "nao respondida", "não respondida", "n", "passo"}
-    if core_6_answer.strip() and core_6_answer.strip().lower() not in skip_answers:
+    if normalize(core_6_answer) and normalize(core_6_answer) not in SKIP_ANSWERS:
         s6_lines.append(f"- Situação adicional indicada pelo cliente: {core_6_answer}")
-    s6_lines.append("\n### O que o agente NUNCA deve fazer (padrão)")
-    for guardrail in DEFAULT_GUARDRAILS:
-        s6_lines.append(f"- {guardrail}")
+    else:
+        s6_lines.append("- Nenhuma situação adicional: use os gatilhos e guardrails padrão.")
     sections.append("\n".join(s6_lines))
 
     # Review notes (if user added any during review step)
@@ -273,26 +403,4 @@ def build_prompt(
             f"{review_notes}"
         )
 
-    # Mapping hints
-    sections.append(
-        "## Dicas de Mapeamento\n"
-        "Use estas correspondências ao preencher o JSON:\n"
-        '- communication.tone_style: use "friendly" como padrão (amigável mas firme). '
-        'Se enrichment detectar tom diferente, mapear: '
-        '"formal" → "formal", "empático" → "empathetic", '
-        '"direto/assertivo" → "assertive"\n'
-        "- collection_profile: infira debt_type, typical_debtor_profile, "
-        "business_specific_objections, payment_verification_process e "
-        "sector_regulations com base no segmento e contexto da empresa\n"
-        "- collection_policies.collection_flow_description: resuma o fluxo de cobrança "
-        "descrito pelo cliente na entrevista"
-    )
-
-    # JSON Schema
-    sections.append(
-        "## Esquema JSON de Saída (OnboardingReport)\n"
-        "Gere EXATAMENTE um JSON válido que se encaixe neste schema:\n\n"
-        f"```json\n{_REPORT_SCHEMA}\n```"
-    )
-
     return "\n\n".join(sections)
@@ -76,6 +76,18 @@ POLICY_FOLLOWUP_MAP: dict[str, str] = {
     "core_5": "Como funciona a multa? (percentual, quando é aplicada, etc.)",
 }
 
+# Templated follow-ups for answers the local pre-filter scores as clearly vague
+VAGUE_ANSWER_FOLLOWUP_MAP: dict[str, str] = {
+    "core_1": (
+        "Pode detalhar o passo a passo? Por exemplo: quantos dias após o vencimento "
+        "começa o contato, por quais canais (WhatsApp, e-mail, ligação), quais formas de "
+        "pagamento vocês oferecem e o que acontece se o cliente continuar sem pagar."
+    ),
+}
+VAGUE_ANSWER_FOLLOWUP_DEFAULT = (
+    "Pode dar mais detalhes, com exemplos concretos de como isso funciona na sua empresa?"
+)
+
 # Hardcoded defaults (previously collected via core_7, core_8)
 DEFAULT_ESCALATION_TRIGGERS: list[str] = [
     "Devedor agressivo ou ameaçador",
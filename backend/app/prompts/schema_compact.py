@@ -0,0 +1,164 @@
+"""Compact renderings of Pydantic JSON schemas for LLM prompts.
+
+``model_json_schema()`` output is written for validators, not for models:
+``$ref``/``$defs`` indirection, a ``title`` on every field and defaults
+such as ``""`` or ``null`` that say nothing. The helpers here inline refs,
+drop that noise and render the result as minified JSON or as a
+TypeScript-style outline, which carries the same information in a
+fraction of the tokens.
+"""
+
+import json
+from typing import Any, Literal
+
+# How the output schema reaches the model:
+# - full: indented model_json_schema() dump in the user message (original layout)
+# - compact: minified compact schema in the user message
+# - typescript: TypeScript-style outline in the user message
+# - structured: OpenAI structured outputs (json_schema response_format), not in the prompt
+SchemaFormat = Literal["full", "compact", "typescript", "structured"]
+
+_DROPPED_KEYS = frozenset({"title"})
+
+# Constraints worth telling the model about, rendered as comments in outlines
+_CONSTRAINT_LABELS = {
+    "minLength": "min length",
+    "maxLength": "max length",
+    "minimum": "min",
+    "maximum": "max",
+    "minItems": "min items",
+    "maxItems": "max items",
+}
+
+
+def inline_refs(schema: dict[str, Any]) -> dict[str, Any]:
+    """Replace every ``$ref`` with the referenced ``$defs`` entry (non-recursive models)."""
+    defs = schema.get("$defs", {})
+
+    def resolve(node: Any) -> Any:
+        if isinstance(node, dict):
+            ref = node.get("$ref")
+            if isinstance(ref, str):
+                target = resolve(defs[ref.rsplit("/", 1)[-1]])
+                siblings = {k: resolve(v) for k, v in node.items() if k != "$ref"}
+                return {**target, **siblings}
+            return {k: resolve(v) for k, v in node.items() if k != "$defs"}
+        if isinstance(node, list):
+            return [resolve(item) for item in node]
+        return node
+
+    return resolve(schema)
+
+
+def _is_empty_default(value: Any) -> bool:
+    return value is None or value == "" or value == [] or value == {}
+
+
+def compact_schema(schema: dict[str, Any]) -> dict[str, Any]:
+    """Inline refs, drop titles and empty defaults, collapse ``X | null`` unions."""
+
+    def compact(node: Any) -> Any:
+        if isinstance(node, list):
+            return [compact(item) for item in node]
+        if not isinstance(node, dict):
+            return node
+        result: dict[str, Any] = {}
+        for key, value in node.items():
+            if key in _DROPPED_KEYS:
+                continue
+            if key == "default" and _is_empty_default(value):
+                continue
+            if key == "properties":
+                # Field names, not schema keywords: keep every key
+                result[key] = {name: compact(prop) for name, prop in value.items()}
+                continue
+            result[key] = compact(value)
+        variants = result.get("anyOf")
+        if isinstance(variants, list) and all(
+            set(v) == {"type"} and isinstance(v["type"], str) for v in variants
+        ):
+            result.pop("anyOf")
+            result["type"] = [v["type"] for v in variants]
+        return result
+
+    return compact(inline_refs(schema))
+
+
+def _outline_type(node: dict[str, Any], indent: int) -> str:
+    if "enum" in node:
+        return " | ".join(json.dumps(v, ensure_ascii=False) for v in node["enum"])
+    if "const" in node:
+        return json.dumps(node["const"], ensure_ascii=False)
+    if "anyOf" in node:
+        return " | ".join(_outline_type(v, indent) for v in node["anyOf"])
+
+    schema_type = node.get("type")
+    if isinstance(schema_type, list):
+        return " | ".join(_outline_type({**node, "type": t}, indent) for t in schema_type)
+    if schema_type == "object":
+        if "properties" in node:
+            return _outline_object(node, indent)
+        return "Record<string, any>"
+    if schema_type == "array":
+        item = _outline_type(node.get("items", {}), indent)
+        return f"({item})[]" if " | " in item else f"{item}[]"
+    if schema_type in ("integer", "number"):
+        return "number"
+    if schema_type in ("string", "boolean", "null"):
+        return schema_type
+    return "any"
+
+
+def _outline_object(node: dict[str, Any], indent: int) -> str:
+    pad = "  " * (indent + 1)
+    required = set(node.get("required", []))
+    lines = ["{"]
+    for name, prop in node["properties"].items():
+        optional = "" if name in required else "?"
+        line = f"{pad}{name}{optional}: {_outline_type(prop, indent + 1)};"
+        notes = []
+        if prop.get("description"):
+            notes.append(prop["description"])
+        notes.extend(
+            f"{label} {prop[key]}" for key, label in _CONSTRAINT_LABELS.items() if key in prop
+        )
+        if "default" in prop and not _is_empty_default(prop["default"]):
+            notes.append(f"default {json.dumps(prop['default'], ensure_ascii=False)}")
+        if notes:
+            line += " // " + "; ".join(str(n) for n in notes)
+        lines.append(line)
+    lines.append("  " * indent + "}")
+    return "\n".join(lines)
+
+
+def typescript_outline(schema: dict[str, Any]) -> str:
+    """Render a schema as a TypeScript-style type outline."""
+    return _outline_type(compact_schema(schema), 0)
+
+
+def render_schema(schema: dict[str, Any], schema_format: SchemaFormat) -> str | None:
+    """Text of ``schema`` to embed in a prompt, or None when it travels out of band."""
+    if schema_format == "full":
+        return json.dumps(schema, indent=2, ensure_ascii=False)
+    if schema_format == "compact":
+        return json.dumps(compact_schema(schema), ensure_ascii=False, separators=(",", ":"))
+    if schema_format == "typescript":
+        return typescript_outline(schema)
+    return None
+
+
+def response_format_for(
+    name: str, schema: dict[str, Any], schema_format: SchemaFormat
+) -> dict[str, Any]:
+    """``response_format`` for a chat completion producing ``schema``.
+
+    Structured outputs run in non-strict mode: strict mode would require every
+    field to be listed as required and forbid defaults, which the report and
+    simulation models rely on.
+    """
+    if schema_format != "structured":
+        return {"type": "json_object"}
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": name, "schema": compact_schema(schema), "strict": False},
+    }
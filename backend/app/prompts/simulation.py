@@ -1,12 +1,12 @@
 """Prompt for generating simulated debt collection conversations."""
 
-import json
+from functools import lru_cache
+from typing import Any
 
 from app.models.schemas import OnboardingReport, SimulationResult
+from app.prompts.schema_compact import SchemaFormat, render_schema
 
-_SIMULATION_SCHEMA = json.dumps(
-    SimulationResult.model_json_schema(), indent=2, ensure_ascii=False
-)
+SIMULATION_JSON_SCHEMA: dict[str, Any] = SimulationResult.model_json_schema()
 
 SYSTEM_PROMPT = (
     "You are an expert simulator of WhatsApp-based debt collection conversations "
@@ -54,20 +54,81 @@ SYSTEM_PROMPT = (
 )
 
 
-def build_simulation_prompt(report: OnboardingReport) -> str:
+@lru_cache(maxsize=None)
+def static_prefix(schema_format: SchemaFormat = "compact") -> str:
+    """Report-independent part of the user message: scenario instructions and schema.
+
+    Built once per schema_format: byte-identical across sessions so the
+    provider can cache the prefix.
+    """
+    parts: list[str] = []
+
+    parts.append(
+        "Gere 2 conversas simuladas de cobrança com base no relatório do agente, "
+        "no final desta mensagem."
+    )
+
+    # Scenario Instructions
+    parts.append(
+        "## Instruções dos Cenários\n\n"
+        "### Cenário 1: Devedor Cooperativo (mínimo 10 mensagens)\n"
+        "- O devedor quer pagar, pode precisar de condições\n"
+        "- O agente se apresenta, explica o motivo do contato, e inicia negociação\n"
+        "- O devedor faz perguntas sobre valores, prazos e formas de pagamento\n"
+        "- O agente negocia seguindo as políticas configuradas\n"
+        "- IMPORTANTE: só mencione desconto/parcelamento SE a empresa oferecer. "
+        "Só mencione ausência de multa/juros SE a empresa não cobra. "
+        "Siga as regras de 'quando mencionar políticas' do system prompt.\n"
+        "- O devedor considera e aceita uma proposta\n"
+        "- O agente confirma o acordo e envia o link de pagamento pelo WhatsApp\n"
+        "- Resolução esperada: 'full_payment' ou 'installment_plan'\n"
+        "- Dívida sugerida: entre R$500 e R$5.000\n\n"
+        "### Cenário 2: Devedor Resistente (mínimo 10 mensagens)\n"
+        "- O devedor contesta a dívida, desconfia, ou fica agressivo\n"
+        "- O agente mantém a calma, segue os guardrails e as recomendações do especialista\n"
+        "- O devedor testa os limites: questiona legitimidade, ignora mensagens, ameaça\n"
+        "- O agente tenta negociar, mas o devedor se recusa ou escala a agressividade\n"
+        "- O agente identifica gatilho de escalação e encerra educadamente\n"
+        "- Resolução esperada: 'escalated' ou 'no_resolution'\n"
+        "- Dívida sugerida: entre R$1.000 e R$10.000"
+    )
+
+    # Output Schema
+    schema_text = render_schema(SIMULATION_JSON_SCHEMA, schema_format)
+    if schema_text is None:
+        parts.append(
+            "## Esquema JSON de Saída (SimulationResult)\n"
+            "Gere EXATAMENTE um JSON válido no formato de resposta estruturada da requisição."
+        )
+    else:
+        language = "typescript" if schema_format == "typescript" else "json"
+        parts.append(
+            "## Esquema JSON de Saída (SimulationResult)\n"
+            "Gere EXATAMENTE um JSON válido que se encaixe neste schema:\n\n"
+            f"```{language}\n{schema_text}\n```"
+        )
+
+    parts.append("# Relatório do Agente")
+    return "\n\n".join(parts)
+
+
+def build_simulation_prompt(
+    report: OnboardingReport, schema_format: SchemaFormat = "compact"
+) -> str:
     """Assemble the OnboardingReport data into a structured prompt for simulation generation.
 
+    Static content (scenario instructions, schema) comes first and is
+    identical for every report; the report data follows it.
+
     Args:
         report: The complete OnboardingReport to simulate conversations for.
+        schema_format: How the output schema is rendered (see
+            ``schema_compact.SchemaFormat``).
 
     Returns:
         The full user message to send to the LLM alongside SYSTEM_PROMPT.
     """
-    sections: list[str] = []
-
-    sections.append(
-        "Gere 2 conversas simuladas de cobrança com base no relatório do agente abaixo."
-    )
+    sections: list[str] = [static_prefix(schema_format)]
 
     # Section 1: Expert Recommendations
     sections.append(
@@ -135,36 +196,4 @@ def build_simulation_prompt(report: OnboardingReport) -> str:
         f"- Regulamentações do setor: {prof.sector_regulations or 'Não especificado'}"
     )
 
-    # Section 7: Scenario Instructions
-    sections.append(
-        "## Instruções dos Cenários\n\n"
-        "### Cenário 1: Devedor Cooperativo (mínimo 10 mensagens)\n"
-        "- O devedor quer pagar, pode precisar de condições\n"
-        "- O agente se apresenta, explica o motivo do contato, e inicia negociação\n"
-        "- O devedor faz perguntas sobre valores, prazos e formas de pagamento\n"
-        "- O agente negocia seguindo as políticas configuradas\n"
-        "- IMPORTANTE: só mencione desconto/parcelamento SE a empresa oferecer. "
-        "Só mencione ausência de multa/juros SE a empresa não cobra. "
-        "Siga as regras de 'quando mencionar políticas' do system prompt.\n"
-        "- O devedor considera e aceita uma proposta\n"
-        "- O agente confirma o acordo e envia o link de pagamento pelo WhatsApp\n"
-        "- Resolução esperada: 'full_payment' ou 'installment_plan'\n"
-        "- Dívida sugerida: entre R$500 e R$5.000\n\n"
-        "### Cenário 2: Devedor Resistente (mínimo 10 mensagens)\n"
-        "- O devedor contesta a dívida, desconfia, ou fica agressivo\n"
-        "- O agente mantém a calma, segue os guardrails e as recomendações do especialista\n"
-        "- O devedor testa os limites: questiona legitimidade, ignora mensagens, ameaça\n"
-        "- O agente tenta negociar, mas o devedor se recusa ou escala a agressividade\n"
-        "- O agente identifica gatilho de escalação e encerra educadamente\n"
-        "- Resolução esperada: 'escalated' ou 'no_resolution'\n"
-        "- Dívida sugerida: entre R$1.000 e R$10.000"
-    )
-
-    # Section 8: Output Schema
-    sections.append(
-        "## Esquema JSON de Saída (SimulationResult)\n"
-        "Gere EXATAMENTE um JSON válido que se encaixe neste schema:\n\n"
-        f"```json\n{_SIMULATION_SCHEMA}\n```"
-    )
-
     return "\n\n".join(sections)
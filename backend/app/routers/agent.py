@@ -1,9 +1,11 @@
 """Agent generation, retrieval, and adjustment endpoints."""
 
 import logging
+from collections.abc import AsyncIterator
 
 from fastapi import APIRouter, Depends, HTTPException, Request
-from sqlalchemy.orm import Session
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session, sessionmaker
 
 logger = logging.getLogger(__name__)
 
@@ -11,7 +13,14 @@ from app.database import get_db
 from app.limiter import limiter
 from app.models.orm import OnboardingSession
 from app.models.schemas import AgentAdjustRequest, OnboardingReport
-from app.services.agent_generator import adjust_onboarding_report, generate_onboarding_report
+from app.services import interview_store
+from app.services.agent_generator import (
+    ReportSection,
+    adjust_onboarding_report,
+    generate_onboarding_report,
+    stream_onboarding_report,
+)
+from app.utils.sse import SSE_HEADERS, format_sse
 
 router = APIRouter(prefix="/api/v1/sessions", tags=["agent"])
 
@@ -21,6 +30,7 @@ router = APIRouter(prefix="/api/v1/sessions", tags=["agent"])
 async def generate_agent(
     request: Request,
     session_id: str,
+    bypass_cache: bool = False,
     db: Session = Depends(get_db),
 ) -> dict[str, object]:
     session = db.get(OnboardingSession, session_id)
@@ -39,8 +49,9 @@ async def generate_agent(
     try:
         report = await generate_onboarding_report(
             company_profile=session.enrichment_data,
-            interview_responses=session.interview_responses or [],
+            interview_responses=interview_store.responses(db, session),
             session_id=session_id,
+            bypass_cache=bypass_cache,
         )
     except ValueError as exc:
         session.status = "interviewed"
@@ -55,6 +66,76 @@ async def generate_agent(
     return {"status": "generated", "onboarding_report": report.model_dump()}
 
 
+@router.post("/{session_id}/agent/generate/stream")
+@limiter.limit("5/minute")
+async def generate_agent_stream(
+    request: Request,
+    session_id: str,
+    db: Session = Depends(get_db),
+) -> StreamingResponse:
+    """Generate the onboarding report, streaming sections as Server-Sent Events.
+
+    Emits one ``section`` event ({"name", "data"}) per top-level report field
+    as soon as the model has written it, then ``generated`` with the
+    validated, persisted report — or ``failed`` if generation fails.
+    """
+    session = db.get(OnboardingSession, session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    if session.status not in ("interviewed", "generated"):
+        raise HTTPException(
+            status_code=400,
+            detail="Interview must be completed before generating agent config",
+        )
+
+    company_profile = session.enrichment_data
+    interview_responses = interview_store.responses(db, session)
+    session.status = "generating"
+    db.commit()
+
+    # The request's DB session is closed once streaming starts
+    session_factory = sessionmaker(bind=db.get_bind())
+
+    async def events() -> AsyncIterator[str]:
+        seq = 0
+        persisted = False
+        try:
+            async for item in stream_onboarding_report(
+                company_profile=company_profile,
+                interview_responses=interview_responses,
+                session_id=session_id,
+            ):
+                seq += 1
+                if isinstance(item, ReportSection):
+                    yield format_sse("section", {"name": item.name, "data": item.data}, seq)
+                    continue
+                with session_factory() as stream_db:
+                    stored = stream_db.get(OnboardingSession, session_id)
+                    stored.agent_config = item.model_dump()
+                    stored.status = "generated"
+                    stream_db.commit()
+                persisted = True
+                yield format_sse(
+                    "generated",
+                    {"status": "generated", "onboarding_report": item.model_dump()},
+                    seq,
+                )
+        except ValueError:
+            logger.exception("Failed to generate onboarding report for session %s", session_id)
+            yield format_sse("failed", {"detail": "Internal server error"}, seq + 1)
+        finally:
+            # Also reached when the client disconnects mid-stream
+            if not persisted:
+                with session_factory() as stream_db:
+                    stored = stream_db.get(OnboardingSession, session_id)
+                    if stored is not None and stored.status == "generating":
+                        stored.status = "interviewed"
+                        stream_db.commit()
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
 @router.get("/{session_id}/agent", response_model=OnboardingReport)
 @limiter.limit("60/minute")
 async def get_agent(
@@ -1,14 +1,27 @@
 """Enrichment trigger and results endpoints."""
 
-from fastapi import APIRouter, Depends, HTTPException, Request
-from sqlalchemy.orm import Session
+import logging
+from collections.abc import AsyncIterator
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy.orm import Session, sessionmaker
 
 from app.database import get_db
 from app.limiter import limiter
 from app.models.orm import OnboardingSession
-from app.models.schemas import CompanyProfile
-from app.services.enrichment import extract_company_profile, scrape_website
-from app.services.web_research import search_company
+from app.models.schemas import CompanyProfile, EnrichmentJobResponse
+from app.services.enrichment_jobs import (
+    STATUS_BEFORE_ENRICHMENT,
+    JobEvent,
+    JobQueueFullError,
+    enrichment_jobs,
+)
+from app.utils.sse import SSE_HEADERS, SSE_KEEPALIVE, format_sse
+
+logger = logging.getLogger(__name__)
+
+SSE_HEARTBEAT_S = 15.0
 
 router = APIRouter(prefix="/api/v1/sessions", tags=["enrichment"])
 
@@ -17,7 +30,9 @@ router = APIRouter(prefix="/api/v1/sessions", tags=["enrichment"])
 @limiter.limit("5/minute")
 async def enrich_session(
     request: Request,
+    response: Response,
     session_id: str,
+    background: bool = Query(False, description="Run as a background job and return 202"),
     db: Session = Depends(get_db),
 ) -> dict[str, object]:
     session = db.get(OnboardingSession, session_id)
@@ -27,23 +42,30 @@ async def enrich_session(
     if session.enrichment_data is not None:
         raise HTTPException(status_code=409, detail="Session already enriched")
 
+    if session.status == "enriching":
+        raise HTTPException(status_code=409, detail="Enrichment already in progress")
+
+    if background:
+        session.status = "enriching"
+        db.commit()
+        try:
+            job = enrichment_jobs.submit(session_id, sessionmaker(bind=db.get_bind()))
+        except JobQueueFullError as exc:
+            session.status = STATUS_BEFORE_ENRICHMENT
+            db.commit()
+            raise HTTPException(status_code=503, detail="Enrichment queue is full") from exc
+        response.status_code = 202
+        return {"status": "enriching", "job_id": job.id}
+
     session.status = "enriching"
     db.commit()
 
-    website_text = await scrape_website(session.company_website)
-    profile = await extract_company_profile(session.company_name, website_text)
-
-    enrichment_dict = profile.model_dump()
-
-    web_research = await search_company(
-        session.company_name, session.company_website, segment=profile.segment
-    )
-    if web_research is not None:
-        enrichment_dict["web_research"] = web_research
-
-    session.enrichment_data = enrichment_dict
-    session.status = "enriched"
-    db.commit()
+    # Tracked like a background job, so /enrichment/events can follow it
+    try:
+        enrichment_dict = await enrichment_jobs.run_inline(session_id, db)
+    except Exception as exc:
+        logger.exception("Enrichment failed for session %s", session_id)
+        raise HTTPException(status_code=500, detail="Internal server error") from exc
 
     return {"status": "enriched", "enrichment_data": enrichment_dict}
 
@@ -60,6 +82,88 @@ async def get_enrichment(
         raise HTTPException(status_code=404, detail="Session not found")
 
     if session.enrichment_data is None:
+        if session.status == "enriching":
+            job = enrichment_jobs.latest_for_session(session_id)
+            return JSONResponse(  # type: ignore[return-value]
+                status_code=202,
+                content={
+                    "status": "enriching",
+                    "job_id": job.id if job else None,
+                    "partial_profile": job.partial_profile if job else None,
+                },
+            )
         raise HTTPException(status_code=404, detail="Session not enriched yet")
 
     return CompanyProfile(**session.enrichment_data)
+
+
+@router.get("/{session_id}/enrichment/jobs/{job_id}", response_model=EnrichmentJobResponse)
+@limiter.limit("120/minute")
+async def get_enrichment_job(
+    request: Request,
+    session_id: str,
+    job_id: str,
+) -> EnrichmentJobResponse:
+    job = enrichment_jobs.get(job_id)
+    if job is None or job.session_id != session_id:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return EnrichmentJobResponse(
+        job_id=job.id,
+        session_id=job.session_id,
+        status=job.status,
+        error=job.error,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+    )
+
+
+async def _replay(events: list[JobEvent]) -> AsyncIterator[JobEvent | None]:
+    for event in events:
+        yield event
+
+
+async def _sse_stream(source: AsyncIterator[JobEvent | None]) -> AsyncIterator[str]:
+    async for event in source:
+        if event is None:
+            yield SSE_KEEPALIVE
+        else:
+            yield format_sse(event.name, event.data, event.seq)
+
+
+@router.get("/{session_id}/enrichment/events")
+@limiter.limit("30/minute")
+async def stream_enrichment_events(
+    request: Request,
+    session_id: str,
+    db: Session = Depends(get_db),
+) -> StreamingResponse:
+    """Stream enrichment progress as Server-Sent Events.
+
+    Background jobs and blocking ``/enrich`` runs publish to the same job
+    registry. Events already emitted are replayed first, so clients can
+    connect at any time. For a session enriched without a job in this process
+    (after a restart, or a job pruned from history) the stored result is sent
+    as a short replay.
+    """
+    session = db.get(OnboardingSession, session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    job = enrichment_jobs.latest_for_session(session_id)
+    if job is not None:
+        source = job.stream(heartbeat_s=SSE_HEARTBEAT_S)
+    elif session.enrichment_data is not None:
+        profile = CompanyProfile(**session.enrichment_data).model_dump()
+        source = _replay([
+            JobEvent(seq=1, name="profile_extracted", data={"profile": profile}),
+            JobEvent(seq=2, name="enrichment_done",
+                     data={"enrichment_data": session.enrichment_data}),
+        ])
+    else:
+        raise HTTPException(status_code=404, detail="No enrichment in progress")
+
+    return StreamingResponse(
+        _sse_stream(source), media_type="text/event-stream", headers=SSE_HEADERS
+    )
@@ -1,28 +1,40 @@
 """Interview question flow endpoints."""
 
 from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from app.config import settings
 from app.database import get_db
 from app.limiter import limiter
 from app.models.orm import OnboardingSession
 from app.models.schemas import (
+    DraftAnswerRequest,
     InterviewProgressResponse,
     InterviewQuestion,
     InterviewReviewRequest,
     SubmitAnswerRequest,
+    SubmitAnswersBatchRequest,
 )
 from app.prompts.interview import CORE_QUESTIONS
-from app.services.interview_agent import (
-    create_interview,
-    deserialize_state,
-    serialize_state,
-    submit_answer,
-)
+from app.services import interview_store
+from app.services.follow_up_speculation import follow_up_speculator
+from app.services.interview_agent import create_interview, evaluates_follow_up, submit_answer
 
 router = APIRouter(prefix="/api/v1/sessions", tags=["interview"])
 
 
+def _commit_events(db: Session) -> None:
+    """Commit appended interview events; a concurrent write to the same session conflicts."""
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=409, detail="Interview was updated concurrently, reload and retry"
+        )
+
+
 @router.get("/{session_id}/interview/next")
 @limiter.limit("60/minute")
 async def get_next_question(
@@ -34,15 +46,16 @@ async def get_next_question(
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    if session.interview_state is None:
+    record = interview_store.load(db, session)
+    if record is None:
         # First call — initialize the interview
         enrichment = session.enrichment_data or {}
         state = await create_interview(enrichment_data=enrichment)
-        session.interview_state = serialize_state(state)
+        interview_store.record_started(db, session, state)
         session.status = "interviewing"
-        db.commit()
+        _commit_events(db)
     else:
-        state = deserialize_state(session.interview_state)
+        state = record.state
 
     if state["phase"] == "complete":
         return {"phase": "complete", "message": "Entrevista completa"}
@@ -71,49 +84,157 @@ async def post_submit_answer(
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    if session.interview_state is None:
+    record = interview_store.load(db, session)
+    if record is None:
         raise HTTPException(status_code=400, detail="Interview not started")
 
-    state = deserialize_state(session.interview_state)
+    state = record.state
 
     if state["phase"] == "complete":
         raise HTTPException(status_code=400, detail="Interview already complete")
 
+    follow_up_verdict = None
+    if evaluates_follow_up(state, body.question_id):
+        follow_up_verdict = await follow_up_speculator.take(
+            session_id, body.question_id, body.answer
+        )
+
     try:
         next_question, new_state = await submit_answer(
             state, body.question_id, body.answer, body.source,
+            follow_up_verdict=follow_up_verdict,
         )
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc))
 
-    # Persist answer in interview_responses (clean list for agent generation)
-    responses = list(session.interview_responses or [])
-    responses.append({
-        "question_id": body.question_id,
-        "answer": body.answer,
-        "source": body.source,
-    })
-    session.interview_responses = responses
-    session.interview_state = serialize_state(new_state)
-    db.commit()
+    # One appended event per answer; the state snapshot is refreshed periodically
+    interview_store.record_answer(db, session, record, new_state)
+    _commit_events(db)
+
+    return {"received": True, **_next_question_fields(next_question, new_state)}
+
+
+@router.post("/{session_id}/interview/answers")
+@limiter.limit("20/minute")
+async def post_submit_answers_batch(
+    request: Request,
+    session_id: str,
+    body: SubmitAnswersBatchRequest,
+    db: Session = Depends(get_db),
+) -> dict:
+    """Apply an ordered list of answers in one request and one transaction.
+
+    Each answer goes through ``submit_answer`` exactly as if it had been
+    posted alone. The batch stops after an answer that got an LLM follow-up
+    (the client has not seen that question yet), and before an answer that
+    does not reply to a pending policy follow-up or comes after the last
+    question. Answers not applied are counted in ``skipped``; any other
+    mismatch rejects the whole batch.
+    """
+    session = db.get(OnboardingSession, session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    record = interview_store.load(db, session)
+    if record is None:
+        raise HTTPException(status_code=400, detail="Interview not started")
+
+    state = record.state
+
+    if state["phase"] == "complete":
+        raise HTTPException(status_code=400, detail="Interview already complete")
+
+    next_question = None
+    applied = 0
+    for item in body.answers:
+        current = state.get("current_question")
+        if applied and (
+            current is None
+            or (state.get("needs_follow_up") and current["question_id"] != item.question_id)
+        ):
+            break
+
+        evaluated = evaluates_follow_up(state, item.question_id)
+        follow_up_verdict = None
+        if evaluated:
+            follow_up_verdict = await follow_up_speculator.take(
+                session_id, item.question_id, item.answer
+            )
+
+        try:
+            next_question, state = await submit_answer(
+                state, item.question_id, item.answer, item.source,
+                follow_up_verdict=follow_up_verdict,
+            )
+        except ValueError as exc:
+            db.rollback()
+            raise HTTPException(status_code=400, detail=str(exc))
+
+        interview_store.record_answer(db, session, record, state)
+        applied += 1
+        if evaluated and state.get("needs_follow_up"):
+            break
+
+    _commit_events(db)
+
+    return {
+        "applied": applied,
+        "skipped": len(body.answers) - applied,
+        **_next_question_fields(next_question, state),
+        "progress": _progress(state).model_dump(),
+    }
+
 
+def _next_question_fields(next_question: InterviewQuestion | None, state: dict) -> dict:
+    """Response fields describing where the interview goes after an answer."""
     if next_question is not None:
-        result: dict = {"received": True, "next_question": next_question.model_dump()}
-        if new_state.get("needs_follow_up"):
+        result: dict = {"next_question": next_question.model_dump()}
+        if state.get("needs_follow_up"):
             result["follow_up"] = next_question.model_dump()
         return result
 
-    phase = new_state["phase"]
+    phase = state["phase"]
     if phase == "review":
         message = "Entrevista concluída. Prossiga para revisão das respostas."
     else:
         message = "Nenhuma próxima pergunta disponível."
-    return {
-        "received": True,
-        "next_question": None,
-        "phase": phase,
-        "message": message,
-    }
+    return {"next_question": None, "phase": phase, "message": message}
+
+
+@router.post("/{session_id}/interview/draft", status_code=202)
+@limiter.limit("120/minute")
+async def post_draft_answer(
+    request: Request,
+    session_id: str,
+    body: DraftAnswerRequest,
+    db: Session = Depends(get_db),
+) -> dict:
+    """Evaluate the follow-up for a draft answer ahead of submission.
+
+    The frontend posts debounced drafts while the user types. Submitting the
+    same answer later reuses the speculative verdict, so the user does not
+    wait for the follow-up LLM call.
+    """
+    session = db.get(OnboardingSession, session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    record = interview_store.load(db, session)
+    if record is None:
+        raise HTTPException(status_code=400, detail="Interview not started")
+
+    state = record.state
+    current = state.get("current_question")
+    if current is None or current.get("question_id") != body.question_id:
+        raise HTTPException(status_code=400, detail="Draft is not for the current question")
+
+    if not settings.FOLLOW_UP_SPECULATION_ENABLED or not evaluates_follow_up(
+        state, body.question_id
+    ):
+        return {"speculating": False}
+
+    follow_up_speculator.speculate(session_id, state, body.question_id, body.answer)
+    return {"speculating": True}
 
 
 @router.get("/{session_id}/interview/progress")
@@ -127,7 +248,8 @@ async def get_interview_progress(
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    if session.interview_state is None:
+    record = interview_store.load(db, session)
+    if record is None:
         return InterviewProgressResponse(
             phase="not_started",
             total_answered=0,
@@ -137,7 +259,16 @@ async def get_interview_progress(
             is_complete=False,
         )
 
-    state = deserialize_state(session.interview_state)
+    progress = _progress(record.state)
+
+    if progress.is_complete and session.status != "interviewed":
+        session.status = "interviewed"
+        db.commit()
+
+    return progress
+
+
+def _progress(state: dict) -> InterviewProgressResponse:
     phase = state["phase"]
     core_total = len(CORE_QUESTIONS)
     core_answered = core_total - len(state["core_questions_remaining"])
@@ -153,19 +284,13 @@ async def get_interview_progress(
     else:
         estimated_remaining = 0
 
-    is_complete = phase in ("review", "complete")
-
-    if is_complete and session.status != "interviewed":
-        session.status = "interviewed"
-        db.commit()
-
     return InterviewProgressResponse(
         phase=phase,
         total_answered=total_answered,
         core_answered=core_answered,
         core_total=core_total,
         estimated_remaining=estimated_remaining,
-        is_complete=is_complete,
+        is_complete=phase in ("review", "complete"),
     )
 
 
@@ -181,16 +306,15 @@ async def get_interview_review(
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    if session.interview_state is None:
+    record = interview_store.load(db, session)
+    if record is None:
         raise HTTPException(status_code=400, detail="Interview not started")
 
-    state = deserialize_state(session.interview_state)
-
     # Check if already confirmed (phase == "complete")
-    confirmed = state["phase"] == "complete"
+    confirmed = record.state["phase"] == "complete"
 
     return {
-        "answers": session.interview_responses or [],
+        "answers": record.responses,
         "enrichment": session.enrichment_data or {},
         "confirmed": confirmed,
     }
@@ -209,31 +333,22 @@ async def confirm_interview_review(
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    if session.interview_state is None:
+    record = interview_store.load(db, session)
+    if record is None:
         raise HTTPException(status_code=400, detail="Interview not started")
 
-    state = deserialize_state(session.interview_state)
-    if state["phase"] not in ("review", "complete"):
+    if record.state["phase"] not in ("review", "complete"):
         raise HTTPException(
             status_code=400,
             detail="Entrevista ainda não concluída. Finalize as perguntas antes de confirmar.",
         )
 
-    # Store additional notes as a special entry in interview_responses
-    if body.additional_notes and body.additional_notes.strip():
-        responses = list(session.interview_responses or [])
-        responses.append({
-            "question_id": "review_notes",
-            "answer": body.additional_notes.strip(),
-            "source": "text",
-        })
-        session.interview_responses = responses
-
-    state["phase"] = "complete"
-    session.interview_state = serialize_state(state)
+    # Additional notes become a special "review_notes" entry in the answers
+    notes = (body.additional_notes or "").strip() or None
+    interview_store.record_review_confirmed(db, session, record, notes)
     if session.status != "interviewed":
         session.status = "interviewed"
-    db.commit()
+    _commit_events(db)
 
     return {
         "confirmed": True,
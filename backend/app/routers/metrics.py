@@ -0,0 +1,22 @@
+"""Operational metrics endpoints."""
+
+from fastapi import APIRouter, Request
+
+from app.limiter import limiter
+from app.services import llm_cache, llm_gateway
+from app.services.follow_up_speculation import follow_up_speculator
+from app.services.llm_admission import admission_controller
+
+router = APIRouter(prefix="/api/v1/metrics", tags=["metrics"])
+
+
+@router.get("/llm")
+@limiter.limit("60/minute")
+async def llm_metrics(request: Request) -> dict[str, object]:
+    """Admission queue state, cache counters, token usage and follow-up speculation."""
+    return {
+        "admission": admission_controller.snapshot(),
+        "cache": llm_cache.stats(),
+        "usage": llm_gateway.usage_stats(),
+        "speculation": follow_up_speculator.stats(),
+    }
@@ -7,6 +7,7 @@ from app.database import get_db
 from app.limiter import limiter
 from app.models.orm import OnboardingSession
 from app.models.schemas import CreateSessionRequest, CreateSessionResponse, SessionPublicResponse
+from app.services import interview_store
 
 router = APIRouter(prefix="/api/v1/sessions", tags=["sessions"])
 
@@ -39,4 +40,8 @@ async def get_session(
     session = db.get(OnboardingSession, session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
-    return SessionPublicResponse.model_validate(session)
+    response = SessionPublicResponse.model_validate(session)
+    record = interview_store.load(db, session)
+    if record is not None:
+        response.interview_responses = record.responses
+    return response
@@ -21,6 +21,7 @@ router = APIRouter(prefix="/api/v1/sessions", tags=["simulation"])
 async def generate_simulation_endpoint(
     request: Request,
     session_id: str,
+    bypass_cache: bool = False,
     db: Session = Depends(get_db),
 ) -> dict[str, object]:
     session = db.get(OnboardingSession, session_id)
@@ -44,7 +45,9 @@ async def generate_simulation_endpoint(
 
     try:
         report = OnboardingReport(**session.agent_config)
-        result = await generate_simulation(report, session_id=session_id)
+        result = await generate_simulation(
+            report, session_id=session_id, bypass_cache=bypass_cache
+        )
     except ValueError as exc:
         session.status = "generated"
         db.commit()
@@ -1,21 +1,29 @@
 """Onboarding report generation via LLM."""
 
+import asyncio
 import copy
 import json
 import logging
+from collections.abc import AsyncIterator
+from contextlib import aclosing
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Any
 
-from openai import AsyncOpenAI, OpenAIError
-
 from app.config import settings
 from app.models.schemas import OnboardingReport
 from app.prompts.agent_generator import (
     ADJUSTMENT_SYSTEM_PROMPT,
+    REPORT_SECTIONS,
+    SECTION_SYSTEM_PROMPT,
     SYSTEM_PROMPT,
     build_adjustment_prompt,
     build_prompt,
+    report_schema,
 )
+from app.prompts.schema_compact import response_format_for
+from app.services.llm_gateway import LLMCallError, chat_completion, stream_chat_completion
+from app.utils.json_stream import JsonObjectStream
 
 logger = logging.getLogger(__name__)
 
@@ -69,10 +77,33 @@ def _apply_sanity_checks(
     return corrections
 
 
+def _finalize_report(
+    data: dict,
+    interview_responses: list[dict],
+    session_id: str,
+) -> OnboardingReport:
+    """Inject metadata, apply sanity checks and validate raw LLM output."""
+    if "metadata" not in data or not isinstance(data["metadata"], dict):
+        data["metadata"] = {}
+    data["metadata"]["generated_at"] = datetime.now(timezone.utc).isoformat()
+    data["metadata"]["session_id"] = session_id
+    data["metadata"]["model"] = "gpt-4.1-mini"
+
+    # Sanity checks (may raise ValueError for fatal issues)
+    corrections = _apply_sanity_checks(data, interview_responses)
+    if corrections:
+        logger.info(
+            "Applied %d sanity corrections to onboarding report", len(corrections)
+        )
+
+    return OnboardingReport(**data)
+
+
 async def generate_onboarding_report(
     company_profile: dict | None,
     interview_responses: list[dict],
     session_id: str = "",
+    bypass_cache: bool = False,
 ) -> OnboardingReport:
     """Generate a complete OnboardingReport by calling GPT-4.1-mini.
 
@@ -80,56 +111,182 @@ async def generate_onboarding_report(
         company_profile: CompanyProfile dict from enrichment (or None).
         interview_responses: List of answer dicts from the interview.
         session_id: Onboarding session ID for metadata.
+        bypass_cache: Ignore a cached response for identical inputs.
 
     Returns:
         Validated OnboardingReport instance.
 
     Raises:
-        ValueError: If LLM fails after 2 attempts or output fails sanity checks.
+        ValueError: If the LLM call fails for good or output fails sanity checks.
     """
-    client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
-    user_message = build_prompt(company_profile, interview_responses)
-
-    for attempt in range(2):
-        try:
-            response = await client.chat.completions.create(
-                model="gpt-4.1-mini",
-                messages=[
-                    {"role": "system", "content": SYSTEM_PROMPT},
-                    {"role": "user", "content": user_message},
-                ],
-                response_format={"type": "json_object"},
-                temperature=0.3,
-            )
-            data = json.loads(response.choices[0].message.content)
-
-            # Inject metadata
-            if "metadata" not in data or not isinstance(data["metadata"], dict):
-                data["metadata"] = {}
-            data["metadata"]["generated_at"] = datetime.now(timezone.utc).isoformat()
-            data["metadata"]["session_id"] = session_id
-            data["metadata"]["model"] = "gpt-4.1-mini"
-
-            # Sanity checks (may raise ValueError for fatal issues)
-            corrections = _apply_sanity_checks(data, interview_responses)
-            if corrections:
-                logger.info(
-                    "Applied %d sanity corrections to onboarding report", len(corrections)
-                )
+    if settings.REPORT_GENERATION_MODE == "sectioned":
+        return await generate_onboarding_report_sectioned(
+            company_profile, interview_responses, session_id, bypass_cache
+        )
 
-            return OnboardingReport(**data)
+    schema_format = settings.PROMPT_SCHEMA_FORMAT
+    user_message = build_prompt(
+        company_profile, interview_responses, schema_format=schema_format
+    )
 
-        except ValueError:
-            raise
-        except (OpenAIError, json.JSONDecodeError, KeyError, Exception) as exc:
-            logger.warning(
-                "Report generation attempt %d failed: %s", attempt + 1, exc
-            )
-            if attempt == 0:
-                continue
-            raise ValueError(
-                "Falha na geração do relatório após 2 tentativas."
-            ) from exc
+    def parse(response) -> OnboardingReport:
+        data = json.loads(response.choices[0].message.content)
+        return _finalize_report(data, interview_responses, session_id)
+
+    try:
+        return await chat_completion(
+            call_site="agent_generator.generate",
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": user_message},
+            ],
+            response_format=response_format_for(
+                "OnboardingReport", report_schema(), schema_format
+            ),
+            temperature=0.3,
+            priority="bulk",
+            parse=parse,
+            cache=True,
+            bypass_cache=bypass_cache,
+        )
+    except LLMCallError as exc:
+        logger.warning("Report generation failed: %s", exc)
+        raise ValueError("Falha na geração do relatório.") from exc
+
+
+async def _generate_section(
+    section: str,
+    company_profile: dict | None,
+    interview_responses: list[dict],
+    bypass_cache: bool,
+) -> dict[str, Any]:
+    """Generate one slice of the report (the fields in REPORT_SECTIONS[section])."""
+    fields = REPORT_SECTIONS[section]
+    schema_format = settings.PROMPT_SCHEMA_FORMAT
+    user_message = build_prompt(
+        company_profile, interview_responses, section=section, schema_format=schema_format
+    )
+
+    def parse(response) -> dict[str, Any]:
+        data = json.loads(response.choices[0].message.content)
+        for name in fields:
+            if name not in data and OnboardingReport.model_fields[name].is_required():
+                raise KeyError(name)
+        return {name: data[name] for name in fields if name in data}
+
+    return await chat_completion(
+        call_site=f"agent_generator.section.{section}",
+        messages=[
+            {"role": "system", "content": SECTION_SYSTEM_PROMPT},
+            {"role": "user", "content": user_message},
+        ],
+        response_format=response_format_for(
+            f"OnboardingReport_{section}", report_schema(section), schema_format
+        ),
+        temperature=0.3,
+        priority="bulk",
+        parse=parse,
+        cache=True,
+        bypass_cache=bypass_cache,
+    )
+
+
+async def generate_onboarding_report_sectioned(
+    company_profile: dict | None,
+    interview_responses: list[dict],
+    session_id: str = "",
+    bypass_cache: bool = False,
+) -> OnboardingReport:
+    """Generate the report as concurrent calls, one per REPORT_SECTIONS slice.
+
+    Each call only writes its own fields, so wall-clock time is close to the
+    slowest section rather than the whole report. The merged result goes
+    through the same sanity checks and validation as single-call generation.
+
+    Raises:
+        ValueError: If any section fails for good or the merged report fails checks.
+    """
+    tasks = [
+        asyncio.create_task(
+            _generate_section(section, company_profile, interview_responses, bypass_cache)
+        )
+        for section in REPORT_SECTIONS
+    ]
+    try:
+        parts = await asyncio.gather(*tasks)
+    except LLMCallError as exc:
+        logger.warning("Sectioned report generation failed: %s", exc)
+        raise ValueError("Falha na geração do relatório.") from exc
+    finally:
+        # One section failed for good: don't keep paying for the others
+        for task in tasks:
+            task.cancel()
+
+    data: dict[str, Any] = {}
+    for part in parts:
+        data.update(part)
+    return _finalize_report(data, interview_responses, session_id)
+
+
+@dataclass
+class ReportSection:
+    """A top-level OnboardingReport field, complete as streamed by the model."""
+
+    name: str
+    data: Any
+
+
+async def stream_onboarding_report(
+    company_profile: dict | None,
+    interview_responses: list[dict],
+    session_id: str = "",
+) -> AsyncIterator[ReportSection | OnboardingReport]:
+    """Generate an OnboardingReport, yielding each section as soon as it is complete.
+
+    Sections are yielded as the model writes them (unvalidated). The last
+    item is the validated OnboardingReport, built exactly as in
+    ``generate_onboarding_report``.
+
+    Raises:
+        ValueError: If the LLM call fails or output fails validation/sanity checks.
+    """
+    schema_format = settings.PROMPT_SCHEMA_FORMAT
+    user_message = build_prompt(
+        company_profile, interview_responses, schema_format=schema_format
+    )
+    parser = JsonObjectStream()
+    data: dict[str, Any] = {}
+
+    deltas = stream_chat_completion(
+        call_site="agent_generator.generate_stream",
+        messages=[
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": user_message},
+        ],
+        response_format=response_format_for(
+            "OnboardingReport", report_schema(), schema_format
+        ),
+        temperature=0.3,
+        priority="bulk",
+    )
+    try:
+        # aclosing: if our consumer stops early, close the LLM stream now, not at GC
+        async with aclosing(deltas):
+            async for delta in deltas:
+                for name, value in parser.feed(delta):
+                    data[name] = value
+                    yield ReportSection(name=name, data=value)
+    except (LLMCallError, json.JSONDecodeError) as exc:
+        logger.warning("Streamed report generation failed: %s", exc)
+        raise ValueError("Falha na geração do relatório.") from exc
+
+    if not parser.done:
+        raise ValueError("Falha na geração do relatório: resposta incompleta.")
+
+    try:
+        yield _finalize_report(data, interview_responses, session_id)
+    except (KeyError, TypeError) as exc:
+        raise ValueError("Falha na geração do relatório.") from exc
 
 
 def _apply_dotted_path_adjustments(
@@ -208,37 +365,25 @@ async def adjust_onboarding_report(
     adjusted_dict["metadata"]["generated_at"] = datetime.now(timezone.utc).isoformat()
 
     # Step 3: Regenerate expert_recommendations via LLM
-    client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
     user_message = build_adjustment_prompt(adjusted_dict, adjustments_summary)
 
-    for attempt in range(2):
-        try:
-            response = await client.chat.completions.create(
-                model="gpt-4.1-mini",
-                messages=[
-                    {"role": "system", "content": ADJUSTMENT_SYSTEM_PROMPT},
-                    {"role": "user", "content": user_message},
-                ],
-                response_format={"type": "json_object"},
-                temperature=0.3,
-            )
-            regen_data = json.loads(response.choices[0].message.content)
-
-            adjusted_dict["expert_recommendations"] = regen_data["expert_recommendations"]
-
-            break
-
-        except ValueError:
-            raise
-        except (OpenAIError, json.JSONDecodeError, KeyError, Exception) as exc:
-            logger.warning(
-                "Adjustment regeneration attempt %d failed: %s", attempt + 1, exc
-            )
-            if attempt == 0:
-                continue
-            raise ValueError(
-                "Falha na regeneração do relatório após 2 tentativas."
-            ) from exc
+    try:
+        adjusted_dict["expert_recommendations"] = await chat_completion(
+            call_site="agent_generator.adjust",
+            messages=[
+                {"role": "system", "content": ADJUSTMENT_SYSTEM_PROMPT},
+                {"role": "user", "content": user_message},
+            ],
+            response_format={"type": "json_object"},
+            temperature=0.3,
+            priority="bulk",
+            parse=lambda response: json.loads(
+                response.choices[0].message.content
+            )["expert_recommendations"],
+        )
+    except LLMCallError as exc:
+        logger.warning("Adjustment regeneration failed: %s", exc)
+        raise ValueError("Falha na regeneração do relatório.") from exc
 
     # Step 4: Validate final result via Pydantic
     return OnboardingReport(**adjusted_dict)
@@ -0,0 +1,95 @@
+"""Deterministic answer-quality scoring used before the follow-up LLM call.
+
+Scores an interview answer from cheap local signals: length, numbers and
+percentages, step markers and coverage of collection-domain keywords.
+Clearly detailed answers skip the LLM evaluation, clearly vague ones get a
+templated follow-up, and only the uncertain middle goes to the LLM.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Literal
+
+from app.config import settings
+from app.utils.text_signals import SignalMatcher, fold
+
+Verdict = Literal["sufficient", "vague", "uncertain"]
+
+# Distinct aspects of a collection process; coverage counts groups, not words.
+# Terms match whole words, stems ending in "*" match word prefixes
+# ("parcel*" -> "parcelamento"); accents ignored. Short words stay whole so
+# "mes" misses "promessas" and "carta" misses "descartar".
+DOMAIN_KEYWORD_GROUPS: dict[str, tuple[str, ...]] = {
+    "channels": (
+        "whatsapp", "e-mail*", "email*", "sms", "ligacao*", "telefone*", "carta", "cartas",
+    ),
+    "payment": (
+        "boleto*", "pix", "cartao", "cartoes", "link", "links", "transferencia*", "debito*",
+    ),
+    "timing": ("vencimento*", "atraso*", "dias", "semana*", "prazo*", "mes", "meses"),
+    "escalation": (
+        "negativacao*", "serasa", "spc", "protesto*", "juridico*", "judicial*",
+        "cartorio*", "advogado*", "suspensao*", "bloqueio*", "corte", "cortes",
+    ),
+    "negotiation": (
+        "acordo*", "renegoci*", "parcel*", "desconto*", "negocia*", "juros", "multa*",
+    ),
+    "reminders": ("lembrete*", "notificacao*", "aviso*", "cobranca*", "contato*", "mensage*"),
+}
+
+_KEYWORD_GROUP = {term: group for group, terms in DOMAIN_KEYWORD_GROUPS.items() for term in terms}
+_KEYWORD_MATCHER = SignalMatcher(_KEYWORD_GROUP)
+
+_NUMBER = re.compile(r"\d+(?:[.,]\d+)?")
+_PERCENT = re.compile(r"\d+(?:[.,]\d+)?\s*%")
+_MONEY = re.compile(r"r\$\s*\d")
+_DEADLINE = re.compile(r"\bd\s*[+-]\s*\d+|\b\d+\s*(?:dias?|horas?|semanas?|mes(?:es)?)\b")
+_LIST_ITEM = re.compile(r"(?:^|\n)\s*(?:\d+\s*[.)\-º]|[-•*])\s*\S")
+_SEQUENCE_WORDS = re.compile(
+    r"\b(?:primeiro|depois|em seguida|apos|entao|por fim|finalmente|caso|se nao)\b"
+)
+
+
+@dataclass(frozen=True)
+class AnswerQuality:
+    score: float
+    verdict: Verdict
+    signals: dict[str, int] = field(default_factory=dict)
+
+
+def score_answer(answer: str) -> AnswerQuality:
+    """Score how detailed an answer is, in [0, 1], and classify it.
+
+    Thresholds come from ANSWER_QUALITY_SUFFICIENT_SCORE and
+    ANSWER_QUALITY_VAGUE_SCORE. Answers of three words or fewer are always
+    vague.
+    """
+    text = fold(answer.strip())
+    words = len(text.split())
+    numbers = len(_NUMBER.findall(text))
+    signals = {
+        "words": words,
+        "numbers": numbers,
+        "percentages": len(_PERCENT.findall(text)),
+        "amounts": len(_MONEY.findall(text)),
+        "deadlines": len(_DEADLINE.findall(text)),
+        "steps": len(_LIST_ITEM.findall(text)) + len(_SEQUENCE_WORDS.findall(text)),
+        "keyword_groups": len({_KEYWORD_GROUP[t] for t in _KEYWORD_MATCHER.find_all(text)}),
+    }
+
+    specifics = numbers + signals["percentages"] + signals["amounts"] + signals["deadlines"]
+    score = (
+        0.3 * min(words / 80, 1.0)
+        + 0.2 * min(specifics / 4, 1.0)
+        + 0.2 * min(signals["steps"] / 3, 1.0)
+        + 0.3 * min(signals["keyword_groups"] / 4, 1.0)
+    )
+    score = round(score, 3)
+
+    if words <= 3 or score < settings.ANSWER_QUALITY_VAGUE_SCORE:
+        verdict: Verdict = "vague"
+    elif score >= settings.ANSWER_QUALITY_SUFFICIENT_SCORE:
+        verdict = "sufficient"
+    else:
+        verdict = "uncertain"
+    return AnswerQuality(score=score, verdict=verdict, signals=signals)
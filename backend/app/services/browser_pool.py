@@ -0,0 +1,248 @@
+"""Warm headless Chromium pool shared by website scrapes."""
+
+import asyncio
+import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from playwright.async_api import Browser, BrowserContext, Playwright, async_playwright
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class _PooledBrowser:
+    """A single Chromium process plus its bookkeeping."""
+
+    def __init__(self, browser: Browser) -> None:
+        self.browser = browser
+        self.active_contexts = 0
+        self.pages_served = 0
+        self.retiring = False
+        self.replacing = False  # claimed for relaunch; never handed out
+
+    def is_healthy(self) -> bool:
+        return self.browser.is_connected()
+
+
+class BrowserPool:
+    """Keep N Chromium instances warm and hand out isolated contexts.
+
+    Each scrape gets its own ``BrowserContext`` (separate cookies, cache and
+    storage), so sharing a browser never leaks state between companies.
+    A browser is recycled in the background after ``recycle_after_pages``
+    contexts, and disconnected browsers are relaunched by the periodic
+    health check.
+    """
+
+    def __init__(
+        self,
+        size: int | None = None,
+        max_contexts_per_browser: int | None = None,
+        recycle_after_pages: int | None = None,
+        health_check_interval_s: float | None = None,
+    ) -> None:
+        self.size = settings.BROWSER_POOL_SIZE if size is None else size
+        self.max_contexts_per_browser = (
+            settings.BROWSER_MAX_CONTEXTS
+            if max_contexts_per_browser is None
+            else max_contexts_per_browser
+        )
+        self.recycle_after_pages = (
+            settings.BROWSER_RECYCLE_AFTER_PAGES
+            if recycle_after_pages is None
+            else recycle_after_pages
+        )
+        self.health_check_interval_s = (
+            settings.BROWSER_HEALTH_CHECK_INTERVAL_S
+            if health_check_interval_s is None
+            else health_check_interval_s
+        )
+        self._playwright: Playwright | None = None
+        self._browsers: list[_PooledBrowser] = []
+        self._condition = asyncio.Condition()
+        self._health_task: asyncio.Task | None = None
+        self._recycle_tasks: set[asyncio.Task[None]] = set()
+
+    @property
+    def started(self) -> bool:
+        return self._playwright is not None
+
+    async def start(self) -> None:
+        """Launch the playwright driver and the warm browsers."""
+        if self.started or self.size <= 0:
+            return
+        self._playwright = await async_playwright().start()
+        try:
+            for _ in range(self.size):
+                self._browsers.append(_PooledBrowser(await self._launch()))
+        except Exception:
+            await self.close()
+            raise
+        if self.health_check_interval_s > 0:
+            self._health_task = asyncio.create_task(self._health_loop())
+        logger.info("Browser pool started with %d Chromium instances", self.size)
+
+    async def close(self) -> None:
+        """Close every browser and stop the playwright driver."""
+        if self._health_task is not None:
+            self._health_task.cancel()
+            try:
+                await self._health_task
+            except asyncio.CancelledError:
+                pass
+            self._health_task = None
+
+        recycling = list(self._recycle_tasks)
+        for task in recycling:
+            task.cancel()
+        await asyncio.gather(*recycling, return_exceptions=True)
+
+        for pooled in self._browsers:
+            await self._close_browser(pooled.browser)
+        self._browsers = []
+
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+    @asynccontextmanager
+    async def context(self) -> AsyncIterator[BrowserContext]:
+        """Borrow an isolated browser context, waiting for a free slot if needed."""
+        pooled = await self._acquire()
+        context: BrowserContext | None = None
+        try:
+            context = await pooled.browser.new_context()
+            yield context
+        finally:
+            if context is not None:
+                try:
+                    await context.close()
+                except Exception as exc:
+                    logger.warning("Failed to close browser context: %s", exc)
+            await self._release(pooled)
+
+    async def check_health(self) -> int:
+        """Relaunch disconnected, idle browsers. Returns how many were replaced."""
+        async with self._condition:
+            dead = []
+            while (pooled := self._claim_dead_idle()) is not None:
+                dead.append(pooled)
+        results = await asyncio.gather(*(self._replace(b) for b in dead), return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning("Failed to relaunch pooled browser: %s", result)
+        return sum(1 for result in results if not isinstance(result, Exception))
+
+    # ---------- internals ----------
+
+    async def _launch(self) -> Browser:
+        assert self._playwright is not None
+        return await self._playwright.chromium.launch(headless=True)
+
+    @staticmethod
+    async def _close_browser(browser: Browser) -> None:
+        try:
+            await browser.close()
+        except Exception as exc:
+            logger.warning("Failed to close pooled browser: %s", exc)
+
+    async def _replace(self, pooled: _PooledBrowser) -> None:
+        """Swap a claimed browser (``replacing`` set) for a freshly launched one.
+
+        Called without the lock: closing and launching Chromium is slow, and
+        other borrowers keep using the rest of the pool meanwhile.
+        """
+        await self._close_browser(pooled.browser)
+        try:
+            browser = await self._launch()
+        except BaseException:
+            async with self._condition:
+                pooled.replacing = False
+                self._condition.notify_all()
+            raise
+        async with self._condition:
+            if pooled in self._browsers:
+                self._browsers[self._browsers.index(pooled)] = _PooledBrowser(browser)
+                self._condition.notify_all()
+                return
+        # The pool was closed while launching
+        await self._close_browser(browser)
+
+    def _claim_dead_idle(self) -> _PooledBrowser | None:
+        """Mark one disconnected, idle browser for replacement (caller holds the lock)."""
+        for pooled in self._browsers:
+            if pooled.active_contexts == 0 and not pooled.replacing and not pooled.is_healthy():
+                pooled.replacing = True
+                return pooled
+        return None
+
+    def _pick(self) -> _PooledBrowser | None:
+        candidates = [
+            b for b in self._browsers
+            if not b.retiring
+            and not b.replacing
+            and b.active_contexts < self.max_contexts_per_browser
+            and b.is_healthy()
+        ]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda b: b.active_contexts)
+
+    async def _acquire(self) -> _PooledBrowser:
+        if not self.started:
+            raise RuntimeError("Browser pool is not started")
+        while True:
+            async with self._condition:
+                pooled = self._pick()
+                if pooled is not None:
+                    pooled.active_contexts += 1
+                    return pooled
+                dead = self._claim_dead_idle()
+                if dead is None:
+                    await self._condition.wait()
+                    continue
+            # Replace dead idle browsers inline instead of waiting for the health loop
+            await self._replace(dead)
+
+    async def _release(self, pooled: _PooledBrowser) -> None:
+        async with self._condition:
+            pooled.active_contexts -= 1
+            pooled.pages_served += 1
+            if self.recycle_after_pages > 0 and pooled.pages_served >= self.recycle_after_pages:
+                pooled.retiring = True
+            recycle = (
+                pooled in self._browsers
+                and not pooled.replacing
+                and (pooled.retiring or not pooled.is_healthy())
+                and pooled.active_contexts == 0
+            )
+            if recycle:
+                pooled.replacing = True
+                # The borrower returns now; the relaunch happens off its path
+                task = asyncio.create_task(self._recycle(pooled))
+                self._recycle_tasks.add(task)
+                task.add_done_callback(self._recycle_tasks.discard)
+            self._condition.notify_all()
+
+    async def _recycle(self, pooled: _PooledBrowser) -> None:
+        logger.info("Recycling pooled browser after %d pages", pooled.pages_served)
+        try:
+            await self._replace(pooled)
+        except Exception as exc:
+            # Left disconnected: the next acquire or health check relaunches it
+            logger.warning("Failed to recycle pooled browser: %s", exc)
+
+    async def _health_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.health_check_interval_s)
+            try:
+                replaced = await self.check_health()
+                if replaced:
+                    logger.warning("Health check relaunched %d browsers", replaced)
+            except Exception as exc:
+                logger.warning("Browser pool health check failed: %s", exc)
+
+
+browser_pool = BrowserPool()
@@ -0,0 +1,174 @@
+"""Bounded same-origin crawl of high-value company pages."""
+
+import asyncio
+import logging
+import unicodedata
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+HOMEPAGE_PRIORITY = 0
+
+# Path keywords → priority (lower is more relevant to CompanyProfile).
+# Paths are accent-folded and lowercased before matching.
+PAGE_KEYWORDS: list[tuple[int, tuple[str, ...]]] = [
+    (1, ("pagamento", "pagar", "boleto", "financeiro", "cobranca", "payment")),
+    (2, ("sobre", "quem-somos", "quemsomos", "institucional", "empresa", "about")),
+    (3, ("produto", "servico", "solucao", "solucoes", "planos", "precos", "product",
+         "service", "pricing")),
+    (4, ("faq", "duvidas", "perguntas", "ajuda", "termos", "politica")),
+]
+
+# Relative weight of each priority when splitting the text budget
+PRIORITY_WEIGHTS: dict[int, int] = {0: 4, 1: 3, 2: 2, 3: 2, 4: 1}
+
+_SKIP_EXTENSIONS = (
+    ".pdf", ".jpg", ".jpeg", ".png", ".gif", ".webp", ".svg", ".zip", ".mp4",
+    ".mp3", ".doc", ".docx", ".xls", ".xlsx",
+)
+
+
+@dataclass
+class PageText:
+    priority: int
+    url: str
+    text: str
+
+
+def _fold(value: str) -> str:
+    normalized = unicodedata.normalize("NFKD", value.lower())
+    return "".join(c for c in normalized if not unicodedata.combining(c))
+
+
+def _origin(url: str) -> tuple[str, str]:
+    """Scheme-agnostic origin key, treating 'www.' as the same host."""
+    parsed = urlparse(url)
+    host = (parsed.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    return host, str(parsed.port or "")
+
+
+def _link_priority(url: str) -> int | None:
+    path = _fold(urlparse(url).path)
+    for priority, keywords in PAGE_KEYWORDS:
+        if any(keyword in path for keyword in keywords):
+            return priority
+    return None
+
+
+def select_crawl_targets(links: list[str], base_url: str, limit: int) -> list[tuple[int, str]]:
+    """Pick up to ``limit`` same-origin links whose path looks relevant.
+
+    Returns (priority, url) pairs, most relevant first.
+    """
+    base_origin = _origin(base_url)
+    base_path = urlparse(base_url).path.rstrip("/")
+    candidates: dict[str, tuple[int, str]] = {}
+    for link in links:
+        parsed = urlparse(link)
+        if _origin(link) != base_origin:
+            continue
+        path = parsed.path.rstrip("/")
+        if path == base_path or path.lower().endswith(_SKIP_EXTENSIONS):
+            continue
+        priority = _link_priority(link)
+        if priority is None:
+            continue
+        # One URL per path — ignore query-string variants
+        if path not in candidates or priority < candidates[path][0]:
+            candidates[path] = (priority, link)
+    ranked = sorted(candidates.values(), key=lambda c: (c[0], len(c[1])))
+    return ranked[:limit]
+
+
+async def crawl_pages(
+    targets: list[tuple[int, str]],
+    fetch_text: Callable[[str], Awaitable[str | None]],
+    deadline_s: float,
+    per_host_concurrency: int,
+) -> list[PageText]:
+    """Fetch targets concurrently, capped per host, within one overall deadline.
+
+    Pages that fail, return no text or are still pending at the deadline are
+    dropped. Results keep the order of ``targets``.
+    """
+    if not targets:
+        return []
+
+    semaphores: dict[str, asyncio.Semaphore] = {}
+
+    async def fetch(priority: int, url: str) -> PageText | None:
+        host = urlparse(url).hostname or ""
+        semaphore = semaphores.setdefault(host, asyncio.Semaphore(per_host_concurrency))
+        async with semaphore:
+            try:
+                text = await fetch_text(url)
+            except Exception as exc:
+                logger.info("Crawl of %s failed: %s", url, exc)
+                return None
+        if not text or not text.strip():
+            return None
+        return PageText(priority=priority, url=url, text=text.strip())
+
+    tasks = [asyncio.create_task(fetch(p, u)) for p, u in targets]
+    done, pending = await asyncio.wait(tasks, timeout=deadline_s)
+    for task in pending:
+        task.cancel()
+    if pending:
+        logger.info("Crawl deadline reached, dropped %d pending pages", len(pending))
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    return [t.result() for t in tasks if t in done and t.result() is not None]
+
+
+def _allocate(lengths: list[int], weights: list[int], budget: int) -> list[int]:
+    """Weighted water-filling: short sections keep everything, the rest share what's left."""
+    alloc = [0] * len(lengths)
+    active = set(range(len(lengths)))
+    remaining = budget
+    while active and remaining > 0:
+        total_weight = sum(weights[i] for i in active)
+        satisfied = {
+            i for i in active
+            if lengths[i] - alloc[i] <= remaining * weights[i] // total_weight
+        }
+        if not satisfied:
+            for i in active:
+                alloc[i] += remaining * weights[i] // total_weight
+            break
+        for i in satisfied:
+            alloc[i] = lengths[i]
+        active -= satisfied
+        remaining = budget - sum(alloc)
+    return alloc
+
+
+def merge_pages(pages: list[PageText], budget: int) -> str:
+    """Merge page texts into one document of at most ``budget`` characters.
+
+    Pages are ordered by priority and truncated by priority-weighted shares,
+    so the homepage and payment/about pages keep the most room.
+    """
+    pages = sorted(pages, key=lambda p: p.priority)
+    if not pages:
+        return ""
+    if len(pages) == 1:
+        return pages[0].text[:budget]
+
+    headers = [f"## Página: {urlparse(p.url).path or '/'}\n" for p in pages]
+    separators = 2 * (len(pages) - 1)
+    text_budget = max(0, budget - sum(len(h) for h in headers) - separators)
+    alloc = _allocate(
+        [len(p.text) for p in pages],
+        [PRIORITY_WEIGHTS.get(p.priority, 1) for p in pages],
+        text_budget,
+    )
+    sections = [
+        f"{header}{page.text[:size]}"
+        for header, page, size in zip(headers, pages, alloc)
+        if size > 0
+    ]
+    return "\n\n".join(sections)[:budget]
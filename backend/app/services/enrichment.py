@@ -1,57 +1,328 @@
 """Website scraping and LLM extraction service."""
 
+import asyncio
+import codecs
 import json
 import logging
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from urllib.parse import urljoin, urlparse
 
-from openai import AsyncOpenAI, OpenAIError
-from playwright.async_api import async_playwright, Error as PlaywrightError
+import httpx
+from playwright.async_api import (
+    Browser,
+    BrowserContext,
+    Error as PlaywrightError,
+    Page,
+    Route,
+    async_playwright,
+)
 
 from app.config import settings
 from app.models.schemas import CompanyProfile
 from app.prompts.enrichment import SYSTEM_PROMPT, build_prompt
-from app.utils.url_validation import validate_url
+from app.services.browser_pool import browser_pool
+from app.services.crawler import (
+    HOMEPAGE_PRIORITY,
+    PageText,
+    crawl_pages,
+    merge_pages,
+    select_crawl_targets,
+)
+from app.services.http_client import get_http_client, send_pinned
+from app.services.llm_gateway import LLMCallError, chat_completion
+from app.utils.html_text import extract_links, extract_visible_text, looks_like_js_shell
+from app.utils.url_validation import resolve_validated_url
 
 logger = logging.getLogger(__name__)
 
 MAX_TEXT_LENGTH = 15_000
 NAVIGATION_TIMEOUT_MS = 30_000
+MAX_HTML_BYTES = 2 * 1024 * 1024
+MAX_REDIRECTS = 5
 
+# Adaptive "text stabilized" wait replacing a fixed sleep after navigation
+TEXT_POLL_INTERVAL_S = 0.25
+TEXT_STABLE_POLLS = 2
+TEXT_WAIT_DEADLINE_S = 3.0
 
-async def scrape_website(url: str) -> str:
-    """Scrape visible text content from a website using headless Chromium.
+# We only read inner_text("body"), so these are never worth downloading
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font", "stylesheet"})
 
-    Returns clean text or empty string on any failure.
+TIER_HTTP = "http"
+TIER_BROWSER = "browser"
+
+
+@dataclass
+class ScrapeResult:
+    """Scraped page text plus the fetch tier that produced it."""
+
+    text: str = ""
+    tier: str = ""  # "http" | "browser" | "" when nothing was scraped
+    pages: list[str] = field(default_factory=list)  # URLs merged into text
+
+
+def _decode_body(body: bytes, charset: str | None) -> str:
+    """Decode a response body, falling back to utf-8 for unknown charsets."""
+    encoding = "utf-8"
+    if charset:
+        try:
+            encoding = codecs.lookup(charset).name
+        except LookupError:
+            logger.info("Unknown charset %r, decoding as utf-8", charset)
+    return body.decode(encoding, errors="replace")
+
+
+async def _fetch_html(url: str) -> str | None:
+    """Fetch a page with the pooled httpx client, validating every redirect hop.
+
+    Each hop connects to the IPs vetted by SSRF validation (DNS pinning), so
+    the page cannot be served from an address that was never checked.
+    Returns the decoded HTML, or None if the page is not HTML. Raises
+    ValueError if any hop fails validation.
+    """
+    client = get_http_client()
+    for _ in range(MAX_REDIRECTS + 1):
+        validated = await resolve_validated_url(url)
+        resp = await send_pinned(client, validated)
+        try:
+            if resp.is_redirect:
+                url = urljoin(validated.url, resp.headers.get("location", ""))
+                continue
+            resp.raise_for_status()
+            content_type = resp.headers.get("content-type", "")
+            if "html" not in content_type.lower():
+                return None
+            body = bytearray()
+            async for chunk in resp.aiter_bytes():
+                body.extend(chunk)
+                if len(body) >= MAX_HTML_BYTES:
+                    break
+            return _decode_body(bytes(body), resp.charset_encoding)
+        finally:
+            await resp.aclose()
+    logger.warning("Too many redirects fetching %s", url)
+    return None
+
+
+async def _scrape_http(url: str) -> tuple[str, list[str]] | None:
+    """Fast tier: plain HTTP fetch + HTML text extraction.
+
+    Returns (text, links), or None when the page needs a real browser (too
+    little text, JS shell, non-HTML response or any fetch error, including
+    malformed redirects). Raises ValueError if a redirect points at a URL
+    that fails SSRF validation.
+    """
+    try:
+        html = await _fetch_html(url)
+    except ValueError:
+        raise
+    except Exception as exc:
+        logger.info("HTTP fetch failed for %s, falling back to browser: %s", url, exc)
+        return None
+    if html is None:
+        return None
+
+    text = extract_visible_text(html)
+    min_length = settings.SCRAPE_HTTP_MIN_TEXT_LENGTH
+    if len(text) < min_length or looks_like_js_shell(html, text):
+        logger.info(
+            "HTTP tier extracted %d chars from %s, falling back to browser", len(text), url
+        )
+        return None
+    return text, extract_links(html, url)
+
+
+async def _fetch_subpage_text(url: str) -> str | None:
+    """Fetch a crawled subpage over HTTP (validated and pinned by _fetch_html)."""
+    html = await _fetch_html(url)
+    if html is None:
+        return None
+    return extract_visible_text(html)
+
+
+def _blocked_hosts() -> frozenset[str]:
+    return frozenset(
+        h.strip().lower() for h in settings.SCRAPE_BLOCKED_HOSTS.split(",") if h.strip()
+    )
+
+
+def _is_blocked_request(resource_type: str, url: str, blocked_hosts: frozenset[str]) -> bool:
+    """True for heavy resources and requests to blocklisted hosts or their subdomains."""
+    if resource_type in BLOCKED_RESOURCE_TYPES:
+        return True
+    host = (urlparse(url).hostname or "").lower()
+    return any(host == h or host.endswith(f".{h}") for h in blocked_hosts)
+
+
+# Response headers that no longer describe the body once httpx has decoded it
+_FULFILL_DROP_HEADERS = frozenset({
+    "content-encoding", "content-length", "transfer-encoding", "connection", "keep-alive",
+})
+_FORWARD_DROP_HEADERS = frozenset({"host", "connection", "keep-alive", "content-length"})
+
+
+def _make_route_handler() -> Callable[[Route], Awaitable[None]]:
+    """Build the per-page route handler.
+
+    Heavy resources and blocklisted hosts are aborted. Documents (any host)
+    and every request to a host already vetted for this page are fetched by
+    the pinned httpx client and fulfilled into Chromium, so the browser never
+    resolves those hostnames itself. Other third-party requests continue.
+    Chromium's --host-resolver-rules is per process, so with a shared browser
+    pool pinning has to happen per request instead.
+    """
+    blocked_hosts = _blocked_hosts()
+    vetted_hosts: set[str] = set()
+
+    async def handle(route: Route) -> None:
+        request = route.request
+        if _is_blocked_request(request.resource_type, request.url, blocked_hosts):
+            await route.abort()
+            return
+
+        host = (urlparse(request.url).hostname or "").lower()
+        if request.resource_type != "document" and host not in vetted_hosts:
+            await route.continue_()
+            return
+
+        try:
+            validated = await resolve_validated_url(request.url)
+        except ValueError as exc:
+            logger.warning("Blocked browser request to %s: %s", request.url, exc)
+            await route.abort()
+            return
+        vetted_hosts.add(validated.hostname)
+
+        headers = {
+            k: v for k, v in request.headers.items() if k.lower() not in _FORWARD_DROP_HEADERS
+        }
+        try:
+            resp = await send_pinned(
+                get_http_client(),
+                validated,
+                method=request.method,
+                headers=headers,
+                content=request.post_data_buffer,
+            )
+            try:
+                body = await resp.aread()
+            finally:
+                await resp.aclose()
+        except httpx.HTTPError as exc:
+            logger.info("Pinned fetch failed for %s: %s", request.url, exc)
+            await route.abort()
+            return
+
+        await route.fulfill(
+            status=resp.status_code,
+            headers={
+                k: v for k, v in resp.headers.items() if k.lower() not in _FULFILL_DROP_HEADERS
+            },
+            body=body,
+        )
+
+    return handle
+
+
+async def _wait_for_text_stable(page: Page) -> None:
+    """Poll body text length until it stops growing or the deadline passes."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + TEXT_WAIT_DEADLINE_S
+    last_length = -1
+    stable_polls = 0
+    while loop.time() < deadline:
+        length = await page.evaluate(
+            "() => document.body ? document.body.innerText.length : 0"
+        )
+        if length > 0 and length == last_length:
+            stable_polls += 1
+            if stable_polls >= TEXT_STABLE_POLLS:
+                return
+        else:
+            stable_polls = 0
+            last_length = length
+        await asyncio.sleep(TEXT_POLL_INTERVAL_S)
+
+
+async def _render_page(target: Browser | BrowserContext, url: str) -> tuple[str, list[str]]:
+    """Open a page on a browser or pooled context and return (body text, links)."""
+    page = await target.new_page()
+    await page.route("**/*", _make_route_handler())
+    # Use domcontentloaded + text-stabilized wait — networkidle hangs on sites
+    # with persistent connections (analytics, chat widgets, etc.)
+    await page.goto(url, timeout=NAVIGATION_TIMEOUT_MS, wait_until="domcontentloaded")
+    await _wait_for_text_stable(page)
+    text = await page.inner_text("body")
+    links = await page.eval_on_selector_all("a[href]", "els => els.map(e => e.href)")
+    return text, [link for link in links if isinstance(link, str)]
+
+
+async def _scrape_browser(url: str) -> tuple[str, list[str]]:
+    """Slow tier: render the page in headless Chromium and read the body text."""
+    if browser_pool.started:
+        async with browser_pool.context() as context:
+            return await _render_page(context, url)
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        try:
+            return await _render_page(browser, url)
+        finally:
+            await browser.close()
+
+
+async def scrape_website(url: str) -> ScrapeResult:
+    """Scrape visible text content from a website.
+
+    Tries a plain HTTP fetch first; only pages that come back nearly empty or
+    look like a client-rendered shell are rendered in headless Chromium (via
+    the shared browser pool when it is running). High-value same-origin pages
+    linked from the homepage ("sobre", "produtos", "pagamento", ...) are then
+    crawled concurrently and merged into the text within MAX_TEXT_LENGTH.
+
+    Returns a ScrapeResult; its text is empty on any failure.
     """
     try:
-        url = validate_url(url)
+        url = (await resolve_validated_url(url)).url
     except ValueError as exc:
         logger.warning("URL validation failed for %s: %s", url, exc)
-        return ""
+        return ScrapeResult()
 
+    tier = TIER_HTTP
     try:
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            try:
-                page = await browser.new_page()
-                # Use domcontentloaded + short wait — networkidle hangs on sites
-                # with persistent connections (analytics, chat widgets, etc.)
-                await page.goto(url, timeout=NAVIGATION_TIMEOUT_MS, wait_until="domcontentloaded")
-                await page.wait_for_timeout(3000)
-                text = await page.inner_text("body")
-            finally:
-                await browser.close()
-    except (PlaywrightError, TimeoutError, Exception) as exc:
-        logger.warning("Failed to scrape %s: %s", url, exc)
-        return ""
+        homepage = await _scrape_http(url)
+    except ValueError as exc:
+        logger.warning("Redirect validation failed for %s: %s", url, exc)
+        return ScrapeResult()
+    if homepage is None:
+        tier = TIER_BROWSER
+        try:
+            homepage = await _scrape_browser(url)
+        except (PlaywrightError, TimeoutError, Exception) as exc:
+            logger.warning("Failed to scrape %s: %s", url, exc)
+            return ScrapeResult()
 
+    text, links = homepage
     text = text.strip()
     if not text:
-        return ""
+        return ScrapeResult()
 
-    if len(text) > MAX_TEXT_LENGTH:
-        text = text[:MAX_TEXT_LENGTH]
+    pages = [PageText(priority=HOMEPAGE_PRIORITY, url=url, text=text)]
+    targets = select_crawl_targets(links, url, settings.CRAWL_MAX_PAGES)
+    if targets:
+        pages += await crawl_pages(
+            targets,
+            _fetch_subpage_text,
+            deadline_s=settings.CRAWL_DEADLINE_S,
+            per_host_concurrency=settings.CRAWL_PER_HOST_CONCURRENCY,
+        )
 
-    return text
+    return ScrapeResult(
+        text=merge_pages(pages, MAX_TEXT_LENGTH),
+        tier=tier,
+        pages=[page.url for page in pages],
+    )
 
 
 async def extract_company_profile(company_name: str, website_text: str) -> CompanyProfile:
@@ -62,27 +333,25 @@ async def extract_company_profile(company_name: str, website_text: str) -> Compa
     if not website_text.strip():
         return CompanyProfile(company_name=company_name)
 
-    client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
     user_message = build_prompt(company_name, website_text)
 
-    for attempt in range(2):
-        try:
-            response = await client.chat.completions.create(
-                model="gpt-4.1-mini",
-                messages=[
-                    {"role": "system", "content": SYSTEM_PROMPT},
-                    {"role": "user", "content": user_message},
-                ],
-                response_format={"type": "json_object"},
-                temperature=0.2,
-            )
-            data = json.loads(response.choices[0].message.content)
-            data["company_name"] = company_name
-            return CompanyProfile(**data)
-        except (OpenAIError, json.JSONDecodeError, KeyError) as exc:
-            logger.warning(
-                "LLM extraction attempt %d failed: %s", attempt + 1, exc
-            )
-            if attempt == 0:
-                continue
-            return CompanyProfile(company_name=company_name)
+    def parse(response) -> CompanyProfile:
+        data = json.loads(response.choices[0].message.content)
+        data["company_name"] = company_name
+        return CompanyProfile(**data)
+
+    try:
+        return await chat_completion(
+            call_site="enrichment.extract_profile",
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": user_message},
+            ],
+            response_format={"type": "json_object"},
+            temperature=0.2,
+            parse=parse,
+            cache=True,
+        )
+    except LLMCallError as exc:
+        logger.warning("LLM extraction failed: %s", exc)
+        return CompanyProfile(company_name=company_name)
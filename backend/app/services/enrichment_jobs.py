@@ -0,0 +1,266 @@
+"""In-process background enrichment jobs on a bounded worker pool."""
+
+import asyncio
+import logging
+import uuid
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.orm import OnboardingSession
+from app.services.enrichment_pipeline import run_enrichment
+
+logger = logging.getLogger(__name__)
+
+# Session status restored when a job fails, so enrichment can be retried
+STATUS_BEFORE_ENRICHMENT = "created"
+
+
+# Last event of every job; streams end after delivering one of these
+TERMINAL_EVENTS = frozenset({"enrichment_done", "enrichment_failed"})
+
+
+class JobQueueFullError(RuntimeError):
+    """Raised when too many enrichment jobs are already queued or running."""
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+@dataclass
+class JobEvent:
+    seq: int
+    name: str
+    data: dict[str, Any]
+
+
+@dataclass
+class EnrichmentJob:
+    id: str
+    session_id: str
+    status: str = "queued"  # queued | running | succeeded | failed
+    error: str | None = None
+    created_at: datetime = field(default_factory=_utcnow)
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    # CompanyProfile as soon as it is extracted, before web research finishes
+    partial_profile: dict[str, Any] | None = None
+    events: list[JobEvent] = field(default_factory=list)
+    _listeners: list[asyncio.Queue[JobEvent]] = field(default_factory=list, repr=False)
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("succeeded", "failed")
+
+    def publish(self, name: str, data: dict[str, Any]) -> None:
+        """Record a progress event and fan it out to live subscribers."""
+        if name == "profile_extracted":
+            self.partial_profile = data.get("profile")
+        event = JobEvent(seq=len(self.events) + 1, name=name, data=data)
+        self.events.append(event)
+        for queue in self._listeners:
+            queue.put_nowait(event)
+
+    async def stream(self, heartbeat_s: float | None = None) -> AsyncIterator[JobEvent | None]:
+        """Replay past events, then follow live ones until the job finishes.
+
+        Yields ``None`` after ``heartbeat_s`` seconds without events, so callers
+        can keep idle connections open.
+        """
+        history = list(self.events)
+        if history and history[-1].name in TERMINAL_EVENTS:
+            for event in history:
+                yield event
+            return
+
+        queue: asyncio.Queue[JobEvent] = asyncio.Queue()
+        self._listeners.append(queue)
+        try:
+            for event in history:
+                yield event
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=heartbeat_s)
+                except TimeoutError:
+                    yield None
+                    continue
+                yield event
+                if event.name in TERMINAL_EVENTS:
+                    return
+        finally:
+            self._listeners.remove(queue)
+
+
+class EnrichmentJobManager:
+    """Run enrichment pipelines as asyncio tasks, at most ``workers`` at a time.
+
+    Jobs live in memory only: the durable state is the session row, whose
+    status moves created → enriching → enriched (or back to created on
+    failure). Finished jobs are kept for status polling up to ``history``.
+    """
+
+    def __init__(
+        self,
+        workers: int | None = None,
+        max_queued: int | None = None,
+        history: int | None = None,
+    ) -> None:
+        self.workers = settings.ENRICHMENT_WORKERS if workers is None else workers
+        self.max_queued = settings.ENRICHMENT_MAX_QUEUED_JOBS if max_queued is None else max_queued
+        self.history = settings.ENRICHMENT_JOB_HISTORY if history is None else history
+        self._jobs: OrderedDict[str, EnrichmentJob] = OrderedDict()
+        self._tasks: dict[str, asyncio.Task[None]] = {}
+        self._semaphore: asyncio.Semaphore | None = None
+
+    @property
+    def pending(self) -> int:
+        """Jobs queued or running."""
+        return len(self._tasks)
+
+    def get(self, job_id: str) -> EnrichmentJob | None:
+        return self._jobs.get(job_id)
+
+    def latest_for_session(self, session_id: str) -> EnrichmentJob | None:
+        for job in reversed(self._jobs.values()):
+            if job.session_id == session_id:
+                return job
+        return None
+
+    def submit(
+        self, session_id: str, session_factory: Callable[[], Session]
+    ) -> EnrichmentJob:
+        """Queue enrichment of a session already marked as ``enriching``.
+
+        ``session_factory`` opens the DB session used by the job; the request's
+        session is closed as soon as the response is sent.
+        """
+        if self.pending >= self.max_queued:
+            raise JobQueueFullError("Too many enrichment jobs in progress")
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.workers)
+
+        job = self._register(session_id)
+        task = asyncio.create_task(self._run(job, session_factory))
+        self._tasks[job.id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job.id, None))
+        return job
+
+    async def run_inline(self, session_id: str, db: Session) -> dict[str, Any]:
+        """Enrich a session in the caller's task (blocking ``/enrich``).
+
+        The run is tracked like a background job, outside the worker pool,
+        so SSE clients can follow it. Returns the enrichment dict; on failure
+        the session status is reset and the exception re-raised.
+        """
+        job = self._register(session_id)
+        return await self._execute(job, db)
+
+    async def wait(self, job_id: str) -> EnrichmentJob | None:
+        """Wait for a job to finish (mainly for tests and shutdown)."""
+        task = self._tasks.get(job_id)
+        if task is not None:
+            await asyncio.gather(task, return_exceptions=True)
+        return self._jobs.get(job_id)
+
+    async def close(self) -> None:
+        """Cancel jobs still in progress (called from the app lifespan)."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._semaphore = None
+
+    def _register(self, session_id: str) -> EnrichmentJob:
+        job = EnrichmentJob(id=str(uuid.uuid4()), session_id=session_id)
+        self._jobs[job.id] = job
+        self._prune()
+        return job
+
+    def _prune(self) -> None:
+        # Drop the oldest finished jobs beyond the history limit
+        finished = [job_id for job_id, job in self._jobs.items() if job.done]
+        for job_id in finished[: max(0, len(self._jobs) - self.history)]:
+            del self._jobs[job_id]
+
+    async def _run(self, job: EnrichmentJob, session_factory: Callable[[], Session]) -> None:
+        assert self._semaphore is not None
+        async with self._semaphore:
+            db = session_factory()
+            try:
+                await self._execute(job, db)
+            except Exception:
+                logger.exception("Enrichment job %s failed for session %s", job.id, job.session_id)
+            finally:
+                db.close()
+
+    async def _execute(self, job: EnrichmentJob, db: Session) -> dict[str, Any]:
+        job.status = "running"
+        job.started_at = _utcnow()
+        try:
+            session = db.get(OnboardingSession, job.session_id)
+            if session is None:
+                raise LookupError(f"Session {job.session_id} not found")
+            enrichment_dict = await run_enrichment(
+                db, session.company_name, session.company_website, on_event=job.publish
+            )
+            session.enrichment_data = enrichment_dict
+            session.status = "enriched"
+            db.commit()
+        except asyncio.CancelledError:
+            logger.warning("Enrichment job %s cancelled", job.id)
+            _fail(job, "cancelled")
+            _reset_session_status(db, job.session_id)
+            raise
+        except Exception:
+            _fail(job, "Enrichment failed")
+            _reset_session_status(db, job.session_id)
+            raise
+        job.status = "succeeded"
+        job.finished_at = _utcnow()
+        job.publish("enrichment_done", {"enrichment_data": enrichment_dict})
+        return enrichment_dict
+
+
+def _fail(job: EnrichmentJob, error: str) -> None:
+    job.status = "failed"
+    job.error = error
+    job.finished_at = _utcnow()
+    job.publish("enrichment_failed", {"error": error})
+
+
+def _reset_session_status(db: Session, session_id: str) -> None:
+    try:
+        db.rollback()
+        session = db.get(OnboardingSession, session_id)
+        if session is not None and session.enrichment_data is None:
+            session.status = STATUS_BEFORE_ENRICHMENT
+            db.commit()
+    except Exception:
+        logger.exception("Could not reset status of session %s", session_id)
+
+
+def reset_interrupted_enrichments(db: Session) -> int:
+    """Release sessions left ``enriching`` by a previous process; returns rows reset.
+
+    Jobs live in memory, so at startup no job can be running for them and
+    the 409 on ``/enrich`` would otherwise block every retry.
+    """
+    result = db.execute(
+        update(OnboardingSession)
+        .where(OnboardingSession.status == "enriching")
+        .values(status=STATUS_BEFORE_ENRICHMENT)
+    )
+    db.commit()
+    if result.rowcount:
+        logger.warning("Reset %d sessions interrupted while enriching", result.rowcount)
+    return result.rowcount
+
+
+enrichment_jobs = EnrichmentJobManager()
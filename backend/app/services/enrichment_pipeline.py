@@ -0,0 +1,238 @@
+"""Enrichment pipeline: scrape, profile extraction and web research as a small DAG.
+
+Stages start as soon as their dependencies finish, so the segment-independent
+web searches run while the site is still being scraped:
+
+    scrape ──▶ profile ──▶ search_segment ──┐
+    search_base ────────────────────────────┴──▶ web_research
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.schemas import CompanyProfile
+from app.services.enrichment import ScrapeResult, extract_company_profile, scrape_website
+from app.services.scrape_cache import (
+    cached_research,
+    content_hash,
+    get_entry,
+    is_fresh,
+    normalize_domain,
+    store_entry,
+    store_research,
+)
+from app.services.web_research import (
+    build_base_queries,
+    build_segment_query,
+    consolidate_results,
+    run_searches,
+)
+
+logger = logging.getLogger(__name__)
+
+# Progress callback: (event name, JSON-serialisable payload)
+EventCallback = Callable[[str, dict[str, Any]], None]
+
+
+@dataclass
+class Stage:
+    """A pipeline step. ``run`` receives the results of all finished stages by name."""
+
+    name: str
+    run: Callable[[dict[str, Any]], Awaitable[Any]]
+    deps: tuple[str, ...] = ()
+
+
+@dataclass
+class StageTiming:
+    start_ms: int
+    duration_ms: int
+
+
+@dataclass
+class DagResult:
+    results: dict[str, Any] = field(default_factory=dict)
+    timings: dict[str, StageTiming] = field(default_factory=dict)
+
+    def timings_ms(self) -> dict[str, dict[str, int]]:
+        return {
+            name: {"start_ms": t.start_ms, "duration_ms": t.duration_ms}
+            for name, t in self.timings.items()
+        }
+
+
+async def run_dag(stages: list[Stage]) -> DagResult:
+    """Run stages concurrently, each one as soon as all of its deps are done.
+
+    Start offsets and durations are measured from the start of the run. If a
+    stage raises, the remaining stages are cancelled and the error propagates.
+    """
+    names = {stage.name for stage in stages}
+    for stage in stages:
+        missing = set(stage.deps) - names
+        if missing:
+            raise ValueError(f"Stage {stage.name!r} depends on unknown stages: {missing}")
+
+    out = DagResult()
+    origin = time.perf_counter()
+    done_events = {stage.name: asyncio.Event() for stage in stages}
+
+    async def execute(stage: Stage) -> None:
+        for dep in stage.deps:
+            await done_events[dep].wait()
+        started = time.perf_counter()
+        try:
+            out.results[stage.name] = await stage.run(out.results)
+        finally:
+            out.timings[stage.name] = StageTiming(
+                start_ms=round((started - origin) * 1000),
+                duration_ms=round((time.perf_counter() - started) * 1000),
+            )
+        done_events[stage.name].set()
+
+    tasks = [asyncio.create_task(execute(stage)) for stage in stages]
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+    return out
+
+
+def _cached_profile(cached_profile: dict, company_name: str) -> CompanyProfile:
+    return CompanyProfile(**{**cached_profile, "company_name": company_name})
+
+
+async def run_enrichment(
+    db: Session,
+    company_name: str,
+    website: str,
+    on_event: EventCallback | None = None,
+) -> dict:
+    """Enrich a company: scrape + LLM profile + web research, cache-aware.
+
+    ``on_event`` receives progress as it happens: ``scrape_started``,
+    ``scrape_done``, ``profile_extracted``, ``search_query_done`` (per query)
+    and ``web_research_consolidated``.
+
+    Returns the enrichment dict stored on the session (CompanyProfile fields plus
+    ``scrape_tier``, ``web_research`` and ``stage_timings_ms``).
+    """
+
+    def emit(event: str, data: dict[str, Any]) -> None:
+        if on_event is None:
+            return
+        try:
+            on_event(event, data)
+        except Exception:
+            logger.exception("Enrichment event handler failed for %s", event)
+
+    domain = normalize_domain(website)
+    cached = get_entry(db, domain)
+    fresh = cached is not None and is_fresh(cached)
+    search_enabled = bool(settings.SEARCH_API_KEY)
+
+    if fresh:
+        research = cached_research(cached, company_name)
+        if research is not None or not search_enabled:
+            # Fresh cache hit: no scrape, no LLM, no web search
+            company_profile = _cached_profile(cached.company_profile, company_name)
+            emit("profile_extracted", {"profile": company_profile.model_dump()})
+            enrichment_dict = company_profile.model_dump()
+            enrichment_dict["scrape_tier"] = "cache"
+            if research is not None:
+                enrichment_dict["web_research"] = research
+                emit("web_research_consolidated", {"web_research": research})
+            return enrichment_dict
+        # Same site, different company name: reuse the scrape, redo the research
+
+    if not search_enabled:
+        logger.info("SEARCH_API_KEY not set, skipping web research")
+
+    def query_done(query: str, results: list[dict]) -> None:
+        emit("search_query_done", {"query": query, "results": len(results)})
+
+    async def scrape(_: dict[str, Any]):
+        if fresh:
+            # The profile stage then matches the cached content hash
+            return ScrapeResult(text=cached.website_text, tier="cache")
+        emit("scrape_started", {"url": website})
+        result = await scrape_website(website)
+        emit("scrape_done", {"chars": len(result.text), "tier": result.tier})
+        return result
+
+    async def profile(results: dict[str, Any]) -> CompanyProfile:
+        scrape_result = results["scrape"]
+        if (
+            cached is not None
+            and scrape_result.text
+            and cached.content_hash == content_hash(scrape_result.text)
+        ):
+            # Site unchanged since the last scrape — reuse the extracted profile
+            company_profile = _cached_profile(cached.company_profile, company_name)
+        else:
+            company_profile = await extract_company_profile(company_name, scrape_result.text)
+        emit("profile_extracted", {"profile": company_profile.model_dump()})
+        return company_profile
+
+    async def search_base(_: dict[str, Any]) -> list[list[dict]]:
+        if not search_enabled:
+            return []
+        return await run_searches(build_base_queries(company_name), on_result=query_done)
+
+    async def search_segment(results: dict[str, Any]) -> list[list[dict]]:
+        if not search_enabled:
+            return []
+        query = build_segment_query(company_name, results["profile"].segment)
+        return await run_searches([query], on_result=query_done)
+
+    async def web_research(results: dict[str, Any]) -> dict | None:
+        if not search_enabled:
+            return None
+        research = await consolidate_results(
+            company_name, results["search_base"] + results["search_segment"]
+        )
+        emit("web_research_consolidated", {"web_research": research})
+        return research
+
+    dag = await run_dag([
+        Stage("scrape", scrape),
+        Stage("search_base", search_base),
+        Stage("profile", profile, deps=("scrape",)),
+        Stage("search_segment", search_segment, deps=("profile",)),
+        Stage("web_research", web_research, deps=("search_base", "search_segment")),
+    ])
+
+    scrape_result = dag.results["scrape"]
+    company_profile: CompanyProfile = dag.results["profile"]
+    research = dag.results["web_research"]
+
+    enrichment_dict = company_profile.model_dump()
+    enrichment_dict["scrape_tier"] = scrape_result.tier
+    if research is not None:
+        enrichment_dict["web_research"] = research
+    enrichment_dict["stage_timings_ms"] = dag.timings_ms()
+    logger.info("Enrichment stage timings for %s: %s", domain, enrichment_dict["stage_timings_ms"])
+
+    # Only cache useful results: a scrape that produced text and a profile
+    # with more than the company name (i.e. the LLM extraction succeeded)
+    profile_dict = company_profile.model_dump()
+    if fresh:
+        if research is not None:
+            store_research(db, cached, company_name, research)
+    elif scrape_result.text and any(v for k, v in profile_dict.items() if k != "company_name"):
+        store_entry(
+            db, domain, scrape_result.text, content_hash(scrape_result.text),
+            scrape_result.tier, profile_dict, company_name, research,
+        )
+
+    return enrichment_dict
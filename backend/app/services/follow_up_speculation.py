@@ -0,0 +1,133 @@
+"""Speculative follow-up evaluation of draft answers.
+
+The follow-up check for text answers (``evaluate_and_maybe_follow_up``) is
+an LLM round trip that used to start only when the user submitted. The
+frontend now posts debounced drafts while the user types; each draft starts
+the evaluation in the background, and a submit whose answer matches the
+latest draft reuses that verdict (or awaits the call already in flight)
+instead of starting from scratch.
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+from app.config import settings
+from app.services.interview_agent import (
+    InterviewState,
+    evaluate_and_maybe_follow_up,
+    state_with_answer,
+)
+
+logger = logging.getLogger(__name__)
+
+FollowUpVerdict = tuple[bool, dict | None]
+
+
+def answer_hash(answer: str) -> str:
+    return hashlib.sha256(answer.strip().encode("utf-8")).hexdigest()
+
+
+@dataclass
+class _Speculation:
+    answer_hash: str
+    task: asyncio.Task[FollowUpVerdict]
+    created_at: float = field(default_factory=time.monotonic)
+
+
+class FollowUpSpeculator:
+    """At most one speculative evaluation per (session, question).
+
+    A draft with a different answer cancels the evaluation of the previous
+    draft, so only the latest text costs an LLM call. Entries expire after
+    ``ttl_s`` and the oldest are dropped beyond ``max_entries``. Everything
+    lives in memory: a submit that finds no matching entry (other worker,
+    restart, expired) just evaluates synchronously as before.
+    """
+
+    def __init__(self, max_entries: int | None = None, ttl_s: float | None = None) -> None:
+        self.max_entries = (
+            settings.FOLLOW_UP_SPECULATION_MAX_ENTRIES if max_entries is None else max_entries
+        )
+        self.ttl_s = settings.FOLLOW_UP_SPECULATION_TTL_S if ttl_s is None else ttl_s
+        self._entries: OrderedDict[tuple[str, str], _Speculation] = OrderedDict()
+        self._counters = {"started": 0, "cancelled": 0, "hits": 0, "misses": 0}
+
+    def speculate(
+        self, session_id: str, state: InterviewState, question_id: str, draft: str
+    ) -> bool:
+        """Start evaluating ``draft`` unless the same draft is already evaluated.
+
+        ``state`` is the interview state before the answer, with ``question_id``
+        as its current question. Returns True when a new evaluation started.
+        """
+        key = (session_id, question_id)
+        digest = answer_hash(draft)
+        existing = self._entries.get(key)
+        if existing is not None and existing.answer_hash == digest and not self._expired(existing):
+            self._entries.move_to_end(key)
+            return False
+        if existing is not None:
+            self._discard(key)
+
+        draft_state = state_with_answer(state, question_id, draft)
+        task = asyncio.create_task(evaluate_and_maybe_follow_up(draft_state, question_id, draft))
+        self._entries[key] = _Speculation(answer_hash=digest, task=task)
+        self._counters["started"] += 1
+        self._prune()
+        return True
+
+    async def take(self, session_id: str, question_id: str, answer: str) -> FollowUpVerdict | None:
+        """Verdict speculated for exactly ``answer``, or None if there is none.
+
+        Waits for an evaluation still in flight. The entry is consumed either
+        way; a non-matching speculation is cancelled.
+        """
+        entry = self._entries.pop((session_id, question_id), None)
+        if entry is None or entry.answer_hash != answer_hash(answer) or self._expired(entry):
+            if entry is not None:
+                self._cancel(entry)
+            self._counters["misses"] += 1
+            return None
+        if entry.task.cancelled():
+            self._counters["misses"] += 1
+            return None
+        verdict = await entry.task
+        self._counters["hits"] += 1
+        return verdict
+
+    def stats(self) -> dict[str, int]:
+        return {**self._counters, "entries": len(self._entries)}
+
+    async def close(self) -> None:
+        """Cancel evaluations still in flight (called from the app lifespan)."""
+        entries = list(self._entries.values())
+        self._entries.clear()
+        for entry in entries:
+            entry.task.cancel()
+        await asyncio.gather(*(e.task for e in entries), return_exceptions=True)
+
+    def _expired(self, entry: _Speculation) -> bool:
+        return time.monotonic() - entry.created_at > self.ttl_s
+
+    def _cancel(self, entry: _Speculation) -> None:
+        if not entry.task.done():
+            entry.task.cancel()
+            self._counters["cancelled"] += 1
+
+    def _discard(self, key: tuple[str, str]) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._cancel(entry)
+
+    def _prune(self) -> None:
+        for key in [k for k, e in self._entries.items() if self._expired(e)]:
+            self._discard(key)
+        while len(self._entries) > self.max_entries:
+            self._discard(next(iter(self._entries)))
+
+
+follow_up_speculator = FollowUpSpeculator()
@@ -0,0 +1,151 @@
+"""Shared pooled httpx client for outbound page fetches.
+
+Requests keep their real hostname in the URL, so httpcore pools (and TLS
+verifies) connections per hostname. Dialing is pinned: the transport's
+network backend connects only to the IPs that SSRF validation vetted for
+that hostname (set per request by ``send_pinned``) and never resolves DNS
+itself. Two hosts behind the same CDN IP therefore never share a
+connection.
+"""
+
+from collections.abc import Iterable, Mapping
+from contextvars import ContextVar
+
+import httpcore
+import httpx
+
+from app.utils.url_validation import ValidatedURL
+
+# Desktop browser UA — some sites serve an empty page to unknown clients
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+)
+
+# Hostname → vetted IPs for the request being sent in the current task
+_pinned_ips: ContextVar[Mapping[str, tuple[str, ...]]] = ContextVar("pinned_ips", default={})
+
+
+class PinnedNetworkBackend(httpcore.AsyncNetworkBackend):
+    """Network backend that dials the pinned IPs of a hostname, in order.
+
+    Connecting to a hostname with no pinned IPs fails instead of falling
+    back to DNS, so nothing reaches an address that was never checked.
+    """
+
+    def __init__(self, backend: httpcore.AsyncNetworkBackend | None = None) -> None:
+        self._backend = backend or httpcore.AnyIOBackend()
+
+    async def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: float | None = None,
+        local_address: str | None = None,
+        socket_options: Iterable[httpcore.SOCKET_OPTION] | None = None,
+    ) -> httpcore.AsyncNetworkStream:
+        ips = _pinned_ips.get().get(host.lower())
+        if not ips:
+            raise httpcore.ConnectError(f"No vetted IPs pinned for {host}")
+        last_exc: Exception | None = None
+        for ip in ips:
+            try:
+                return await self._backend.connect_tcp(
+                    ip, port, timeout=timeout, local_address=local_address,
+                    socket_options=socket_options,
+                )
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as exc:
+                last_exc = exc
+        assert last_exc is not None
+        raise last_exc
+
+    async def connect_unix_socket(
+        self,
+        path: str,
+        timeout: float | None = None,
+        socket_options: Iterable[httpcore.SOCKET_OPTION] | None = None,
+    ) -> httpcore.AsyncNetworkStream:
+        raise httpcore.ConnectError("Unix sockets are not used for page fetches")
+
+    async def sleep(self, seconds: float) -> None:
+        await self._backend.sleep(seconds)
+
+
+class PinnedTransport(httpx.AsyncHTTPTransport):
+    """httpx transport whose connection pool dials through PinnedNetworkBackend."""
+
+    def __init__(
+        self,
+        limits: httpx.Limits,
+        network_backend: httpcore.AsyncNetworkBackend | None = None,
+    ) -> None:
+        super().__init__(limits=limits)
+        # AsyncHTTPTransport has no network_backend option: same pool settings,
+        # pinned dialing
+        self._pool = httpcore.AsyncConnectionPool(
+            ssl_context=httpx.create_ssl_context(),
+            max_connections=limits.max_connections,
+            max_keepalive_connections=limits.max_keepalive_connections,
+            keepalive_expiry=limits.keepalive_expiry,
+            network_backend=network_backend or PinnedNetworkBackend(),
+        )
+
+
+_client: httpx.AsyncClient | None = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the process-wide AsyncClient, creating it on first use.
+
+    Only ``send_pinned`` can reach a host through it: any other request
+    fails to connect, as its hostname has no pinned IPs.
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            transport=PinnedTransport(
+                httpx.Limits(max_connections=50, max_keepalive_connections=20)
+            ),
+            timeout=httpx.Timeout(10.0, connect=5.0),
+            headers={
+                "User-Agent": USER_AGENT,
+                "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.8",
+                "Accept-Language": "pt-BR,pt;q=0.9,en;q=0.8",
+            },
+            follow_redirects=False,
+            # An environment proxy would resolve hostnames itself, bypassing pinning
+            trust_env=False,
+        )
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the shared client (called from the app lifespan)."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+async def send_pinned(
+    client: httpx.AsyncClient,
+    validated: ValidatedURL,
+    method: str = "GET",
+    headers: dict[str, str] | None = None,
+    content: bytes | None = None,
+) -> httpx.Response:
+    """Send a streamed request to the vetted IPs of a ValidatedURL.
+
+    The URL keeps its hostname (Host header, SNI, certificate verification
+    and connection pooling all use it); a new connection is dialed to the
+    vetted IPs, tried in order until one connects. The caller must close the
+    response.
+    """
+    request = client.build_request(method, validated.url, headers=headers, content=content)
+    # The pool dials the URL's ASCII host (punycode for IDNs)
+    host = request.url.raw_host.decode("ascii").lower()
+    token = _pinned_ips.set({**_pinned_ips.get(), host: validated.ips})
+    try:
+        return await client.send(request, stream=True)
+    finally:
+        _pinned_ips.reset(token)
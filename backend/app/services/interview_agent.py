@@ -5,7 +5,6 @@ import logging
 from typing import TypedDict
 
 from langgraph.graph import END, START, StateGraph
-from openai import AsyncOpenAI
 
 from app.config import settings
 from app.models.schemas import InterviewQuestion
@@ -13,7 +12,12 @@ from app.prompts.interview import (
     CORE_QUESTIONS,
     FOLLOW_UP_EVALUATION_PROMPT,
     POLICY_FOLLOWUP_MAP,
+    VAGUE_ANSWER_FOLLOWUP_DEFAULT,
+    VAGUE_ANSWER_FOLLOWUP_MAP,
 )
+from app.services.answer_quality import score_answer
+from app.services.llm_gateway import chat_completion
+from app.utils.text_signals import SignalMatcher
 
 logger = logging.getLogger(__name__)
 
@@ -121,24 +125,115 @@ def _build_next_question_graph() -> StateGraph:
     return graph
 
 
+# The graph structure never changes: compile once and reuse the runnables
+_FULL_GRAPH = _build_full_graph().compile()
+_NEXT_QUESTION_GRAPH = _build_next_question_graph().compile()
+
+
 # ---------- Serialization ----------
 
 
+# Persisted format version. v1 (unversioned) was ``dict(state)``: a full copy
+# of enrichment_data and of every question dict. v2 stores enrichment_data by
+# reference (it lives in the session's own column and is hydrated on load),
+# canonical core questions by id and answers as compact lists.
+STATE_FORMAT_VERSION = 2
+
+_CORE_QUESTIONS_BY_ID: dict[str, dict] = {q.question_id: q.model_dump() for q in CORE_QUESTIONS}
+
+
+def encode_question(question: dict | None) -> str | dict | None:
+    """A core question identical to its definition becomes its id; others stay dicts."""
+    if question is None:
+        return None
+    question_id = question.get("question_id")
+    if _CORE_QUESTIONS_BY_ID.get(question_id) == question:
+        return question_id
+    return question
+
+
+def decode_question(encoded: str | dict | None) -> dict | None:
+    if isinstance(encoded, str):
+        return dict(_CORE_QUESTIONS_BY_ID[encoded])
+    return encoded
+
+
+def encode_answer(answer: dict) -> list:
+    """``[question_id, answer, source]``, plus the question text unless it is the canonical one."""
+    question_id = answer["question_id"]
+    encoded = [question_id, answer["answer"], answer.get("source", "text")]
+    canonical = _CORE_QUESTIONS_BY_ID.get(question_id, {}).get("question_text")
+    question_text = answer.get("question_text", "")
+    if question_text != canonical:
+        encoded.append(question_text)
+    return encoded
+
+
+def decode_answer(encoded: list | dict) -> dict:
+    if isinstance(encoded, dict):  # v1
+        return encoded
+    question_id, answer, source, *rest = encoded
+    question_text = (
+        rest[0] if rest else _CORE_QUESTIONS_BY_ID.get(question_id, {}).get("question_text", "")
+    )
+    return {
+        "question_id": question_id,
+        "answer": answer,
+        "source": source,
+        "question_text": question_text,
+    }
+
+
 def serialize_state(state: InterviewState) -> dict:
-    """Convert InterviewState to a JSON-serializable dict for DB storage."""
-    return dict(state)
+    """Encode InterviewState for DB storage (v2, without enrichment_data)."""
+    follow_up = state.get("follow_up_question")
+    return {
+        "v": STATE_FORMAT_VERSION,
+        "phase": state["phase"],
+        "current": encode_question(state.get("current_question")),
+        "remaining": [encode_question(q) for q in state["core_questions_remaining"]],
+        "answers": [encode_answer(a) for a in state["answers"]],
+        "needs_follow_up": state.get("needs_follow_up", False),
+        # Almost always the current question: don't store it twice
+        "follow_up": (
+            "current" if follow_up is not None and follow_up == state.get("current_question")
+            else encode_question(follow_up)
+        ),
+        "follow_up_count": state.get("follow_up_count", 0),
+    }
+
 
+def deserialize_state(data: dict, enrichment_data: dict | None = None) -> InterviewState:
+    """Restore InterviewState from a dict loaded from DB (v1 or v2).
 
-def deserialize_state(data: dict) -> InterviewState:
-    """Restore InterviewState from a JSON dict loaded from DB."""
+    ``enrichment_data`` is the session's enrichment column; v2 does not store
+    a copy. v1 rows fall back to their embedded copy when it is not given.
+    """
+    if data.get("v") != STATE_FORMAT_VERSION:
+        return InterviewState(
+            enrichment_data=(
+                enrichment_data if enrichment_data is not None
+                else data.get("enrichment_data", {})
+            ),
+            core_questions_remaining=data.get("core_questions_remaining", []),
+            current_question=data.get("current_question"),
+            answers=data.get("answers", []),
+            phase=data.get("phase", "core"),
+            needs_follow_up=data.get("needs_follow_up", False),
+            follow_up_question=data.get("follow_up_question"),
+            follow_up_count=data.get("follow_up_count", 0),
+        )
+
+    current = decode_question(data["current"])
+    follow_up = data.get("follow_up")
     return InterviewState(
-        enrichment_data=data.get("enrichment_data", {}),
-        core_questions_remaining=data.get("core_questions_remaining", []),
-        current_question=data.get("current_question"),
-        answers=data.get("answers", []),
-        phase=data.get("phase", "core"),
+        enrichment_data=enrichment_data or {},
+        core_questions_remaining=[decode_question(q) for q in data["remaining"]],
+        current_question=current,
+        answers=[decode_answer(a) for a in data["answers"]],
+        phase=data["phase"],
         needs_follow_up=data.get("needs_follow_up", False),
-        follow_up_question=data.get("follow_up_question"),
+        follow_up_question=current if follow_up == "current" else decode_question(follow_up),
         follow_up_count=data.get("follow_up_count", 0),
     )
 
@@ -181,7 +276,7 @@ FRUSTRATION_SIGNALS = [
     "não é trabalho seu",
     "isso vocês que sabem",
     "isso é óbvio",
-    "já respondi isso",
+    "já respondi",
     "já disse isso",
     "não vou repetir",
     "chega de perguntas",
@@ -190,6 +285,7 @@ FRUSTRATION_SIGNALS = [
     "isso é básico",
     "pergunta sem sentido",
 ]
+_FRUSTRATION_MATCHER = SignalMatcher(FRUSTRATION_SIGNALS)
 
 
 async def evaluate_and_maybe_follow_up(
@@ -211,10 +307,27 @@ async def evaluate_and_maybe_follow_up(
         return False, None
 
     # Frustration detection: if user signals impatience, skip follow-up
-    answer_lower = answer.lower()
-    if any(signal in answer_lower for signal in FRUSTRATION_SIGNALS):
-        logger.info("Frustration signal detected in answer, skipping follow-up")
+    signal = _FRUSTRATION_MATCHER.search(answer)
+    if signal:
+        logger.info("Frustration signal %r detected in answer, skipping follow-up", signal)
+        return False, None
+
+    parent_id = _get_parent_question_id(question_id)
+    new_count = follow_up_count + 1
+
+    # Local pre-filter: only answers it cannot classify go to the LLM.
+    # Decisions are logged with their score so the thresholds can be tuned
+    # against the LLM verdicts logged for the uncertain band.
+    quality = score_answer(answer)
+    logger.info(
+        "Answer pre-filter: question=%s verdict=%s score=%.3f signals=%s",
+        question_id, quality.verdict, quality.score, quality.signals,
+    )
+    if quality.verdict == "sufficient":
         return False, None
+    if quality.verdict == "vague":
+        follow_up_text = VAGUE_ANSWER_FOLLOWUP_MAP.get(parent_id, VAGUE_ANSWER_FOLLOWUP_DEFAULT)
+        return True, _follow_up_question(parent_id, new_count, follow_up_text)
 
     current = state.get("current_question", {})
     question_text = current.get("question_text", "") if current else ""
@@ -226,18 +339,22 @@ async def evaluate_and_maybe_follow_up(
     )
 
     try:
-        client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
-        response = await client.chat.completions.create(
-            model="gpt-4.1-mini",
+        data = await chat_completion(
+            call_site="interview.follow_up",
             messages=[{"role": "user", "content": prompt}],
             response_format={"type": "json_object"},
             temperature=0.3,
+            priority="interactive",
+            parse=lambda response: json.loads(response.choices[0].message.content),
         )
-        data = json.loads(response.choices[0].message.content)
     except Exception as exc:
         logger.warning("Follow-up evaluation failed: %s", exc)
         return False, None
 
+    logger.info(
+        "Follow-up LLM verdict: question=%s score=%.3f needs_follow_up=%s",
+        question_id, quality.score, bool(data.get("needs_follow_up", False)),
+    )
     if not data.get("needs_follow_up", False):
         return False, None
 
@@ -245,12 +362,13 @@ async def evaluate_and_maybe_follow_up(
     if not follow_up_text:
         return False, None
 
-    parent_id = _get_parent_question_id(question_id)
-    new_count = follow_up_count + 1
+    return True, _follow_up_question(parent_id, new_count, follow_up_text)
+
 
-    follow_up_question = {
-        "question_id": f"followup_{parent_id}_{new_count}",
-        "question_text": follow_up_text,
+def _follow_up_question(parent_id: str, count: int, question_text: str) -> dict:
+    return {
+        "question_id": f"followup_{parent_id}_{count}",
+        "question_text": question_text,
         "question_type": "text",
         "options": None,
         "pre_filled_value": None,
@@ -260,8 +378,6 @@ async def evaluate_and_maybe_follow_up(
         "context_hint": None,
     }
 
-    return True, follow_up_question
-
 
 # ---------- Deterministic policy follow-ups ----------
 
@@ -312,16 +428,46 @@ async def create_interview(enrichment_data: dict | None = None) -> InterviewStat
         "follow_up_count": 0,
     }
 
-    graph = _build_full_graph().compile()
-    result = graph.invoke(initial_state)
+    result = await _FULL_GRAPH.ainvoke(initial_state)
     return InterviewState(**result)
 
 
+def state_with_answer(
+    state: InterviewState, question_id: str, answer: str, source: str = "text"
+) -> InterviewState:
+    """Copy of ``state`` with the answer to the current question appended."""
+    current = state.get("current_question") or {}
+    answers = list(state["answers"])
+    answers.append({
+        "question_id": question_id,
+        "answer": answer,
+        "source": source,
+        "question_text": current.get("question_text", ""),
+    })
+    return _update_state(state, answers=answers)
+
+
+def evaluates_follow_up(state: InterviewState, question_id: str) -> bool:
+    """Whether answering ``question_id`` runs the LLM follow-up evaluation.
+
+    Skipped for policy questions (deterministic follow-up on "sim"), policy
+    follow-up answers and optional questions (core_0, core_6).
+    """
+    current = state.get("current_question") or {}
+    is_optional_question = current.get("is_required") is False and current.get("phase") == "core"
+    is_policy_question = question_id in POLICY_FOLLOWUP_MAP
+    is_policy_followup = question_id.startswith("followup_") and any(
+        question_id.startswith(f"followup_{pid}_") for pid in POLICY_FOLLOWUP_MAP
+    )
+    return not (is_policy_question or is_policy_followup or is_optional_question)
+
+
 async def submit_answer(
     state: InterviewState,
     question_id: str,
     answer: str,
     source: str = "text",
+    follow_up_verdict: tuple[bool, dict | None] | None = None,
 ) -> tuple[InterviewQuestion | None, InterviewState]:
     """Store an answer and advance to the next question.
 
@@ -330,6 +476,9 @@ async def submit_answer(
         question_id: ID of the question being answered (must match current_question).
         answer: The user's answer text.
         source: "text" or "audio".
+        follow_up_verdict: Result of ``evaluate_and_maybe_follow_up`` already
+            computed for this exact answer (e.g. speculatively from a draft);
+            skips the evaluation call.
 
     Returns:
         Tuple of (next InterviewQuestion or None, updated InterviewState).
@@ -344,26 +493,10 @@ async def submit_answer(
             f"Question ID mismatch: expected '{expected}', got '{question_id}'"
         )
 
-    # Store the answer
-    answers = list(state["answers"])
-    answers.append({
-        "question_id": question_id,
-        "answer": answer,
-        "source": source,
-        "question_text": current.get("question_text", ""),
-    })
-
-    updated_state = _update_state(state, answers=answers)
-
-    # Determine follow-up logic based on question type
-    is_optional_question = current.get("is_required") is False and current.get("phase") == "core"
-    is_policy_question = question_id in POLICY_FOLLOWUP_MAP
-    is_policy_followup = question_id.startswith("followup_") and any(
-        question_id.startswith(f"followup_{pid}_") for pid in POLICY_FOLLOWUP_MAP
-    )
+    updated_state = state_with_answer(state, question_id, answer, source)
 
     # Policy questions (core_2-5): deterministic follow-up when answered "sim"
-    if is_policy_question and answer.strip().lower() == "sim":
+    if question_id in POLICY_FOLLOWUP_MAP and answer.strip().lower() == "sim":
         fu_question = _build_policy_followup(question_id)
         if fu_question:
             updated_state = _update_state(
@@ -375,15 +508,13 @@ async def submit_answer(
             )
             return InterviewQuestion.model_validate(fu_question), updated_state
 
-    # Skip follow-up evaluation for: policy questions answered "nao", policy
-    # follow-up answers, and optional questions (core_0, core_6)
-    skip_follow_up = is_policy_question or is_policy_followup or is_optional_question
-
-    if not skip_follow_up:
+    if evaluates_follow_up(state, question_id):
         # Text questions (core_1) -- LLM-evaluated follow-up (max 1)
-        needs_fu, fu_question = await evaluate_and_maybe_follow_up(
-            updated_state, question_id, answer,
-        )
+        if follow_up_verdict is None:
+            follow_up_verdict = await evaluate_and_maybe_follow_up(
+                updated_state, question_id, answer,
+            )
+        needs_fu, fu_question = follow_up_verdict
         if needs_fu and fu_question:
             updated_state = _update_state(
                 updated_state,
@@ -416,8 +547,7 @@ async def get_next_question(
         Tuple of (next InterviewQuestion or None, updated InterviewState).
     """
     # Core phase: use the LangGraph to select next core question
-    graph = _build_next_question_graph().compile()
-    result = graph.invoke(dict(state))
+    result = await _NEXT_QUESTION_GRAPH.ainvoke(dict(state))
     new_state = InterviewState(**result)
 
     current = new_state.get("current_question")
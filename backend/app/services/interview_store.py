@@ -0,0 +1,234 @@
+"""Event-sourced persistence of interview progress.
+
+Every change to an interview is one small, append-only row in
+``interview_events`` (unique on ``session_id, seq``): the answer given and
+the resulting transition (phase, current question, ids of the remaining core
+questions, follow-up counters). Nothing that grows with the interview is
+rewritten per answer.
+
+The session's ``interview_state`` and ``interview_responses`` columns hold a
+snapshot: the state and answer list after event ``snapshot_seq`` (stored in
+the state JSON). Loading replays the events after the snapshot. A new
+snapshot is written every ``INTERVIEW_SNAPSHOT_INTERVAL`` events and when
+the interview reaches review, so readers of the columns after the interview
+(report generation) see the final answers. Rows written before events
+existed are simply a snapshot at seq 0.
+
+Snapshots and event payloads use the compact v2 state encoding of
+``interview_agent`` (no enrichment_data copy, core questions by id);
+``migrate_legacy_states`` rewrites older snapshots at startup.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.orm import InterviewEvent, OnboardingSession
+from app.services.interview_agent import (
+    STATE_FORMAT_VERSION,
+    InterviewState,
+    decode_answer,
+    decode_question,
+    deserialize_state,
+    encode_answer,
+    encode_question,
+    serialize_state,
+)
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_SEQ_KEY = "snapshot_seq"
+
+
+@dataclass
+class InterviewRecord:
+    state: InterviewState
+    responses: list[dict]  # clean answer list used for report generation
+    seq: int  # last event applied
+    snapshot_seq: int  # last event included in the stored snapshot
+
+
+def _transition(state: InterviewState) -> dict[str, Any]:
+    return {
+        "phase": state["phase"],
+        "current_question": encode_question(state.get("current_question")),
+        "remaining": [q["question_id"] for q in state["core_questions_remaining"]],
+        "needs_follow_up": state.get("needs_follow_up", False),
+        "follow_up_count": state.get("follow_up_count", 0),
+    }
+
+
+def _apply_transition(state: InterviewState, transition: dict[str, Any]) -> InterviewState:
+    remaining = {q["question_id"]: q for q in state["core_questions_remaining"]}
+    current = decode_question(transition["current_question"])
+    needs_follow_up = transition["needs_follow_up"]
+    return InterviewState(**{
+        **dict(state),
+        "phase": transition["phase"],
+        "current_question": current,
+        "core_questions_remaining": [
+            remaining.get(qid) or decode_question(qid) for qid in transition["remaining"]
+        ],
+        "needs_follow_up": needs_follow_up,
+        # submit_answer always presents the follow-up as the current question
+        "follow_up_question": current if needs_follow_up else None,
+        "follow_up_count": transition["follow_up_count"],
+    })
+
+
+def _apply(record: InterviewRecord, event: InterviewEvent) -> None:
+    payload = event.payload
+    if event.kind == "answered":
+        answer = decode_answer(payload["answer"])
+        state = InterviewState(**{**dict(record.state), "answers": [*record.state["answers"], answer]})
+        record.state = _apply_transition(state, payload["transition"])
+        record.responses.append({
+            "question_id": answer["question_id"],
+            "answer": answer["answer"],
+            "source": answer["source"],
+        })
+    elif event.kind == "started":
+        record.state = _apply_transition(record.state, payload["transition"])
+    elif event.kind == "review_confirmed":
+        record.state = InterviewState(**{**dict(record.state), "phase": "complete"})
+        if payload.get("notes"):
+            record.responses.append(
+                {"question_id": "review_notes", "answer": payload["notes"], "source": "text"}
+            )
+    else:
+        raise ValueError(f"Unknown interview event kind: {event.kind!r}")
+    record.seq = event.seq
+
+
+def load(db: Session, session: OnboardingSession) -> InterviewRecord | None:
+    """Current interview of ``session`` (snapshot + later events), or None if not started."""
+    snapshot = session.interview_state
+    snapshot_seq = snapshot.get(SNAPSHOT_SEQ_KEY, 0) if snapshot is not None else 0
+    events = db.scalars(
+        select(InterviewEvent)
+        .where(InterviewEvent.session_id == session.id, InterviewEvent.seq > snapshot_seq)
+        .order_by(InterviewEvent.seq)
+    ).all()
+    if snapshot is None and not events:
+        return None
+
+    # enrichment_data is hydrated from the session's column, never copied
+    if snapshot is not None:
+        state = deserialize_state(snapshot, session.enrichment_data)
+        responses = list(session.interview_responses or [])
+    else:
+        state = deserialize_state({}, session.enrichment_data)
+        responses = []
+    record = InterviewRecord(
+        state=state, responses=responses, seq=snapshot_seq, snapshot_seq=snapshot_seq
+    )
+    for event in events:
+        _apply(record, event)
+    return record
+
+
+def responses(db: Session, session: OnboardingSession) -> list[dict]:
+    """Answers given so far (empty if the interview has not started)."""
+    record = load(db, session)
+    return record.responses if record is not None else []
+
+
+def _append(
+    db: Session,
+    session: OnboardingSession,
+    record: InterviewRecord,
+    kind: str,
+    payload: dict[str, Any],
+) -> None:
+    """Add the next event; the caller commits (a concurrent writer fails on the unique seq)."""
+    record.seq += 1
+    db.add(InterviewEvent(session_id=session.id, seq=record.seq, kind=kind, payload=payload))
+    if (
+        record.seq - record.snapshot_seq >= settings.INTERVIEW_SNAPSHOT_INTERVAL
+        or record.state["phase"] in ("review", "complete")
+    ):
+        session.interview_state = {**serialize_state(record.state), SNAPSHOT_SEQ_KEY: record.seq}
+        session.interview_responses = list(record.responses)
+        record.snapshot_seq = record.seq
+
+
+def record_started(
+    db: Session, session: OnboardingSession, state: InterviewState
+) -> InterviewRecord:
+    """Record a freshly created interview (``create_interview`` output)."""
+    record = InterviewRecord(state=state, responses=[], seq=0, snapshot_seq=0)
+    _append(db, session, record, "started", {"transition": _transition(state)})
+    return record
+
+
+def record_answer(
+    db: Session, session: OnboardingSession, record: InterviewRecord, new_state: InterviewState
+) -> None:
+    """Record the answer ``submit_answer`` just appended, and where it led."""
+    answer = new_state["answers"][-1]
+    record.state = new_state
+    record.responses.append({
+        "question_id": answer["question_id"],
+        "answer": answer["answer"],
+        "source": answer["source"],
+    })
+    _append(
+        db, session, record, "answered",
+        {"answer": encode_answer(answer), "transition": _transition(new_state)},
+    )
+
+
+def record_review_confirmed(
+    db: Session, session: OnboardingSession, record: InterviewRecord, notes: str | None
+) -> None:
+    """Move the interview to ``complete``, keeping the client's review notes."""
+    record.state = InterviewState(**{**dict(record.state), "phase": "complete"})
+    if notes:
+        record.responses.append({"question_id": "review_notes", "answer": notes, "source": "text"})
+    _append(db, session, record, "review_confirmed", {"notes": notes})
+
+
+def migrate_legacy_states(db: Session) -> int:
+    """Rewrite pre-v2 interview snapshots in the compact encoding; returns rows changed.
+
+    Legacy rows stay readable without this (``deserialize_state`` handles
+    them); migrating just stops carrying their enrichment_data copy around.
+    """
+    version = OnboardingSession.interview_state["v"].as_integer()
+    # Filtered in SQL, so a boot with nothing to migrate reads no state rows
+    rows = db.execute(
+        select(
+            OnboardingSession.id,
+            OnboardingSession.interview_state,
+            OnboardingSession.enrichment_data,
+        ).where(
+            OnboardingSession.interview_state.is_not(None),
+            or_(version.is_(None), version != STATE_FORMAT_VERSION),
+        )
+    ).all()
+    migrated = 0
+    for session_id, snapshot, enrichment_data in rows:
+        if not snapshot:
+            continue  # JSON null
+        state = deserialize_state(snapshot, enrichment_data)
+        db.execute(
+            update(OnboardingSession)
+            .where(OnboardingSession.id == session_id)
+            .values(
+                interview_state={
+                    **serialize_state(state),
+                    SNAPSHOT_SEQ_KEY: snapshot.get(SNAPSHOT_SEQ_KEY, 0),
+                },
+                # A format migration is not a change to the session
+                updated_at=OnboardingSession.updated_at,
+            )
+        )
+        migrated += 1
+    db.commit()
+    if migrated:
+        logger.info("Migrated %d interview states to format v%d", migrated, STATE_FORMAT_VERSION)
+    return migrated
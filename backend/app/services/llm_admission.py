@@ -0,0 +1,219 @@
+"""Admission control for outbound LLM calls: concurrency, TPM budget, priorities.
+
+Every attempt made by ``llm_gateway`` first asks the controller for a slot:
+
+- at most ``max_concurrency`` requests in flight per model;
+- a token bucket refilled at ``tokens_per_minute`` holds the estimated
+  prompt + completion tokens of each request, and is corrected with the
+  real usage once the response arrives (``tokens_per_minute=0`` disables it);
+- waiters are served by priority class (interactive before default before
+  bulk), FIFO within a class. A waiter blocked only by its model's
+  concurrency limit does not hold up requests for other models.
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.config import settings
+
+PRIORITY_ORDER = {"interactive": 0, "default": 1, "bulk": 2}
+
+# Recent queue waits kept per priority for the metrics percentiles
+WAIT_SAMPLES = 500
+
+
+@dataclass(order=True)
+class _Waiter:
+    rank: int
+    seq: int
+    model: str = field(compare=False)
+    tokens: int = field(compare=False)
+    priority: str = field(compare=False)
+    future: asyncio.Future[None] = field(compare=False)
+
+
+class Admission:
+    """A granted slot. ``record_usage`` corrects the token estimate."""
+
+    def __init__(self, controller: "AdmissionController", tokens: int) -> None:
+        self._controller = controller
+        self.estimated_tokens = tokens
+
+    def record_usage(self, total_tokens: int) -> None:
+        if self._controller.tokens_per_minute <= 0:
+            return
+        self._controller._adjust_tokens(self.estimated_tokens - total_tokens)
+        self.estimated_tokens = total_tokens
+
+
+class AdmissionController:
+    def __init__(
+        self,
+        max_concurrency: int | None = None,
+        tokens_per_minute: int | None = None,
+    ) -> None:
+        self.max_concurrency = (
+            settings.LLM_MAX_CONCURRENCY_PER_MODEL if max_concurrency is None else max_concurrency
+        )
+        self.tokens_per_minute = (
+            settings.LLM_TOKENS_PER_MINUTE if tokens_per_minute is None else tokens_per_minute
+        )
+        self._tokens = float(self.tokens_per_minute)
+        self._refilled_at = time.monotonic()
+        self._in_flight: dict[str, int] = {}
+        self._waiters: list[_Waiter] = []
+        self._seq = itertools.count()
+        self._wake_handle: asyncio.TimerHandle | None = None
+        self._waits_ms: dict[str, deque[float]] = {
+            p: deque(maxlen=WAIT_SAMPLES) for p in PRIORITY_ORDER
+        }
+        self._admitted: dict[str, int] = dict.fromkeys(PRIORITY_ORDER, 0)
+
+    # --- Public API ---
+
+    @asynccontextmanager
+    async def admit(
+        self, model: str, priority: str = "default", estimated_tokens: int = 0
+    ) -> AsyncIterator[Admission]:
+        """Wait for a slot for ``model`` and hold it for the duration of the block."""
+        if priority not in PRIORITY_ORDER:
+            priority = "default"
+        tokens = max(0, min(estimated_tokens, self.tokens_per_minute))
+        if self.tokens_per_minute <= 0:
+            tokens = 0
+        started = time.monotonic()
+        await self._acquire(model, priority, tokens)
+        self._record_wait(priority, (time.monotonic() - started) * 1000)
+        admission = Admission(self, tokens)
+        try:
+            yield admission
+        finally:
+            self._in_flight[model] -= 1
+            self._dispatch()
+
+    def snapshot(self) -> dict[str, Any]:
+        """Queue depth, in-flight counts, token budget and recent wait times."""
+        self._refill()
+        depth = dict.fromkeys(PRIORITY_ORDER, 0)
+        for waiter in self._waiters:
+            depth[waiter.priority] += 1
+        return {
+            "max_concurrency_per_model": self.max_concurrency,
+            "tokens_per_minute": self.tokens_per_minute,
+            "tokens_available": int(self._tokens),
+            "in_flight": {m: n for m, n in self._in_flight.items() if n},
+            "queue_depth": depth,
+            "admitted": dict(self._admitted),
+            "wait_ms": {p: _summarize(samples) for p, samples in self._waits_ms.items()},
+        }
+
+    # --- Internals ---
+
+    async def _acquire(self, model: str, priority: str, tokens: int) -> None:
+        loop = asyncio.get_running_loop()
+        waiter = _Waiter(
+            rank=PRIORITY_ORDER[priority],
+            seq=next(self._seq),
+            model=model,
+            tokens=tokens,
+            priority=priority,
+            future=loop.create_future(),
+        )
+        heapq.heappush(self._waiters, waiter)
+        self._dispatch()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Granted just as we were cancelled: give the slot back
+                self._in_flight[model] -= 1
+                self._tokens += tokens
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+                heapq.heapify(self._waiters)
+            self._dispatch()
+            raise
+
+    def _dispatch(self) -> None:
+        """Grant every waiter that fits, in priority order."""
+        self._refill()
+        granted: list[_Waiter] = []
+        blocked_on_tokens = False
+        for waiter in sorted(self._waiters):
+            if waiter.future.done():
+                continue  # cancelled, removed by its own task shortly
+            if self._in_flight.get(waiter.model, 0) >= self.max_concurrency:
+                continue
+            if waiter.tokens and waiter.tokens > self._tokens:
+                # The head of the line waits for budget; nobody jumps ahead of it
+                blocked_on_tokens = True
+                break
+            self._tokens -= waiter.tokens
+            self._in_flight[waiter.model] = self._in_flight.get(waiter.model, 0) + 1
+            self._admitted[waiter.priority] += 1
+            granted.append(waiter)
+
+        if granted:
+            granted_ids = {id(w) for w in granted}
+            self._waiters = [w for w in self._waiters if id(w) not in granted_ids]
+            heapq.heapify(self._waiters)
+            for waiter in granted:
+                waiter.future.set_result(None)
+
+        if blocked_on_tokens:
+            self._schedule_wake()
+
+    def _schedule_wake(self) -> None:
+        if self._wake_handle is not None:
+            self._wake_handle.cancel()
+        head = min(
+            (
+                w for w in self._waiters
+                if not w.future.done()
+                and self._in_flight.get(w.model, 0) < self.max_concurrency
+            ),
+            default=None,
+        )
+        if head is None:
+            return
+        rate = self.tokens_per_minute / 60
+        delay = max(0.0, (head.tokens - self._tokens) / rate) if rate else 1.0
+        self._wake_handle = asyncio.get_running_loop().call_later(delay, self._dispatch)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        rate = self.tokens_per_minute / 60
+        self._tokens = min(
+            float(self.tokens_per_minute), self._tokens + (now - self._refilled_at) * rate
+        )
+        self._refilled_at = now
+
+    def _adjust_tokens(self, delta: float) -> None:
+        # May go negative when a response used more than estimated
+        self._tokens = min(float(self.tokens_per_minute), self._tokens + delta)
+        self._dispatch()
+
+    def _record_wait(self, priority: str, wait_ms: float) -> None:
+        self._waits_ms[priority].append(wait_ms)
+
+
+def _summarize(samples: deque[float]) -> dict[str, float]:
+    if not samples:
+        return {"count": 0, "avg": 0.0, "p95": 0.0, "max": 0.0}
+    ordered = sorted(samples)
+    return {
+        "count": len(ordered),
+        "avg": round(sum(ordered) / len(ordered), 1),
+        "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 1),
+        "max": round(ordered[-1], 1),
+    }
+
+
+admission_controller = AdmissionController()
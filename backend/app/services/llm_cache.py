@@ -0,0 +1,196 @@
+"""Content-addressed SQLite cache of LLM responses.
+
+Keyed by a hash of everything that determines the output (model, messages,
+temperature, response_format). Only the message content is stored; callers
+re-parse it, so per-request metadata (timestamps, session ids) stays fresh.
+Entries are evicted least-recently-used once the total size passes
+LLM_CACHE_MAX_BYTES; the total is kept as a running counter so stores don't
+re-sum the table. Cache failures are logged and never fail the LLM call.
+"""
+
+import hashlib
+import json
+import logging
+from collections import Counter
+from collections.abc import Callable
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.orm import LLMCacheEntry
+
+logger = logging.getLogger(__name__)
+
+# Replaced in tests to point at the test database
+_session_factory: Callable[[], Session] = SessionLocal
+
+_stats: Counter[str] = Counter()
+_stats_by_site: dict[str, Counter[str]] = {}
+
+# Running sum of size_bytes; None until loaded (and after a failed write)
+_total_bytes: int | None = None
+
+
+def cache_key(
+    model: str,
+    messages: list[dict[str, Any]],
+    temperature: float | None,
+    response_format: dict[str, Any] | None,
+) -> str:
+    """SHA-256 of the canonical JSON of every input that shapes the response."""
+    payload = json.dumps(
+        {
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "response_format": response_format,
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _count(call_site: str, event: str) -> None:
+    _stats[event] += 1
+    _stats_by_site.setdefault(call_site, Counter())[event] += 1
+
+
+def get(key: str, call_site: str = "") -> str | None:
+    """Return the cached content for ``key`` (and mark it used), or None."""
+    try:
+        with _session_factory() as db:
+            entry = db.get(LLMCacheEntry, key)
+            if entry is None:
+                _count(call_site, "misses")
+                return None
+            entry.hits += 1
+            entry.last_accessed_at = datetime.now(timezone.utc)
+            content = entry.content
+            db.commit()
+    except SQLAlchemyError as exc:
+        logger.warning("LLM cache read failed: %s", exc)
+        _count(call_site, "errors")
+        return None
+    _count(call_site, "hits")
+    return content
+
+
+def _load_total(db: Session) -> int:
+    global _total_bytes
+    if _total_bytes is None:
+        _total_bytes = db.scalar(select(func.coalesce(func.sum(LLMCacheEntry.size_bytes), 0))) or 0
+    return _total_bytes
+
+
+def put(key: str, model: str, content: str, call_site: str = "") -> None:
+    """Store a response, then evict least recently used entries over the size limit."""
+    global _total_bytes
+    now = datetime.now(timezone.utc)
+    try:
+        with _session_factory() as db:
+            total = _load_total(db)
+            entry = db.get(LLMCacheEntry, key)
+            if entry is None:
+                entry = LLMCacheEntry(key=key)
+            else:
+                total -= entry.size_bytes
+            entry.call_site = call_site
+            entry.model = model
+            entry.content = content
+            entry.size_bytes = len(content.encode("utf-8"))
+            entry.created_at = now
+            entry.last_accessed_at = now
+            db.add(entry)
+            db.commit()
+            _total_bytes = total + entry.size_bytes
+            evicted = evict_lru(db)
+    except SQLAlchemyError as exc:
+        logger.warning("LLM cache write failed: %s", exc)
+        _count(call_site, "errors")
+        _total_bytes = None
+        return
+    _count(call_site, "stores")
+    if evicted:
+        _stats["evictions"] += evicted
+
+
+def invalidate(key: str) -> None:
+    """Drop an entry whose content turned out to be unusable."""
+    global _total_bytes
+    try:
+        with _session_factory() as db:
+            entry = db.get(LLMCacheEntry, key)
+            if entry is not None:
+                size = entry.size_bytes
+                db.delete(entry)
+                db.commit()
+                if _total_bytes is not None:
+                    _total_bytes -= size
+    except SQLAlchemyError as exc:
+        logger.warning("LLM cache invalidation failed: %s", exc)
+        _total_bytes = None
+
+
+def evict_lru(db: Session) -> int:
+    """Delete least recently used entries until the total size fits LLM_CACHE_MAX_BYTES.
+
+    Checks the running total first, so the table is only read when over the limit.
+    """
+    global _total_bytes
+    total = _load_total(db)
+    excess = total - settings.LLM_CACHE_MAX_BYTES
+    if excess <= 0:
+        return 0
+    rows = db.execute(
+        select(LLMCacheEntry.key, LLMCacheEntry.size_bytes)
+        .order_by(LLMCacheEntry.last_accessed_at.asc())
+    )
+    stale_keys = []
+    freed = 0
+    for key, size in rows:
+        if freed >= excess:
+            break
+        stale_keys.append(key)
+        freed += size
+    rows.close()
+    db.execute(delete(LLMCacheEntry).where(LLMCacheEntry.key.in_(stale_keys)))
+    db.commit()
+    _total_bytes = total - freed
+    logger.info("Evicted %d LLM cache entries", len(stale_keys))
+    return len(stale_keys)
+
+
+def stats() -> dict[str, Any]:
+    """Hit/miss counters since startup plus current cache size."""
+    lookups = _stats["hits"] + _stats["misses"]
+    result: dict[str, Any] = {
+        "enabled": settings.LLM_CACHE_ENABLED,
+        "hits": _stats["hits"],
+        "misses": _stats["misses"],
+        "hit_rate": round(_stats["hits"] / lookups, 3) if lookups else 0.0,
+        "stores": _stats["stores"],
+        "evictions": _stats["evictions"],
+        "errors": _stats["errors"],
+        "by_call_site": {site: dict(counts) for site, counts in _stats_by_site.items()},
+    }
+    try:
+        with _session_factory() as db:
+            result["entries"] = db.scalar(select(func.count()).select_from(LLMCacheEntry)) or 0
+            result["size_bytes"] = db.scalar(
+                select(func.coalesce(func.sum(LLMCacheEntry.size_bytes), 0))
+            ) or 0
+    except SQLAlchemyError as exc:
+        logger.warning("LLM cache stats query failed: %s", exc)
+    return result
+
+
+def reset_stats() -> None:
+    _stats.clear()
+    _stats_by_site.clear()
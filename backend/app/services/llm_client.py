@@ -0,0 +1,61 @@
+"""Shared pooled AsyncOpenAI client for every LLM and transcription call."""
+
+import importlib.util
+import logging
+
+import httpx
+from openai import AsyncOpenAI
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_client: AsyncOpenAI | None = None
+
+
+def _http2_available() -> bool:
+    # httpx only speaks HTTP/2 when the optional 'h2' package is installed
+    return importlib.util.find_spec("h2") is not None
+
+
+def _build_http_client() -> httpx.AsyncClient:
+    http2 = settings.LLM_HTTP2 and _http2_available()
+    if settings.LLM_HTTP2 and not http2:
+        logger.warning(
+            "LLM_HTTP2 is enabled but 'h2' is not installed (pip install 'httpx[http2]'), "
+            "using HTTP/1.1"
+        )
+    return httpx.AsyncClient(
+        http2=http2,
+        timeout=httpx.Timeout(settings.LLM_TIMEOUT_S, connect=settings.LLM_CONNECT_TIMEOUT_S),
+        limits=httpx.Limits(
+            max_connections=settings.LLM_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.LLM_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.LLM_KEEPALIVE_EXPIRY_S,
+        ),
+    )
+
+
+def get_llm_client() -> AsyncOpenAI:
+    """Return the process-wide AsyncOpenAI client, creating it on first use.
+
+    All calls share one connection pool, so repeated requests reuse warm
+    keep-alive connections instead of paying a new TLS handshake each time.
+    """
+    global _client
+    if _client is None or _client.is_closed():
+        _client = AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            timeout=settings.LLM_TIMEOUT_S,
+            max_retries=0,  # retries are handled by llm_gateway
+            http_client=_build_http_client(),
+        )
+    return _client
+
+
+async def close_llm_client() -> None:
+    """Close the shared client (called from the app lifespan)."""
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
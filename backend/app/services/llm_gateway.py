@@ -0,0 +1,383 @@
+"""Single entry point for outbound OpenAI calls: retries, backoff and deadlines.
+
+Every chat completion and transcription goes through ``call_with_retry``:
+
+- transient failures (429, 408/409, 5xx, timeouts, connection errors) are
+  retried with exponential backoff and full jitter;
+- ``Retry-After`` / ``retry-after-ms`` headers set a lower bound on the wait;
+- each call has a deadline instead of a fixed attempt count, so a retry is
+  only made if it can still finish in time;
+- non-retryable errors (auth, bad request, exhausted quota) fail at once.
+
+Each attempt waits for a slot from ``llm_admission`` (per-model concurrency,
+tokens-per-minute budget, priority classes); queueing counts against the
+deadline. The OpenAI SDK's own retries are disabled in ``llm_client`` so the
+two layers never multiply.
+
+Call sites with deterministic prompts can opt into ``llm_cache`` with
+``cache=True``; a hit skips the API entirely. Token usage, including the
+prompt tokens served from the provider's prefix cache, is tallied per call
+site (``usage_stats``).
+"""
+
+import asyncio
+import json
+import logging
+import random
+import time
+from collections import Counter
+from collections.abc import AsyncIterator, Awaitable, Callable
+from email.utils import parsedate_to_datetime
+from types import SimpleNamespace
+from typing import Any, Literal, TypeVar
+
+from openai import (
+    APIConnectionError,
+    APIStatusError,
+    OpenAIError,
+    RateLimitError,
+)
+
+from app.config import settings
+from app.services import llm_cache
+from app.services.llm_admission import admission_controller
+from app.services.llm_client import get_llm_client
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# interactive: a user is waiting on the answer (interview follow-ups)
+# bulk: long generations (reports, simulations)
+Priority = Literal["interactive", "default", "bulk"]
+
+# Expected completion size per priority, for the token budget before usage is known
+COMPLETION_TOKEN_ESTIMATES: dict[str, int] = {"interactive": 300, "default": 1000, "bulk": 4000}
+
+# HTTP statuses worth retrying besides 5xx
+RETRYABLE_STATUS_CODES = frozenset({408, 409, 429})
+
+# Errors raised while parsing model output that a fresh sample may fix.
+# A ValueError from ``parse`` (validation, sanity checks) propagates as is.
+RETRYABLE_OUTPUT_ERRORS: tuple[type[Exception], ...] = (json.JSONDecodeError, KeyError, TypeError)
+
+
+# Token usage per call site since startup
+_usage_by_site: dict[str, Counter[str]] = {}
+
+
+class LLMCallError(Exception):
+    """An LLM call failed for good (non-retryable error or deadline reached)."""
+
+    def __init__(self, call_site: str, attempts: int, last_error: BaseException) -> None:
+        super().__init__(f"{call_site} failed after {attempts} attempt(s): {last_error}")
+        self.call_site = call_site
+        self.attempts = attempts
+        self.last_error = last_error
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Classify an error from an OpenAI call (or output parsing) as transient or not."""
+    if isinstance(exc, RETRYABLE_OUTPUT_ERRORS):
+        return True
+    if isinstance(exc, (TimeoutError, APIConnectionError)):
+        return True
+    if isinstance(exc, RateLimitError):
+        # 429 from an exhausted quota/billing limit will not clear by waiting
+        return getattr(exc, "code", None) != "insufficient_quota"
+    if isinstance(exc, APIStatusError):
+        return exc.status_code >= 500 or exc.status_code in RETRYABLE_STATUS_CODES
+    # Bare OpenAIError: no status to go on, assume transient
+    return isinstance(exc, OpenAIError)
+
+
+def retry_after_seconds(exc: BaseException) -> float | None:
+    """Server-requested wait from Retry-After headers, if any."""
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    retry_ms = headers.get("retry-after-ms")
+    if retry_ms:
+        try:
+            return max(0.0, float(retry_ms) / 1000)
+        except ValueError:
+            pass
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def estimate_tokens(messages: list[dict[str, Any]], priority: Priority) -> int:
+    """Rough prompt + completion token estimate (~4 chars per token)."""
+    prompt_chars = sum(len(str(m.get("content", ""))) for m in messages)
+    return prompt_chars // 4 + COMPLETION_TOKEN_ESTIMATES.get(priority, 1000)
+
+
+def record_usage(call_site: str, usage: Any) -> None:
+    """Tally prompt, cached-prompt and completion tokens reported for one call."""
+    prompt_tokens = getattr(usage, "prompt_tokens", None)
+    if not isinstance(prompt_tokens, int):
+        return
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached_tokens = getattr(details, "cached_tokens", None)
+    if not isinstance(cached_tokens, int):
+        cached_tokens = 0
+    completion_tokens = getattr(usage, "completion_tokens", None)
+    if not isinstance(completion_tokens, int):
+        completion_tokens = 0
+
+    counts = _usage_by_site.setdefault(call_site, Counter())
+    counts["calls"] += 1
+    counts["prompt_tokens"] += prompt_tokens
+    counts["cached_tokens"] += cached_tokens
+    counts["completion_tokens"] += completion_tokens
+    logger.info(
+        "%s usage: prompt=%d (cached=%d) completion=%d",
+        call_site, prompt_tokens, cached_tokens, completion_tokens,
+    )
+
+
+def usage_stats() -> dict[str, dict[str, Any]]:
+    """Token usage per call site, with the share of prompt tokens served from cache."""
+    return {
+        site: {
+            **counts,
+            "cached_ratio": (
+                round(counts["cached_tokens"] / counts["prompt_tokens"], 3)
+                if counts["prompt_tokens"] else 0.0
+            ),
+        }
+        for site, counts in _usage_by_site.items()
+    }
+
+
+def deadline_for(priority: Priority) -> float:
+    if priority == "interactive":
+        return settings.LLM_INTERACTIVE_DEADLINE_S
+    if priority == "bulk":
+        return settings.LLM_BULK_DEADLINE_S
+    return settings.LLM_DEFAULT_DEADLINE_S
+
+
+def backoff_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff for the given (1-based) failed attempt."""
+    cap = min(settings.LLM_RETRY_MAX_DELAY_S, settings.LLM_RETRY_BASE_DELAY_S * 2 ** (attempt - 1))
+    return random.uniform(0, cap)
+
+
+async def call_with_retry(
+    call: Callable[[], Awaitable[T]],
+    *,
+    call_site: str,
+    deadline_s: float,
+) -> T:
+    """Run ``call`` until it succeeds, fails permanently or the deadline passes.
+
+    Raises:
+        LLMCallError: wrapping the last error once no further attempt is possible.
+        ValueError: raised by ``call`` itself (e.g. output validation), unchanged.
+    """
+    deadline = time.monotonic() + deadline_s
+    attempt = 0
+    while True:
+        attempt += 1
+        remaining = deadline - time.monotonic()
+        try:
+            async with asyncio.timeout(remaining):
+                return await call()
+        except Exception as exc:
+            if not is_retryable(exc):
+                if isinstance(exc, ValueError):
+                    raise
+                logger.warning("%s attempt %d failed (not retryable): %s", call_site, attempt, exc)
+                raise LLMCallError(call_site, attempt, exc) from exc
+
+            delay = backoff_delay(attempt)
+            server_delay = retry_after_seconds(exc)
+            if server_delay is not None:
+                delay = max(delay, server_delay)
+            remaining = deadline - time.monotonic()
+            if attempt >= settings.LLM_MAX_ATTEMPTS or delay >= remaining:
+                logger.warning(
+                    "%s attempt %d failed, giving up: %s", call_site, attempt, exc
+                )
+                raise LLMCallError(call_site, attempt, exc) from exc
+
+            logger.warning(
+                "%s attempt %d failed, retrying in %.2fs: %s", call_site, attempt, delay, exc
+            )
+            await asyncio.sleep(delay)
+
+
+def _cached_response(content: str) -> Any:
+    """Minimal stand-in for a ChatCompletion, enough for ``parse`` callbacks."""
+    message = SimpleNamespace(role="assistant", content=content)
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+
+async def chat_completion(
+    *,
+    call_site: str,
+    messages: list[dict[str, Any]],
+    model: str = "gpt-4.1-mini",
+    temperature: float | None = None,
+    response_format: dict[str, Any] | None = None,
+    priority: Priority = "default",
+    deadline_s: float | None = None,
+    parse: Callable[[Any], T] | None = None,
+    cache: bool = False,
+    bypass_cache: bool = False,
+) -> T | Any:
+    """Create a chat completion through the gateway.
+
+    ``parse`` turns the raw response into the caller's result inside the retry
+    loop, so malformed JSON from the model is retried like a transient error.
+    The deadline comes from ``priority`` unless ``deadline_s`` is given.
+
+    With ``cache=True`` the response content is looked up in (and stored to)
+    ``llm_cache``; only responses that ``parse`` accepted are stored, and an
+    entry that no longer parses is dropped. ``bypass_cache`` skips the lookup
+    but still refreshes the entry with the new response.
+    """
+    kwargs: dict[str, Any] = {"model": model, "messages": messages}
+    if response_format is not None:
+        kwargs["response_format"] = response_format
+    if temperature is not None:
+        kwargs["temperature"] = temperature
+
+    cache_key: str | None = None
+    if cache and settings.LLM_CACHE_ENABLED:
+        cache_key = llm_cache.cache_key(model, messages, temperature, response_format)
+        if not bypass_cache:
+            content = llm_cache.get(cache_key, call_site)
+            if content is not None:
+                cached = _cached_response(content)
+                try:
+                    return parse(cached) if parse is not None else cached
+                except (*RETRYABLE_OUTPUT_ERRORS, ValueError) as exc:
+                    logger.warning("%s: dropping unusable cache entry: %s", call_site, exc)
+                    llm_cache.invalidate(cache_key)
+
+    estimated_tokens = estimate_tokens(messages, priority)
+
+    async def call() -> Any:
+        async with admission_controller.admit(model, priority, estimated_tokens) as admission:
+            response = await get_llm_client().chat.completions.create(**kwargs)
+            usage = getattr(response, "usage", None)
+            total_tokens = getattr(usage, "total_tokens", None)
+            if isinstance(total_tokens, int):
+                admission.record_usage(total_tokens)
+            record_usage(call_site, usage)
+        result = parse(response) if parse is not None else response
+        if cache_key is not None:
+            content = response.choices[0].message.content
+            if isinstance(content, str):
+                llm_cache.put(cache_key, model, content, call_site)
+        return result
+
+    return await call_with_retry(
+        call,
+        call_site=call_site,
+        deadline_s=deadline_for(priority) if deadline_s is None else deadline_s,
+    )
+
+
+async def stream_chat_completion(
+    *,
+    call_site: str,
+    messages: list[dict[str, Any]],
+    model: str = "gpt-4.1-mini",
+    temperature: float | None = None,
+    response_format: dict[str, Any] | None = None,
+    priority: Priority = "default",
+    deadline_s: float | None = None,
+) -> AsyncIterator[str]:
+    """Stream a chat completion through the gateway, yielding content deltas.
+
+    Opening the stream is retried like any other call. Once content has been
+    yielded a failure can no longer be retried transparently, so errors while
+    reading (including the deadline) raise ``LLMCallError``. The admission slot
+    is held until the stream ends; the HTTP stream is closed even when the
+    consumer stops early (client disconnect, ``aclose()``).
+    """
+    kwargs: dict[str, Any] = {
+        "model": model,
+        "messages": messages,
+        "stream": True,
+        "stream_options": {"include_usage": True},
+    }
+    if response_format is not None:
+        kwargs["response_format"] = response_format
+    if temperature is not None:
+        kwargs["temperature"] = temperature
+
+    deadline_s = deadline_for(priority) if deadline_s is None else deadline_s
+    deadline = time.monotonic() + deadline_s
+    estimated_tokens = estimate_tokens(messages, priority)
+
+    async with admission_controller.admit(model, priority, estimated_tokens) as admission:
+        stream = await call_with_retry(
+            lambda: get_llm_client().chat.completions.create(**kwargs),
+            call_site=call_site,
+            deadline_s=max(0.0, deadline - time.monotonic()),
+        )
+        chunks = aiter(stream)
+        try:
+            while True:
+                try:
+                    async with asyncio.timeout(deadline - time.monotonic()):
+                        chunk = await anext(chunks)
+                except StopAsyncIteration:
+                    break
+                except (TimeoutError, OpenAIError) as exc:
+                    logger.warning("%s stream failed: %s", call_site, exc)
+                    raise LLMCallError(call_site, 1, exc) from exc
+
+                # With include_usage, the last chunk carries the usage of the whole stream
+                usage = getattr(chunk, "usage", None)
+                total_tokens = getattr(usage, "total_tokens", None)
+                if isinstance(total_tokens, int):
+                    admission.record_usage(total_tokens)
+                record_usage(call_site, usage)
+                if chunk.choices:
+                    content = chunk.choices[0].delta.content
+                    if content:
+                        yield content
+        finally:
+            # Return the connection to the shared pool instead of leaving it to GC
+            await stream.close()
+
+
+async def transcription(
+    *,
+    call_site: str,
+    file: tuple[str, bytes],
+    model: str = "gpt-4o-mini-transcribe",
+    language: str | None = None,
+    priority: Priority = "default",
+    deadline_s: float | None = None,
+) -> Any:
+    """Create an audio transcription through the gateway."""
+    kwargs: dict[str, Any] = {"model": model, "file": file}
+    if language is not None:
+        kwargs["language"] = language
+
+    async def call() -> Any:
+        # Audio models are rate limited per request, not by the chat token budget
+        async with admission_controller.admit(model, priority):
+            return await get_llm_client().audio.transcriptions.create(**kwargs)
+
+    return await call_with_retry(
+        call,
+        call_site=call_site,
+        deadline_s=deadline_for(priority) if deadline_s is None else deadline_s,
+    )
@@ -0,0 +1,136 @@
+"""Domain-keyed cache of scrape results and extracted company profiles.
+
+The scraped text and profile depend only on the site. Web research is
+searched by company name, so it is stored together with the normalized
+name it was done for and only reused for that name.
+"""
+
+import hashlib
+import logging
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlparse
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.orm import ScrapeCacheEntry
+from app.utils.text_signals import normalize
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_domain(url: str) -> str:
+    """Reduce a website URL to its cache key: lowercase host without 'www.'.
+
+    e.g. 'https://WWW.Empresa.com.br/contato' -> 'empresa.com.br'
+    """
+    url = url.strip()
+    if "://" not in url:
+        url = f"https://{url}"
+    parsed = urlparse(url)
+    host = (parsed.hostname or "").rstrip(".")
+    if host.startswith("www."):
+        host = host[4:]
+    if parsed.port and parsed.port not in (80, 443):
+        host = f"{host}:{parsed.port}"
+    return host
+
+
+def content_hash(text: str) -> str:
+    """SHA-256 hex digest of the scraped text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite drops tzinfo on read; values are always written in UTC
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def is_fresh(entry: ScrapeCacheEntry) -> bool:
+    """True if the entry was fetched within SCRAPE_CACHE_TTL_SECONDS."""
+    age = datetime.now(timezone.utc) - _as_utc(entry.fetched_at)
+    return age < timedelta(seconds=settings.SCRAPE_CACHE_TTL_SECONDS)
+
+
+def research_key(company_name: str) -> str:
+    """Names differing only in case, accents or spacing share web research."""
+    return normalize(company_name)
+
+
+def cached_research(entry: ScrapeCacheEntry, company_name: str) -> dict | None:
+    """The entry's web research, if it was done for ``company_name``."""
+    stored = entry.web_research
+    if not stored or stored.get("company") != research_key(company_name):
+        return None
+    return stored["result"]
+
+
+def _research_record(company_name: str, web_research: dict | None) -> dict | None:
+    if web_research is None:
+        return None
+    return {"company": research_key(company_name), "result": web_research}
+
+
+def get_entry(db: Session, domain: str) -> ScrapeCacheEntry | None:
+    """Look up a cache entry and mark it as recently used."""
+    entry = db.get(ScrapeCacheEntry, domain)
+    if entry is not None:
+        entry.last_accessed_at = datetime.now(timezone.utc)
+        db.commit()
+    return entry
+
+
+def store_entry(
+    db: Session,
+    domain: str,
+    website_text: str,
+    text_hash: str,
+    scrape_tier: str,
+    company_profile: dict,
+    company_name: str,
+    web_research: dict | None,
+) -> None:
+    """Insert or refresh the entry for a domain, then evict least recently used ones."""
+    now = datetime.now(timezone.utc)
+    entry = db.get(ScrapeCacheEntry, domain)
+    if entry is None:
+        entry = ScrapeCacheEntry(domain=domain)
+        db.add(entry)
+    entry.website_text = website_text
+    entry.content_hash = text_hash
+    entry.scrape_tier = scrape_tier
+    entry.company_profile = company_profile
+    entry.web_research = _research_record(company_name, web_research)
+    entry.fetched_at = now
+    entry.last_accessed_at = now
+    db.commit()
+    evict_lru(db)
+
+
+def store_research(
+    db: Session, entry: ScrapeCacheEntry, company_name: str, web_research: dict
+) -> None:
+    """Replace a fresh entry's web research (the scrape itself is not refreshed)."""
+    entry.web_research = _research_record(company_name, web_research)
+    db.commit()
+
+
+def evict_lru(db: Session) -> int:
+    """Delete the least recently used entries above SCRAPE_CACHE_MAX_ENTRIES."""
+    count = db.scalar(select(func.count()).select_from(ScrapeCacheEntry)) or 0
+    excess = count - settings.SCRAPE_CACHE_MAX_ENTRIES
+    if excess <= 0:
+        return 0
+    stale = db.scalars(
+        select(ScrapeCacheEntry)
+        .order_by(ScrapeCacheEntry.last_accessed_at.asc())
+        .limit(excess)
+    ).all()
+    for entry in stale:
+        db.delete(entry)
+    db.commit()
+    logger.info("Evicted %d scrape cache entries", len(stale))
+    return len(stale)
@@ -4,11 +4,12 @@ import json
 import logging
 from datetime import datetime, timezone
 
-from openai import AsyncOpenAI, OpenAIError
-
 from app.config import settings
 from app.models.schemas import OnboardingReport, SimulationResult
-from app.prompts.simulation import SYSTEM_PROMPT, build_simulation_prompt
+from app.prompts.schema_compact import response_format_for
+from app.prompts.simulation import SIMULATION_JSON_SCHEMA, SYSTEM_PROMPT, build_simulation_prompt
+from app.services.llm_gateway import LLMCallError, chat_completion
+from app.utils.text_signals import SignalMatcher
 
 logger = logging.getLogger(__name__)
 
@@ -16,16 +17,18 @@ MIN_MESSAGES = 8
 MAX_MESSAGES = 15
 
 
-def _apply_sanity_checks(data: dict) -> list[str]:
+def _apply_sanity_checks(data: dict, never_say: list[str] | None = None) -> list[str]:
     """Validate simulation output and log warnings for issues.
 
     Non-fatal: logs warnings but does not raise. The conversations are still
-    usable even if slightly outside bounds.
+    usable even if slightly outside bounds. Agent messages containing a
+    ``never_say`` term (accents and case ignored) are flagged too.
 
     Returns:
         List of warning messages.
     """
     warnings: list[str] = []
+    forbidden = SignalMatcher(never_say or [])
 
     scenarios = data.get("scenarios", [])
     if len(scenarios) != 2:
@@ -41,6 +44,11 @@ def _apply_sanity_checks(data: dict) -> list[str]:
             warnings.append(
                 f"Cenário {i + 1}: {len(conv)} mensagens (máximo: {MAX_MESSAGES})"
             )
+        for message in conv:
+            if message.get("role") != "agent":
+                continue
+            for term in forbidden.find_all(message.get("content", "")):
+                warnings.append(f"Cenário {i + 1}: agente disse termo proibido '{term}'")
 
     for w in warnings:
         logger.warning("Simulation sanity check: %s", w)
@@ -51,55 +59,55 @@ def _apply_sanity_checks(data: dict) -> list[str]:
 async def generate_simulation(
     report: OnboardingReport,
     session_id: str = "",
+    bypass_cache: bool = False,
 ) -> SimulationResult:
     """Generate 2 simulated collection conversations from an OnboardingReport.
 
     Args:
         report: The complete onboarding report to simulate.
         session_id: Onboarding session ID for metadata.
+        bypass_cache: Ignore a cached response for identical inputs.
 
     Returns:
         Validated SimulationResult with 2 conversation scenarios.
 
     Raises:
-        ValueError: If LLM fails after 2 attempts or output is invalid.
+        ValueError: If the LLM call fails for good or output is invalid.
     """
-    client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
-    user_message = build_simulation_prompt(report)
-
-    for attempt in range(2):
-        try:
-            response = await client.chat.completions.create(
-                model="gpt-4.1-mini",
-                messages=[
-                    {"role": "system", "content": SYSTEM_PROMPT},
-                    {"role": "user", "content": user_message},
-                ],
-                response_format={"type": "json_object"},
-                temperature=0.4,
-            )
-            data = json.loads(response.choices[0].message.content)
-
-            # Inject metadata
-            if "metadata" not in data or not isinstance(data["metadata"], dict):
-                data["metadata"] = {}
-            data["metadata"]["generated_at"] = datetime.now(timezone.utc).isoformat()
-            data["metadata"]["onboarding_session_id"] = session_id
-            data["metadata"]["generation_model"] = "gpt-4.1-mini"
-
-            # Sanity checks (non-fatal, just logs)
-            _apply_sanity_checks(data)
-
-            return SimulationResult(**data)
-
-        except ValueError:
-            raise
-        except (OpenAIError, json.JSONDecodeError, KeyError, Exception) as exc:
-            logger.warning(
-                "Simulation generation attempt %d failed: %s", attempt + 1, exc
-            )
-            if attempt == 0:
-                continue
-            raise ValueError(
-                "Falha na geração da simulação após 2 tentativas."
-            ) from exc
+    schema_format = settings.PROMPT_SCHEMA_FORMAT
+    user_message = build_simulation_prompt(report, schema_format=schema_format)
+
+    def parse(response) -> SimulationResult:
+        data = json.loads(response.choices[0].message.content)
+
+        # Inject metadata
+        if "metadata" not in data or not isinstance(data["metadata"], dict):
+            data["metadata"] = {}
+        data["metadata"]["generated_at"] = datetime.now(timezone.utc).isoformat()
+        data["metadata"]["onboarding_session_id"] = session_id
+        data["metadata"]["generation_model"] = "gpt-4.1-mini"
+
+        # Sanity checks (non-fatal, just logs)
+        _apply_sanity_checks(data, report.guardrails.never_say)
+
+        return SimulationResult(**data)
+
+    try:
+        return await chat_completion(
+            call_site="simulation.generate",
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": user_message},
+            ],
+            response_format=response_format_for(
+                "SimulationResult", SIMULATION_JSON_SCHEMA, schema_format
+            ),
+            temperature=0.4,
+            priority="bulk",
+            parse=parse,
+            cache=True,
+            bypass_cache=bypass_cache,
+        )
+    except LLMCallError as exc:
+        logger.warning("Simulation generation failed: %s", exc)
+        raise ValueError("Falha na geração da simulação.") from exc
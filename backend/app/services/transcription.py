@@ -2,9 +2,7 @@
 
 import logging
 
-from openai import AsyncOpenAI, OpenAIError
-
-from app.config import settings
+from app.services.llm_gateway import LLMCallError, transcription
 
 logger = logging.getLogger(__name__)
 
@@ -54,23 +52,21 @@ async def transcribe_audio(file_bytes: bytes, content_type: str) -> dict:
             f"Formatos aceitos: webm, mp4, wav, mpeg, ogg, flac, m4a."
         )
 
-    client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
     filename = f"audio{extension}"
 
-    for attempt in range(2):
-        try:
-            response = await client.audio.transcriptions.create(
-                model="gpt-4o-mini-transcribe",
-                file=(filename, file_bytes),
-                language="pt",
-            )
-            text = response.text.strip() if response.text else ""
-            duration = getattr(response, "duration", 0.0) or 0.0
-            return {"text": text, "duration_seconds": float(duration)}
-        except OpenAIError as exc:
-            logger.warning("Transcription attempt %d failed: %s", attempt + 1, exc)
-            if attempt == 0:
-                continue
-            raise ValueError(
-                "Falha na transcrição do áudio. Tente novamente ou digite sua resposta."
-            ) from exc
+    try:
+        response = await transcription(
+            call_site="transcription",
+            file=(filename, file_bytes),
+            model="gpt-4o-mini-transcribe",
+            language="pt",
+        )
+    except LLMCallError as exc:
+        logger.warning("Transcription failed: %s", exc)
+        raise ValueError(
+            "Falha na transcrição do áudio. Tente novamente ou digite sua resposta."
+        ) from exc
+
+    text = response.text.strip() if response.text else ""
+    duration = getattr(response, "duration", 0.0) or 0.0
+    return {"text": text, "duration_seconds": float(duration)}
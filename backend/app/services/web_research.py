@@ -3,38 +3,33 @@
 import asyncio
 import json
 import logging
+from collections.abc import Callable
 
 import httpx
-from openai import AsyncOpenAI, OpenAIError
 
 from app.config import settings
 from app.models.schemas import WebResearchResult
 from app.prompts.web_research import CONSOLIDATION_SYSTEM_PROMPT, build_consolidation_prompt
+from app.services.llm_gateway import chat_completion
 
 logger = logging.getLogger(__name__)
 
 SERPER_URL = "https://google.serper.dev/search"
 
 
-def _build_search_queries(company_name: str, segment: str = "") -> list[str]:
-    """Generate 3 search queries focused on collection-agent context.
-
-    Args:
-        company_name: Company name.
-        segment: Business segment from enrichment (e.g. "Construção Civil").
-
-    Returns:
-        List of 3 query strings.
-    """
-    queries = [
+def build_base_queries(company_name: str) -> list[str]:
+    """The 2 queries that only need the company name (can start before enrichment)."""
+    return [
         f'"{company_name}" empresa',
         f'"{company_name}" produtos serviços clientes',
     ]
+
+
+def build_segment_query(company_name: str, segment: str = "") -> str:
+    """The sector query — sector collection dynamics when the segment is known."""
     if segment:
-        queries.append(f'"{segment}" inadimplência cobrança perfil devedor')
-    else:
-        queries.append(f'"{company_name}" setor mercado clientes')
-    return queries
+        return f'"{segment}" inadimplência cobrança perfil devedor'
+    return f'"{company_name}" setor mercado clientes'
 
 
 async def _run_search_query(query: str) -> list[dict]:
@@ -89,68 +84,75 @@ async def _consolidate_snippets(company_name: str, snippets: list[dict]) -> dict
 
     user_message = build_consolidation_prompt(company_name, snippets)
 
-    for attempt in range(2):
-        try:
-            client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
-            response = await client.chat.completions.create(
-                model="gpt-4.1-mini",
-                messages=[
-                    {"role": "system", "content": CONSOLIDATION_SYSTEM_PROMPT},
-                    {"role": "user", "content": user_message},
-                ],
-                response_format={"type": "json_object"},
-                temperature=0.2,
-            )
-            data = json.loads(response.choices[0].message.content)
-            result = WebResearchResult(**data)
-            return result.model_dump()
-        except (OpenAIError, json.JSONDecodeError, Exception) as exc:
-            logger.warning("Consolidation attempt %d failed: %s", attempt + 1, exc)
-            if attempt == 0:
-                continue
-            return WebResearchResult().model_dump()
-
+    def parse(response) -> dict:
+        data = json.loads(response.choices[0].message.content)
+        return WebResearchResult(**data).model_dump()
+
+    try:
+        return await chat_completion(
+            call_site="web_research.consolidate",
+            messages=[
+                {"role": "system", "content": CONSOLIDATION_SYSTEM_PROMPT},
+                {"role": "user", "content": user_message},
+            ],
+            response_format={"type": "json_object"},
+            temperature=0.2,
+            parse=parse,
+            cache=True,
+        )
+    except Exception as exc:
+        logger.warning("Consolidation failed: %s", exc)
+        return WebResearchResult().model_dump()
 
-async def search_company(
-    company_name: str, website_url: str, segment: str = ""
-) -> dict | None:
-    """Orchestrate web research: search, deduplicate, consolidate.
 
-    Args:
-        company_name: Company name to search for.
-        website_url: Company website URL.
-        segment: Business segment from enrichment (used for sector-specific query).
+async def run_searches(
+    queries: list[str],
+    on_result: Callable[[str, list[dict]], None] | None = None,
+) -> list[list[dict]]:
+    """Run Serper queries in parallel. Failed queries yield empty lists.
 
-    Returns:
-        WebResearchResult dict with 5 fields, or None if no API key or all searches fail.
+    ``on_result`` is called with (query, results) as each query finishes.
+    Returns one result list per query (all empty if SEARCH_API_KEY is not set).
     """
     if not settings.SEARCH_API_KEY:
-        logger.info("SEARCH_API_KEY not set, skipping web research")
-        return None
+        return [[] for _ in queries]
+
+    async def run(query: str) -> list[dict]:
+        try:
+            result = await _run_search_query(query)
+        except Exception as exc:
+            logger.warning("Search query returned exception: %s", exc)
+            result = []
+        if on_result is not None:
+            on_result(query, result)
+        return result
 
-    queries = _build_search_queries(company_name, segment)
+    return list(await asyncio.gather(*[run(q) for q in queries]))
 
-    # Run all 3 queries in parallel
-    results = await asyncio.gather(
-        *[_run_search_query(q) for q in queries],
-        return_exceptions=True,
-    )
 
-    # Flatten and deduplicate by URL
+def _dedupe_snippets(results: list[list[dict]]) -> list[dict]:
+    """Flatten per-query results and deduplicate by URL, keeping first occurrence."""
     all_snippets: list[dict] = []
     seen_links: set[str] = set()
     for result in results:
-        if isinstance(result, Exception):
-            logger.warning("Search query returned exception: %s", result)
-            continue
         for snippet in result:
             link = snippet.get("link", "")
             if link and link not in seen_links:
                 seen_links.add(link)
                 all_snippets.append(snippet)
+    return all_snippets
+
+
+async def consolidate_results(company_name: str, results: list[list[dict]]) -> dict | None:
+    """Deduplicate search results and consolidate them via LLM.
 
+    Returns:
+        WebResearchResult dict, or None if there are no snippets at all.
+    """
+    all_snippets = _dedupe_snippets(results)
     if not all_snippets:
         logger.warning("All search queries returned empty results")
         return None
 
     return await _consolidate_snippets(company_name, all_snippets)
+
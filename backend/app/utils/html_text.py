@@ -0,0 +1,125 @@
+"""Lightweight HTML → visible text extraction (no browser)."""
+
+import re
+from html.parser import HTMLParser
+from urllib.parse import urldefrag, urljoin
+
+# Elements whose content is never rendered as page text
+_SKIP_TAGS = frozenset({"script", "style", "noscript", "template", "svg", "head", "iframe"})
+
+# Elements that start a new line of text when rendered
+_BLOCK_TAGS = frozenset({
+    "address", "article", "aside", "blockquote", "br", "dd", "div", "dl", "dt",
+    "fieldset", "figcaption", "figure", "footer", "form", "h1", "h2", "h3", "h4",
+    "h5", "h6", "header", "hr", "li", "main", "nav", "ol", "p", "pre", "section",
+    "table", "td", "th", "tr", "ul",
+})
+
+_VOID_TAGS = frozenset({
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta",
+    "source", "track", "wbr",
+})
+
+# Empty SPA mount points: <div id="root"></div>, <div id="__next"></div>, ...
+_EMPTY_MOUNT_RE = re.compile(
+    r'<div[^>]+id=["\'](?:root|app|__next|__nuxt|svelte)["\'][^>]*>\s*</div>',
+    re.IGNORECASE,
+)
+_ENABLE_JS_RE = re.compile(
+    r"(enable javascript|javascript (?:is )?(?:required|disabled)|"
+    r"habilite o javascript|ative o javascript|javascript desabilitado)",
+    re.IGNORECASE,
+)
+_NOSCRIPT_RE = re.compile(r"<noscript\b[^>]*>(.*?)</noscript>", re.IGNORECASE | re.DOTALL)
+_SCRIPT_RE = re.compile(r"<script\b([^>]*)>(.*?)</script>", re.IGNORECASE | re.DOTALL)
+# Data blocks (JSON-LD, framework state) are not code that renders the page
+_DATA_SCRIPT_TYPE_RE = re.compile(r"""type=["']?application/(?:ld\+)?json""", re.IGNORECASE)
+
+# Inline code this many times longer than the visible text marks a shell
+SCRIPT_TEXT_RATIO = 10
+
+
+class _VisibleTextParser(HTMLParser):
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self._skip_depth = 0
+        self._chunks: list[str] = []
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if tag in _SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag in _BLOCK_TAGS:
+            self._chunks.append("\n")
+
+    def handle_startendtag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if tag in _BLOCK_TAGS:
+            self._chunks.append("\n")
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in _SKIP_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag in _BLOCK_TAGS and tag not in _VOID_TAGS:
+            self._chunks.append("\n")
+
+    def handle_data(self, data: str) -> None:
+        if not self._skip_depth:
+            self._chunks.append(data)
+
+    def text(self) -> str:
+        lines = (" ".join(line.split()) for line in "".join(self._chunks).splitlines())
+        return "\n".join(line for line in lines if line)
+
+
+class _LinkParser(HTMLParser):
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.hrefs: list[str] = []
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if tag == "a":
+            href = dict(attrs).get("href")
+            if href:
+                self.hrefs.append(href.strip())
+
+
+def extract_visible_text(html: str) -> str:
+    """Return the human-visible text of an HTML document, one block per line."""
+    parser = _VisibleTextParser()
+    parser.feed(html)
+    parser.close()
+    return parser.text()
+
+
+def looks_like_js_shell(html: str, text: str) -> bool:
+    """Heuristically detect client-rendered pages whose HTML is not the content.
+
+    Independent of how much text the HTML carries (SEO fallback copy can be
+    long), a page is a JS shell when it has an empty SPA mount point, a
+    <noscript> asking the visitor to enable JavaScript, or inline script code
+    that dwarfs its visible ``text``.
+    """
+    if _EMPTY_MOUNT_RE.search(html):
+        return True
+    if any(_ENABLE_JS_RE.search(body) for body in _NOSCRIPT_RE.findall(html)):
+        return True
+    script_chars = sum(
+        len(body.strip())
+        for attrs, body in _SCRIPT_RE.findall(html)
+        if not _DATA_SCRIPT_TYPE_RE.search(attrs)
+    )
+    return script_chars > SCRIPT_TEXT_RATIO * max(len(text), 1)
+
+
+def extract_links(html: str, base_url: str) -> list[str]:
+    """Return absolute http(s) URLs of all <a href> links, fragments removed, in order."""
+    parser = _LinkParser()
+    parser.feed(html)
+    parser.close()
+    links: list[str] = []
+    seen: set[str] = set()
+    for href in parser.hrefs:
+        absolute = urldefrag(urljoin(base_url, href)).url
+        if absolute.startswith(("http://", "https://")) and absolute not in seen:
+            seen.add(absolute)
+            links.append(absolute)
+    return links
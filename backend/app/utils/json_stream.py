@@ -0,0 +1,108 @@
+"""Incremental parsing of a JSON object that arrives in chunks."""
+
+import json
+from typing import Any
+
+_WHITESPACE = frozenset(" \t\r\n")
+
+
+class JsonObjectStream:
+    """Yields the top-level members of a streamed JSON object as they complete.
+
+    Feed text chunks as they arrive; ``feed`` returns the ``(key, value)``
+    pairs whose values were closed by that chunk. Each character is scanned
+    once, and text of members already returned is discarded, so the cost is
+    linear in the size of the document.
+
+    Raises:
+        json.JSONDecodeError: if the text is not a JSON object.
+    """
+
+    def __init__(self) -> None:
+        self._text = ""
+        self._pos = 0  # next character to scan
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._started = False
+        self.done = False
+        # Member being parsed: "key", "colon", "value" (before it starts), "in_value"
+        self._expect = "key"
+        self._token_start = 0
+        self._key: str | None = None
+
+    def feed(self, chunk: str) -> list[tuple[str, Any]]:
+        self._text += chunk
+        members: list[tuple[str, Any]] = []
+        text = self._text
+        i = self._pos
+        while i < len(text) and not self.done:
+            ch = text[i]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == "\\":
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        if self._expect == "key":
+                            self._key = json.loads(text[self._token_start:i + 1])
+                            self._expect = "colon"
+                        elif self._expect == "in_value":
+                            members.append(self._complete(text, i + 1))
+            elif not self._started:
+                if ch == "{":
+                    self._started = True
+                    self._depth = 1
+                elif ch not in _WHITESPACE:
+                    raise json.JSONDecodeError("Expected '{'", text, i)
+            elif ch == '"':
+                self._in_string = True
+                if self._depth == 1 and self._expect in ("key", "value"):
+                    self._token_start = i
+                    if self._expect == "value":
+                        self._expect = "in_value"
+            elif ch in "{[":
+                if self._depth == 1 and self._expect == "value":
+                    self._token_start = i
+                    self._expect = "in_value"
+                self._depth += 1
+            elif ch in "}]":
+                if self._depth == 1:
+                    # End of the object; a pending scalar ends here too
+                    if self._expect == "in_value":
+                        members.append(self._complete(text, i))
+                    self.done = True
+                else:
+                    self._depth -= 1
+                    if self._depth == 1 and self._expect == "in_value":
+                        members.append(self._complete(text, i + 1))
+            elif self._depth == 1:
+                if ch == ":" and self._expect == "colon":
+                    self._expect = "value"
+                elif ch == ",":
+                    if self._expect == "in_value":
+                        members.append(self._complete(text, i))
+                    self._expect = "key"
+                elif ch not in _WHITESPACE and self._expect == "value":
+                    # Number, true, false or null: ends at the next ',' or '}'
+                    self._token_start = i
+                    self._expect = "in_value"
+            i += 1
+
+        # Keep only what an unfinished member still needs
+        keep_from = self._token_start if self._expect == "in_value" or (
+            self._in_string and self._expect == "key"
+        ) else i
+        self._text = text[keep_from:]
+        self._token_start -= keep_from
+        self._pos = i - keep_from
+        return members
+
+    def _complete(self, text: str, end: int) -> tuple[str, Any]:
+        value = json.loads(text[self._token_start:end])
+        key = self._key or ""
+        self._key = None
+        self._expect = "after_value"
+        return key, value
@@ -0,0 +1,21 @@
+"""Server-Sent Events framing helpers."""
+
+import json
+from typing import Any
+
+# Headers for event streams: no caching, no proxy buffering (nginx)
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+# Comment line that keeps idle connections open through proxies
+SSE_KEEPALIVE = ": keepalive\n\n"
+
+
+def format_sse(event: str, data: Any, event_id: int | str | None = None) -> str:
+    """Encode one SSE message with a JSON payload."""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    payload = json.dumps(data, ensure_ascii=False, default=str)
+    lines.extend(f"data: {line}" for line in payload.splitlines() or [""])
+    return "\n".join(lines) + "\n\n"
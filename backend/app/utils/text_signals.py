@@ -0,0 +1,129 @@
+"""Accent-insensitive multi-phrase matching for short user texts.
+
+Phrase lists (frustration signals, skip answers, guardrail terms) are
+normalized the same way as the text they are matched against: lowercase,
+accents folded via NFKD and whitespace collapsed, so "Você  deveria" and
+"voce deveria" are the same phrase. ``SignalMatcher`` compiles a list into
+an Aho-Corasick automaton once and then finds every phrase in a single pass
+over the text, however many phrases there are.
+"""
+
+import re
+import unicodedata
+from collections import deque
+from collections.abc import Iterable
+
+_WHITESPACE = re.compile(r"\s+")
+# Combining diacritical marks left over by NFKD ("ã" -> "a" + U+0303)
+_COMBINING_MARKS = re.compile("[\u0300-\u036f]")
+
+
+def fold(text: str) -> str:
+    """Lowercase and strip accents ("Ligação" -> "ligacao"), keeping layout."""
+    text = text.casefold()
+    if text.isascii():
+        return text
+    return _COMBINING_MARKS.sub("", unicodedata.normalize("NFKD", text))
+
+
+def normalize(text: str) -> str:
+    """``fold`` plus whitespace collapsed to single spaces and trimmed."""
+    return _WHITESPACE.sub(" ", fold(text)).strip()
+
+
+def normalized_set(values: Iterable[str]) -> frozenset[str]:
+    """Normalized lookup set for whole-text comparisons (``normalize(x) in s``)."""
+    return frozenset(normalize(v) for v in values)
+
+
+class SignalMatcher:
+    """Aho-Corasick automaton over a fixed list of phrases.
+
+    The automaton is built as a DFA (failure links folded into the transition
+    tables), so matching costs one dict lookup per character of the text.
+    With ``whole_words`` a phrase only matches between non-alphanumeric
+    boundaries, so "spc" does not match inside "spcx". A trailing ``*`` marks
+    a stem, which must start a word but may end anywhere: "parcel*" matches
+    "parcelamento", not "reparcelar".
+    """
+
+    def __init__(self, phrases: Iterable[str], *, whole_words: bool = True) -> None:
+        self.whole_words = whole_words
+        self._phrases: list[str] = []
+        self._lengths: list[int] = []
+        self._stems: list[bool] = []
+        transitions: list[dict[str, int]] = [{}]
+        outputs: list[list[int]] = [[]]
+
+        seen: set[str] = set()
+        for phrase in phrases:
+            key = normalize(phrase)
+            stem = key.endswith("*")
+            key = key.rstrip("*")
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            state = 0
+            for ch in key:
+                nxt = transitions[state].get(ch)
+                if nxt is None:
+                    nxt = len(transitions)
+                    transitions[state][ch] = nxt
+                    transitions.append({})
+                    outputs.append([])
+                state = nxt
+            outputs[state].append(len(self._phrases))
+            self._phrases.append(phrase)
+            self._lengths.append(len(key))
+            self._stems.append(stem)
+
+        # BFS over the trie: compute failure links and fold them into a DFA
+        fail = [0] * len(transitions)
+        delta: list[dict[str, int]] = [dict(t) for t in transitions]
+        queue = deque(transitions[0].values())
+        while queue:
+            state = queue.popleft()
+            outputs[state] = outputs[state] + outputs[fail[state]]
+            delta[state] = {**delta[fail[state]], **transitions[state]}
+            for ch, child in transitions[state].items():
+                fail[child] = delta[fail[state]].get(ch, 0)
+                queue.append(child)
+
+        self._delta = delta
+        self._outputs = [tuple(out) for out in outputs]
+
+    def __len__(self) -> int:
+        return len(self._phrases)
+
+    def _matches(self, text: str, first_only: bool) -> list[int]:
+        found: list[int] = []
+        delta, outputs, lengths, stems = self._delta, self._outputs, self._lengths, self._stems
+        whole_words = self.whole_words
+        last = len(text) - 1
+        state = 0
+        for end, ch in enumerate(text):
+            state = delta[state].get(ch, 0)
+            matched = outputs[state]
+            if not matched:
+                continue
+            for index in matched:
+                if whole_words:
+                    start = end - lengths[index] + 1
+                    if start > 0 and text[start - 1].isalnum():
+                        continue
+                    if not stems[index] and end < last and text[end + 1].isalnum():
+                        continue
+                if index not in found:
+                    found.append(index)
+                    if first_only:
+                        return found
+        return found
+
+    def search(self, text: str) -> str | None:
+        """First phrase (as given) found in ``text``, or None."""
+        found = self._matches(normalize(text), first_only=True)
+        return self._phrases[found[0]] if found else None
+
+    def find_all(self, text: str) -> list[str]:
+        """Every distinct phrase (as given) found in ``text``, in order of occurrence."""
+        return [self._phrases[i] for i in self._matches(normalize(text), first_only=False)]
@@ -1,9 +1,17 @@
 """URL validation utilities for SSRF protection."""
 
+import asyncio
 import ipaddress
 import socket
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
 from urllib.parse import urlparse
 
+# Hostname → vetted public IPs, shared by every async validation on the worker
+DNS_CACHE_TTL_S = 300.0
+DNS_CACHE_MAX_ENTRIES = 1024
+
 
 def _is_private_ip(ip_str: str) -> bool:
     """Check if an IP address string is private, reserved, or loopback."""
@@ -76,39 +84,127 @@ def validate_url_scheme(url: str) -> str:
     return url
 
 
-def validate_url(url: str) -> str:
-    """Full URL validation with DNS resolution. For use in scrape_website().
+def _vet_addrinfo(hostname: str, addrinfo: list) -> list[str]:
+    """Reject private/reserved results; return the resolved IPs in order."""
+    if not addrinfo:
+        raise ValueError(f"No DNS results for hostname '{hostname}'")
 
-    Calls validate_url_scheme() first, then resolves hostname and checks
-    all resolved IPs against private/reserved ranges.
+    ips: list[str] = []
+    for family, _type, _proto, _canonname, sockaddr in addrinfo:
+        ip_str = sockaddr[0]
+        if _is_private_ip(ip_str):
+            raise ValueError(
+                f"Hostname '{hostname}' resolves to private/reserved IP '{ip_str}'"
+            )
+        if ip_str not in ips:
+            ips.append(ip_str)
+    return ips
 
-    Returns cleaned URL or raises ValueError.
-    """
-    url = validate_url_scheme(url)
-    parsed = urlparse(url)
-    hostname = parsed.hostname or ""
 
-    # Skip DNS check for literal IPs (already validated by validate_url_scheme)
+def _literal_ip(hostname: str) -> str | None:
     try:
-        ipaddress.ip_address(hostname)
-        return url  # already validated as non-private in validate_url_scheme
+        return str(ipaddress.ip_address(hostname))
     except ValueError:
-        pass  # hostname, not IP — resolve via DNS
+        return None
+
+
+class _DnsCache:
+    """Small TTL-bounded LRU of hostname → vetted IPs."""
+
+    def __init__(self, ttl_s: float, max_entries: int) -> None:
+        self.ttl_s = ttl_s
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, list[str]]] = OrderedDict()
+
+    def get(self, hostname: str) -> list[str] | None:
+        entry = self._entries.get(hostname)
+        if entry is None:
+            return None
+        expires_at, ips = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[hostname]
+            return None
+        self._entries.move_to_end(hostname)
+        return ips
+
+    def put(self, hostname: str, ips: list[str]) -> None:
+        self._entries[hostname] = (time.monotonic() + self.ttl_s, ips)
+        self._entries.move_to_end(hostname)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+_dns_cache = _DnsCache(DNS_CACHE_TTL_S, DNS_CACHE_MAX_ENTRIES)
+
+
+def clear_dns_cache() -> None:
+    """Drop all cached resolutions (tests, or after a network change)."""
+    _dns_cache.clear()
+
+
+async def resolve_public_ips(hostname: str) -> list[str]:
+    """Resolve a hostname without blocking the event loop and vet every IP.
+
+    Uses the loop's executor-backed getaddrinfo; only vetted (all-public)
+    results are cached, so a private answer is re-checked every time.
 
-    # DNS resolution
+    Returns the list of IPs or raises ValueError.
+    """
+    hostname = hostname.lower()
+    literal = _literal_ip(hostname)
+    if literal is not None:
+        return [literal]
+
+    cached = _dns_cache.get(hostname)
+    if cached is not None:
+        return cached
+
+    loop = asyncio.get_running_loop()
     try:
-        addrinfo = socket.getaddrinfo(hostname, None, socket.AF_UNSPEC, socket.SOCK_STREAM)
+        addrinfo = await loop.getaddrinfo(
+            hostname, None, family=socket.AF_UNSPEC, type=socket.SOCK_STREAM
+        )
     except socket.gaierror:
         raise ValueError(f"Could not resolve hostname '{hostname}'")
 
-    if not addrinfo:
-        raise ValueError(f"No DNS results for hostname '{hostname}'")
+    ips = _vet_addrinfo(hostname, addrinfo)
+    _dns_cache.put(hostname, ips)
+    return ips
 
-    for family, _type, _proto, _canonname, sockaddr in addrinfo:
-        ip_str = sockaddr[0]
-        if _is_private_ip(ip_str):
-            raise ValueError(
-                f"Hostname '{hostname}' resolves to private/reserved IP '{ip_str}'"
-            )
 
-    return url
+@dataclass(frozen=True)
+class ValidatedURL:
+    """A URL that passed SSRF checks, plus the vetted IPs to connect to.
+
+    Fetchers connect to ``ips`` directly instead of resolving ``hostname``
+    again, so the address that was checked is the address that is used.
+    """
+
+    url: str
+    hostname: str
+    ips: tuple[str, ...]
+
+
+async def resolve_validated_url(url: str) -> ValidatedURL:
+    """Validate a URL and return it pinned to its vetted IPs.
+
+    Raises ValueError on any validation or resolution failure.
+    """
+    url = validate_url_scheme(url)
+    hostname = (urlparse(url).hostname or "").lower()
+    ips = await resolve_public_ips(hostname)
+    return ValidatedURL(url=url, hostname=hostname, ips=tuple(ips))
+
+
+async def validate_url_async(url: str) -> str:
+    """Full URL validation with DNS resolution (non-blocking, cached).
+
+    Calls validate_url_scheme() first, then resolves the hostname and checks
+    all resolved IPs against private/reserved ranges.
+
+    Returns cleaned URL or raises ValueError.
+    """
+    return (await resolve_validated_url(url)).url
@@ -0,0 +1,71 @@
+"""Micro-benchmark of ``submit_answer`` with per-call vs cached graph compilation.
+
+"per-call compile" reproduces the old behaviour: the next-question
+StateGraph is rebuilt, compiled and run synchronously on every answer.
+"cached" uses the module-level compiled graph with ``ainvoke``. The
+answered question is a policy question answered "nao", which advances
+without any LLM call, so only graph overhead is measured.
+
+Run from backend/:
+
+    python -m benchmarks.interview_graph [--iterations 300]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from unittest.mock import patch
+
+from app.services import interview_agent
+from app.services.interview_agent import create_interview, submit_answer
+
+
+class _RecompilingGraph:
+    """Stands in for the cached graph, compiling on every call like before."""
+
+    async def ainvoke(self, state: dict) -> dict:
+        return interview_agent._build_next_question_graph().compile().invoke(state)
+
+
+async def _state_at_policy_question() -> interview_agent.InterviewState:
+    state = await create_interview({})
+    # core_0 (optional, no LLM) then jump the current question to core_2 (policy)
+    _, state = await submit_answer(state, "core_0", "Sofia")
+    remaining = list(state["core_questions_remaining"])
+    policy = next(q for q in remaining if q["question_id"] == "core_2")
+    remaining.remove(policy)
+    return interview_agent._update_state(
+        state, current_question=policy, core_questions_remaining=remaining
+    )
+
+
+async def _time_submits(state: interview_agent.InterviewState, iterations: int) -> list[float]:
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        await submit_answer(state, "core_2", "nao")
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=300)
+    args = parser.parse_args()
+
+    state = await _state_at_policy_question()
+    with patch.object(interview_agent, "_NEXT_QUESTION_GRAPH", _RecompilingGraph()):
+        before = await _time_submits(state, args.iterations)
+    after = await _time_submits(state, args.iterations)
+
+    print(f"submit_answer latency over {args.iterations} calls (ms)")
+    print(f"{'variant':<18} {'median':>8} {'p95':>8}")
+    for name, timings in (("per-call compile", before), ("cached", after)):
+        p95 = sorted(timings)[int(len(timings) * 0.95) - 1]
+        print(f"{name:<18} {statistics.median(timings):>8.3f} {p95:>8.3f}")
+    print(f"speedup: {statistics.median(before) / statistics.median(after):.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
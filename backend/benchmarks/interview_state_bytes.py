@@ -0,0 +1,146 @@
+"""Bytes written to the database per interview answer, before and after.
+
+"v1 blobs" reproduces the original persistence: every answer rewrote the
+whole ``interview_state`` (a full copy of the state, enrichment_data
+included) and the whole ``interview_responses`` list. "events + v2" is the
+current one: one ``interview_events`` insert per answer plus a compact v2
+snapshot every ``INTERVIEW_SNAPSHOT_INTERVAL`` events and at review.
+
+Bytes are counted from the parameters of every INSERT/UPDATE sent to an
+in-memory SQLite database, so they are what the driver actually writes.
+
+Run from backend/:
+
+    python -m benchmarks.interview_state_bytes [--research-kb 8]
+"""
+
+import argparse
+import asyncio
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.database import Base
+from app.models.orm import OnboardingSession
+from app.services import interview_store
+from app.services.interview_agent import create_interview, submit_answer
+
+ANSWERS = [
+    ("core_0", "Sofia"),
+    ("core_1", "WhatsApp no D+1, ligação no D+10, proposta de acordo no D+20, jurídico no D+60."),
+    ("core_2", "sim"),
+    ("followup_core_2_1", "1% ao mês pro rata"),
+    ("core_3", "sim"),
+    ("followup_core_3_1", "Até 15% para quitação à vista"),
+    ("core_4", "sim"),
+    ("followup_core_4_1", "Até 6 parcelas, mínimo de R$ 50"),
+    ("core_5", "nao"),
+    ("core_6", "Dívidas acima de R$ 10 mil vão para o gerente"),
+]
+
+
+def _enrichment(research_kb: int) -> dict:
+    paragraph = (
+        "A Acme Telecom é um provedor regional de fibra óptica com forte presença no "
+        "interior, boa reputação no Reclame Aqui e reclamações concentradas em cobrança. "
+    )
+    research = (paragraph * (research_kb * 1024 // len(paragraph) + 1))[: research_kb * 1024]
+    return {
+        "company_name": "Acme Telecom",
+        "segment": "Telecomunicações",
+        "products_description": "Planos de internet fibra e telefonia móvel",
+        "target_audience": "Clientes residenciais das classes B e C",
+        "website_summary": paragraph * 6,
+        "web_research": {"company_profile": research, "sources": ["https://example.com"] * 5},
+    }
+
+
+class _ByteCounter:
+    def __init__(self) -> None:
+        self.total = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        if not statement.lstrip().upper().startswith(("INSERT", "UPDATE")):
+            return
+        rows = parameters if executemany else [parameters]
+        for row in rows:
+            values = row.values() if isinstance(row, dict) else row
+            for value in values:
+                if isinstance(value, str):
+                    self.total += len(value.encode("utf-8"))
+                elif isinstance(value, bytes):
+                    self.total += len(value)
+
+
+def _verdict(question_id: str):
+    # core_1 is judged detailed enough: no follow-up, no LLM involved
+    return (False, None) if question_id == "core_1" else None
+
+
+async def _v1_blobs(db: Session, session: OnboardingSession, counter: _ByteCounter) -> list[int]:
+    state = await create_interview(session.enrichment_data)
+    session.interview_state = dict(state)
+    db.commit()
+    per_answer, responses = [], []
+    for question_id, answer in ANSWERS:
+        before = counter.total
+        _, state = await submit_answer(state, question_id, answer, follow_up_verdict=_verdict(question_id))
+        responses = [*responses, {"question_id": question_id, "answer": answer, "source": "text"}]
+        session.interview_responses = responses
+        session.interview_state = dict(state)
+        db.commit()
+        per_answer.append(counter.total - before)
+    return per_answer
+
+
+async def _events_v2(db: Session, session: OnboardingSession, counter: _ByteCounter) -> list[int]:
+    interview_store.record_started(db, session, await create_interview(session.enrichment_data))
+    db.commit()
+    per_answer = []
+    for question_id, answer in ANSWERS:
+        before = counter.total
+        record = interview_store.load(db, session)
+        _, state = await submit_answer(
+            record.state, question_id, answer, follow_up_verdict=_verdict(question_id)
+        )
+        interview_store.record_answer(db, session, record, state)
+        db.commit()
+        per_answer.append(counter.total - before)
+    return per_answer
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--research-kb", type=int, default=8)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    counter = _ByteCounter()
+    event.listen(engine, "before_cursor_execute", counter)
+    session_factory = sessionmaker(bind=engine)
+
+    results = {}
+    for name, run in (("v1 blobs", _v1_blobs), ("events + v2", _events_v2)):
+        with session_factory() as db:
+            session = OnboardingSession(
+                company_name="Acme Telecom",
+                company_website="https://acme.example",
+                enrichment_data=_enrichment(args.research_kb),
+            )
+            db.add(session)
+            db.commit()
+            results[name] = await run(db, session, counter)
+
+    names = list(results)
+    print(f"Bytes written per answer (enrichment web_research: {args.research_kb} KB)")
+    print(f"{'answer':<20}" + "".join(f"{name:>14}" for name in names))
+    for i, (question_id, _) in enumerate(ANSWERS):
+        print(f"{question_id:<20}" + "".join(f"{results[n][i]:>14,}" for n in names))
+    totals = {name: sum(values) for name, values in results.items()}
+    print(f"{'total':<20}" + "".join(f"{totals[n]:>14,}" for n in names))
+    print(f"reduction: {1 - totals['events + v2'] / totals['v1 blobs']:.0%}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,63 @@
+"""Prompt token counts per PROMPT_SCHEMA_FORMAT.
+
+Counts the tokens of the static prompt prefix (system prompt + the
+session-independent part of the user message, which carries the output
+schema) for report generation, each report section and simulation.
+
+Uses tiktoken's o200k_base encoding (gpt-4.1 family) when tiktoken is
+installed, otherwise estimates 4 characters per token.
+
+Run from backend/:
+
+    python -m benchmarks.prompt_schema_tokens
+"""
+
+from collections.abc import Callable
+
+from app.prompts import agent_generator, simulation
+from app.prompts.schema_compact import SchemaFormat
+
+FORMATS: tuple[SchemaFormat, ...] = ("full", "compact", "typescript", "structured")
+
+
+def _token_counter() -> tuple[Callable[[str], int], str]:
+    try:
+        import tiktoken
+    except ImportError:
+        return (lambda text: len(text) // 4), "estimate: chars/4"
+    encoding = tiktoken.get_encoding("o200k_base")
+    return (lambda text: len(encoding.encode(text))), "tiktoken o200k_base"
+
+
+def _prompts(schema_format: SchemaFormat) -> dict[str, str]:
+    prompts = {
+        "report": agent_generator.SYSTEM_PROMPT
+        + agent_generator.static_prefix(None, schema_format),
+    }
+    for section in agent_generator.REPORT_SECTIONS:
+        prompts[f"report:{section}"] = agent_generator.SECTION_SYSTEM_PROMPT + (
+            agent_generator.static_prefix(section, schema_format)
+        )
+    prompts["simulation"] = simulation.SYSTEM_PROMPT + simulation.static_prefix(schema_format)
+    return prompts
+
+
+def main() -> None:
+    count, method = _token_counter()
+    table = {fmt: {name: count(text) for name, text in _prompts(fmt).items()} for fmt in FORMATS}
+    names = list(table["full"])
+
+    print(f"Static prompt prefix tokens ({method})")
+    print(f"{'prompt':<18}" + "".join(f"{fmt:>12}" for fmt in FORMATS))
+    for name in names:
+        row = "".join(f"{table[fmt][name]:>12}" for fmt in FORMATS)
+        print(f"{name:<18}{row}")
+    print()
+    for fmt in FORMATS[1:]:
+        saved = 1 - table[fmt]["report"] / table["full"]["report"]
+        print(f"report prompt, {fmt} vs full: {saved:.0%} fewer tokens")
+    print("(structured: the schema is sent as response_format and not counted here)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Compare single-call and sectioned onboarding report generation.
+
+The OpenAI client is replaced by a fake whose latency follows the usual
+shape of a completion: a fixed time to first token plus a per-output-token
+decode time. Output sizes come from a realistic report, so the comparison
+reflects how much each mode has to generate on its critical path.
+
+Run from backend/:
+
+    python -m benchmarks.report_generation [--runs 5] [--ttft-ms 600] [--tokens-per-s 80]
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from app.config import settings
+from app.prompts.agent_generator import REPORT_SECTIONS
+from app.services.agent_generator import generate_onboarding_report
+
+_EXPERT_PARAGRAPH = (
+    "A Acme Telecom atua no segmento de telecomunicações residenciais, com uma base "
+    "ampla de clientes pessoa física e tíquete médio baixo. Recomenda-se um tom amigável "
+    "e firme, com lembretes curtos via WhatsApp antes do vencimento e propostas de "
+    "parcelamento a partir do D+15, sempre respeitando o CDC e a LGPD. "
+)
+
+REPORT = {
+    "agent_identity": {"name": "Luna"},
+    "company": {
+        "name": "Acme Telecom",
+        "segment": "Telecomunicações",
+        "products": "Planos de internet fibra e telefonia móvel",
+        "target_audience": "Clientes residenciais das classes B e C",
+        "website": "https://acme-telecom.com.br",
+    },
+    "enrichment_summary": {
+        "website_analysis": "Provedor regional de fibra óptica com planos pré e pós-pagos.",
+        "web_research": "Boa reputação, reclamações concentradas em cobranças indevidas.",
+    },
+    "collection_profile": {
+        "debt_type": "Mensalidades em atraso de planos pós-pagos",
+        "typical_debtor_profile": "Pessoa física, atraso de 15 a 60 dias, valores baixos",
+        "business_specific_objections": "Contestação de cobrança após cancelamento",
+        "payment_verification_process": "Baixa automática via retorno bancário",
+        "sector_regulations": "Resoluções da Anatel, CDC, LGPD",
+    },
+    "collection_policies": {
+        "overdue_definition": "A partir de 5 dias após o vencimento",
+        "discount_policy": "Até 15% de desconto em juros e multa para quitação à vista",
+        "installment_policy": "Até 6 parcelas, parcela mínima de R$ 40",
+        "interest_policy": "Juros de 1% ao mês pro rata",
+        "penalty_policy": "Multa de 2% sobre o valor em atraso",
+        "payment_methods": ["pix", "boleto", "cartao_credito"],
+        "escalation_triggers": ["Devedor solicita humano", "Contestação de cobrança"],
+        "escalation_custom_rules": "Clientes empresariais vão para o time comercial",
+        "collection_flow_description": "D+5 WhatsApp, D+15 proposta, D+30 suspensão parcial",
+    },
+    "communication": {
+        "tone_style": "friendly",
+        "prohibited_actions": ["Ameaçar corte imediato", "Contato após as 20h"],
+        "brand_specific_language": "Usar 'fatura em aberto' em vez de 'dívida'",
+    },
+    "guardrails": {
+        "never_do": ["Ameaçar o devedor", "Expor a dívida a terceiros"],
+        "never_say": ["SPC", "Serasa", "processo judicial"],
+        "must_identify_as_ai": True,
+        "follow_up_interval_days": 3,
+        "max_attempts_before_stop": 10,
+    },
+    # ~450 words, in line with the >= 300 words the prompt asks for
+    "expert_recommendations": _EXPERT_PARAGRAPH * 9,
+}
+
+INTERVIEW_RESPONSES = [
+    {"question_id": "core_1", "question_text": "Processo", "answer": "WhatsApp e boleto"},
+    {"question_id": "core_2", "question_text": "Juros", "answer": "sim"},
+    {"question_id": "core_3", "question_text": "Desconto", "answer": "sim"},
+]
+
+
+def _fake_client(ttft_s: float, tokens_per_s: float) -> SimpleNamespace:
+    async def create(**kwargs):
+        user_message = kwargs["messages"][-1]["content"]
+        fields = next(
+            (
+                REPORT_SECTIONS[name] for name in REPORT_SECTIONS
+                if f"parte do OnboardingReport: {name})" in user_message
+            ),
+            tuple(REPORT),
+        )
+        content = json.dumps({name: REPORT[name] for name in fields}, ensure_ascii=False)
+        output_tokens = len(content) / 4
+        await asyncio.sleep(ttft_s + output_tokens / tokens_per_s)
+        message = SimpleNamespace(content=content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+    return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+
+async def _time_mode(mode: str, runs: int) -> list[float]:
+    settings.REPORT_GENERATION_MODE = mode
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        await generate_onboarding_report(None, INTERVIEW_RESPONSES, session_id="bench")
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--ttft-ms", type=float, default=600.0)
+    parser.add_argument("--tokens-per-s", type=float, default=80.0)
+    args = parser.parse_args()
+
+    settings.LLM_CACHE_ENABLED = False
+    client = _fake_client(args.ttft_ms / 1000, args.tokens_per_s)
+    with patch("app.services.llm_gateway.get_llm_client", return_value=client):
+        results = {mode: await _time_mode(mode, args.runs) for mode in ("single", "sectioned")}
+
+    print(f"{'mode':<10} {'median s':>9} {'min s':>7} {'max s':>7}")
+    for mode, timings in results.items():
+        print(
+            f"{mode:<10} {statistics.median(timings):>9.2f} "
+            f"{min(timings):>7.2f} {max(timings):>7.2f}"
+        )
+    speedup = statistics.median(results["single"]) / statistics.median(results["sectioned"])
+    print(f"sectioned speedup: {speedup:.2f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
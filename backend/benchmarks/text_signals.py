@@ -0,0 +1,100 @@
+"""Frustration detection: per-signal substring loop vs the Aho-Corasick matcher.
+
+Runs both detectors over a synthetic batch of interview answers (mostly
+ordinary answers, some with frustration phrases written with and without
+accents or with extra whitespace) and reports time per batch and how many
+frustrated answers each one catches. A second run pads the phrase list with
+synthetic phrases to show how each detector scales with the list size (the
+loop is linear in the number of phrases, the automaton is not).
+
+"loop" is the previous check: ``any(s in answer.lower() for s in SIGNALS)``.
+"matcher" normalizes the answer (accent folding, whitespace collapsing) and
+runs the precompiled automaton once.
+
+Run from backend/:
+
+    python -m benchmarks.text_signals [--answers 10000] [--repeat 5] [--extra-phrases 500]
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from collections.abc import Callable
+
+from app.services.interview_agent import FRUSTRATION_SIGNALS
+from app.utils.text_signals import SignalMatcher, fold
+
+_ORDINARY = [
+    "Enviamos lembrete por WhatsApp três dias antes do vencimento e no dia.",
+    "Depois de 15 dias de atraso a equipe liga e oferece parcelamento em até 6x.",
+    "sim",
+    "Não temos multa, só juros de 1% ao mês.",
+    "Acima de 90 dias mandamos para o jurídico e negativamos no Serasa.",
+    "Aceitamos Pix, boleto e cartão de crédito, o cliente escolhe.",
+]
+
+
+def _frustrated(rng: random.Random) -> str:
+    signal = rng.choice(FRUSTRATION_SIGNALS)
+    variant = rng.choice((signal, fold(signal), signal.replace(" ", "  ")))
+    return f"{rng.choice(_ORDINARY)} {variant.capitalize()}."
+
+
+def _answers(count: int, seed: int = 7) -> tuple[list[str], int]:
+    rng = random.Random(seed)
+    answers, frustrated = [], 0
+    for _ in range(count):
+        if rng.random() < 0.2:
+            answers.append(_frustrated(rng))
+            frustrated += 1
+        else:
+            answers.append(rng.choice(_ORDINARY))
+    return answers, frustrated
+
+
+def _detectors(phrases: list[str]) -> dict[str, Callable[[str], bool]]:
+    matcher = SignalMatcher(phrases)
+
+    def loop(answer: str) -> bool:
+        answer_lower = answer.lower()
+        return any(signal in answer_lower for signal in phrases)
+
+    def automaton(answer: str) -> bool:
+        return matcher.search(answer) is not None
+
+    return {"loop": loop, "matcher": automaton}
+
+
+def _run(answers: list[str], phrases: list[str], repeat: int) -> None:
+    print(f"{len(phrases)} phrases")
+    print(f"{'detector':<10} {'median ms':>10} {'us/answer':>10} {'caught':>8}")
+    for name, detect in _detectors(phrases).items():
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            caught = sum(detect(answer) for answer in answers)
+            timings.append((time.perf_counter() - started) * 1000)
+        median = statistics.median(timings)
+        per_answer = median * 1000 / len(answers)
+        print(f"{name:<10} {median:>10.1f} {per_answer:>10.2f} {caught:>8}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--answers", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--extra-phrases", type=int, default=500)
+    args = parser.parse_args()
+
+    answers, frustrated = _answers(args.answers)
+    print(f"{args.answers} answers, {frustrated} with a frustration phrase\n")
+    _run(answers, list(FRUSTRATION_SIGNALS), args.repeat)
+    print()
+    padding = [f"frase sintetica numero {i}" for i in range(args.extra_phrases)]
+    _run(answers, list(FRUSTRATION_SIGNALS) + padding, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,11 +7,13 @@ from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import Session, sessionmaker
 
+from app.config import settings
 from app.database import Base, get_db
 from app.dependencies import verify_api_key
 from app.limiter import limiter
 from app.main import app
 from app.models import orm as _orm  # noqa: F401 — register models
+from app.services import llm_cache
 
 # Disable rate limiting globally for all tests
 limiter.enabled = False
@@ -31,6 +33,20 @@ def setup_db() -> Generator[None, None, None]:
     Base.metadata.drop_all(bind=test_engine)
 
 
+@pytest.fixture(autouse=True)
+def _no_llm_backoff(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Retry failed LLM calls immediately so failure tests don't sleep."""
+    monkeypatch.setattr(settings, "LLM_RETRY_BASE_DELAY_S", 0.0)
+
+
+@pytest.fixture(autouse=True)
+def _llm_cache_on_test_db(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Keep cached LLM responses in the per-test database."""
+    monkeypatch.setattr(llm_cache, "_session_factory", TestSessionLocal)
+    monkeypatch.setattr(llm_cache, "_total_bytes", None)
+    llm_cache.reset_stats()
+
+
 @pytest.fixture
 def db_session(setup_db: None) -> Generator[Session, None, None]:
     session = TestSessionLocal()
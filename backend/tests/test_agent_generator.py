@@ -1,5 +1,6 @@
 """Tests for onboarding report generation prompt, service, and endpoints."""
 
+import asyncio
 import json
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -7,11 +8,19 @@ import pytest
 from fastapi.testclient import TestClient
 from openai import OpenAIError
 
-from app.prompts.agent_generator import SYSTEM_PROMPT, build_prompt
+from app.config import settings
+from app.prompts.agent_generator import (
+    REPORT_SECTIONS,
+    SYSTEM_PROMPT,
+    build_prompt,
+    static_prefix,
+)
 from app.services.agent_generator import (
+    ReportSection,
     _apply_dotted_path_adjustments,
     _apply_sanity_checks,
     generate_onboarding_report,
+    stream_onboarding_report,
 )
 
 
@@ -163,6 +172,19 @@ def test_prompt_includes_all_sections():
     assert "OnboardingReport" in prompt  # schema reference
 
 
+def test_prompt_starts_with_static_prefix():
+    """Static content is a byte-identical prefix; session data comes after it."""
+    first = build_prompt(_sample_company_profile(), _sample_interview_responses())
+    second = build_prompt(None, [])
+    prefix = static_prefix()
+
+    assert first.startswith(prefix)
+    assert second.startswith(prefix)
+    assert "Esquema JSON" in prefix and "Dicas de Mapeamento" in prefix
+    assert "CollectAI" not in prefix
+    assert first.index("CollectAI") > len(prefix)
+
+
 def test_prompt_skips_agent_identity_when_declined():
     """When core_0 answer is 'nao', the agent identity section is omitted."""
     responses = _sample_interview_responses()
@@ -290,7 +312,7 @@ async def test_generate_onboarding_report():
     report_dict = _valid_report_dict()
     mock_response = _mock_openai_response(report_dict)
 
-    with patch("app.services.agent_generator.AsyncOpenAI") as MockClient:
+    with patch("app.services.llm_gateway.get_llm_client") as MockClient:
         instance = MockClient.return_value
         instance.chat.completions.create = AsyncMock(return_value=mock_response)
 
@@ -315,7 +337,7 @@ async def test_sanity_check_expert_recommendations_quality():
     report_dict["expert_recommendations"] = "Muito curto"  # < 200 chars
     mock_response = _mock_openai_response(report_dict)
 
-    with patch("app.services.agent_generator.AsyncOpenAI") as MockClient:
+    with patch("app.services.llm_gateway.get_llm_client") as MockClient:
         instance = MockClient.return_value
         instance.chat.completions.create = AsyncMock(return_value=mock_response)
 
@@ -332,7 +354,7 @@ async def test_generate_retries_on_failure():
     report_dict = _valid_report_dict()
     mock_response = _mock_openai_response(report_dict)
 
-    with patch("app.services.agent_generator.AsyncOpenAI") as MockClient:
+    with patch("app.services.llm_gateway.get_llm_client") as MockClient:
         instance = MockClient.return_value
         instance.chat.completions.create = AsyncMock(
             side_effect=[OpenAIError("timeout"), mock_response]
@@ -349,25 +371,180 @@ async def test_generate_retries_on_failure():
 
 @pytest.mark.asyncio
 async def test_generate_both_attempts_fail():
-    """Both LLM calls fail → raises ValueError."""
-    with patch("app.services.agent_generator.AsyncOpenAI") as MockClient:
+    """Every LLM call fails → raises ValueError."""
+    with patch("app.services.llm_gateway.get_llm_client") as MockClient:
         instance = MockClient.return_value
         instance.chat.completions.create = AsyncMock(
-            side_effect=[OpenAIError("fail 1"), OpenAIError("fail 2")]
+            side_effect=OpenAIError("fail")
         )
 
-        with pytest.raises(ValueError, match="2 tentativas"):
+        with pytest.raises(ValueError, match="Falha na geração"):
             await generate_onboarding_report(
                 _sample_company_profile(),
                 _sample_interview_responses(),
             )
 
 
+async def test_structured_output_mode_sends_schema_out_of_band(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(settings, "PROMPT_SCHEMA_FORMAT", "structured")
+    mock_response = _mock_openai_response(_valid_report_dict())
+
+    with patch("app.services.llm_gateway.get_llm_client") as MockClient:
+        create = MockClient.return_value.chat.completions.create = AsyncMock(
+            return_value=mock_response
+        )
+        await generate_onboarding_report(
+            _sample_company_profile(), _sample_interview_responses()
+        )
+
+    kwargs = create.await_args.kwargs
+    response_format = kwargs["response_format"]
+    assert response_format["type"] == "json_schema"
+    assert response_format["json_schema"]["strict"] is False
+    assert "expert_recommendations" in response_format["json_schema"]["schema"]["properties"]
+    assert '"properties"' not in kwargs["messages"][1]["content"]
+
+
+def test_section_prompt_asks_only_for_its_fields():
+    prompt = build_prompt(
+        _sample_company_profile(), _sample_interview_responses(), section="policies"
+    )
+    assert "collection_policies, communication, guardrails" in prompt
+    assert '"collection_policies"' in prompt
+    assert '"expert_recommendations"' not in prompt
+    assert '"collection_profile"' not in prompt
+
+
+def _section_responder(report_dict: dict, delay: float = 0.0):
+    """Answer each section call with that section's slice of ``report_dict``."""
+    active = {"now": 0, "peak": 0}
+
+    async def create(**kwargs):
+        user_message = kwargs["messages"][1]["content"]
+        section = next(
+            name for name in REPORT_SECTIONS
+            if f"parte do OnboardingReport: {name})" in user_message
+        )
+        active["now"] += 1
+        active["peak"] = max(active["peak"], active["now"])
+        await asyncio.sleep(delay)
+        active["now"] -= 1
+        return _mock_openai_response(
+            {name: report_dict[name] for name in REPORT_SECTIONS[section]}
+        )
+
+    return create, active
+
+
+async def test_sectioned_generation_runs_sections_concurrently(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(settings, "REPORT_GENERATION_MODE", "sectioned")
+    create, active = _section_responder(_valid_report_dict(), delay=0.02)
+
+    with patch("app.services.llm_gateway.get_llm_client") as MockClient:
+        MockClient.return_value.chat.completions.create = AsyncMock(side_effect=create)
+        result = await generate_onboarding_report(
+            _sample_company_profile(),
+            _sample_interview_responses(),
+            session_id="sess-001",
+        )
+
+    assert active["peak"] == len(REPORT_SECTIONS)
+    assert result.company.name == "CollectAI"
+    assert result.guardrails.never_say == ["SPC", "Serasa", "processo judicial"]
+    assert len(result.expert_recommendations) >= 200
+    assert result.metadata.session_id == "sess-001"
+
+
+async def test_sectioned_generation_applies_sanity_checks(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(settings, "REPORT_GENERATION_MODE", "sectioned")
+    report_dict = _valid_report_dict()
+    report_dict["expert_recommendations"] = "Curto demais."
+    create, _ = _section_responder(report_dict)
+
+    with patch("app.services.llm_gateway.get_llm_client") as MockClient:
+        MockClient.return_value.chat.completions.create = AsyncMock(side_effect=create)
+        with pytest.raises(ValueError, match="200"):
+            await generate_onboarding_report(
+                _sample_company_profile(), _sample_interview_responses()
+            )
+
+
+async def test_sectioned_generation_fails_when_a_section_fails(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(settings, "REPORT_GENERATION_MODE", "sectioned")
+
+    with patch("app.services.llm_gateway.get_llm_client") as MockClient:
+        MockClient.return_value.chat.completions.create = AsyncMock(
+            side_effect=OpenAIError("fail")
+        )
+        with pytest.raises(ValueError, match="Falha na geração"):
+            await generate_onboarding_report(
+                _sample_company_profile(), _sample_interview_responses()
+            )
+
+
 # ---------------------------------------------------------------------------
 # Endpoint tests
 # ---------------------------------------------------------------------------
 
 
+def _mock_openai_stream(text: str, chunk_size: int = 40) -> MagicMock:
+    """Build a mock streamed chat completion delivering ``text`` in small deltas."""
+    chunks = []
+    for i in range(0, len(text), chunk_size):
+        chunk = MagicMock()
+        chunk.usage = None
+        chunk.choices = [MagicMock()]
+        chunk.choices[0].delta.content = text[i:i + chunk_size]
+        chunks.append(chunk)
+
+    stream = MagicMock()
+    stream.__aiter__.return_value = chunks
+    stream.close = AsyncMock()
+    return stream
+
+
+async def test_stream_onboarding_report_yields_sections_then_report():
+    report_dict = _valid_report_dict()
+    text = json.dumps(report_dict, ensure_ascii=False)
+
+    with patch("app.services.llm_gateway.get_llm_client") as MockClient:
+        create = MockClient.return_value.chat.completions.create = AsyncMock(
+            return_value=_mock_openai_stream(text)
+        )
+        items = [
+            item async for item in stream_onboarding_report(
+                _sample_company_profile(),
+                _sample_interview_responses(),
+                session_id="sess-001",
+            )
+        ]
+
+    assert create.await_args.kwargs["stream"] is True
+    sections = items[:-1]
+    assert all(isinstance(item, ReportSection) for item in sections)
+    assert [s.name for s in sections] == list(report_dict)
+    assert sections[0].data == report_dict[sections[0].name]
+    report = items[-1]
+    assert report.company.name == "CollectAI"
+    assert report.metadata.session_id == "sess-001"
+
+
+async def test_stream_onboarding_report_truncated_output():
+    text = json.dumps(_valid_report_dict(), ensure_ascii=False)[:500]
+
+    with patch("app.services.llm_gateway.get_llm_client") as MockClient:
+        MockClient.return_value.chat.completions.create = AsyncMock(
+            return_value=_mock_openai_stream(text)
+        )
+        with pytest.raises(ValueError, match="incompleta"):
+            async for _ in stream_onboarding_report(
+                _sample_company_profile(), _sample_interview_responses()
+            ):
+                pass
+
+
 def _create_session(client: TestClient) -> str:
     """Helper: create a session and return its ID."""
     resp = client.post(
@@ -476,6 +653,12 @@ def test_regenerate_agent(
     resp = client.post(f"/api/v1/sessions/{session_id}/agent/generate")
     assert resp.status_code == 200
     assert mock_generate.call_count == 2
+    assert mock_generate.call_args.kwargs["bypass_cache"] is False
+
+    # Forcing a fresh generation skips the response cache
+    resp = client.post(f"/api/v1/sessions/{session_id}/agent/generate?bypass_cache=true")
+    assert resp.status_code == 200
+    assert mock_generate.call_args.kwargs["bypass_cache"] is True
 
 
 # ---------------------------------------------------------------------------
@@ -652,3 +835,72 @@ def test_adjust_empty_adjustments(client: TestClient) -> None:
         json={"adjustments": {}},
     )
     assert resp.status_code == 422
+
+
+# ---------------------------------------------------------------------------
+# Streaming generation endpoint tests
+# ---------------------------------------------------------------------------
+
+
+def _stream_report(*items):
+    async def fake_stream(**_kwargs):
+        for item in items:
+            if isinstance(item, Exception):
+                raise item
+            yield item
+
+    return fake_stream
+
+
+def test_generate_agent_stream_endpoint(client: TestClient) -> None:
+    """Sections are streamed as SSE events, then the report is persisted."""
+    from app.models.schemas import OnboardingReport
+
+    report_dict = _valid_report_dict()
+    report = OnboardingReport(**report_dict)
+    fake = _stream_report(
+        ReportSection(name="company", data=report_dict["company"]),
+        ReportSection(name="guardrails", data=report_dict["guardrails"]),
+        report,
+    )
+
+    session_id = _create_session(client)
+    _set_session_interviewed(client, session_id)
+
+    with patch("app.routers.agent.stream_onboarding_report", fake):
+        with client.stream("POST", f"/api/v1/sessions/{session_id}/agent/generate/stream") as resp:
+            assert resp.status_code == 200
+            assert resp.headers["content-type"].startswith("text/event-stream")
+            body = "".join(resp.iter_text())
+
+    events = [line.removeprefix("event: ") for line in body.splitlines() if line.startswith("event: ")]
+    assert events == ["section", "section", "generated"]
+    assert '"name": "company"' in body
+
+    resp = client.get(f"/api/v1/sessions/{session_id}")
+    assert resp.json()["status"] == "generated"
+    resp = client.get(f"/api/v1/sessions/{session_id}/agent")
+    assert resp.json()["company"]["name"] == "CollectAI"
+
+
+def test_generate_agent_stream_failure_resets_status(client: TestClient) -> None:
+    fake = _stream_report(
+        ReportSection(name="company", data={"name": "CollectAI"}),
+        ValueError("Falha na geração do relatório."),
+    )
+    session_id = _create_session(client)
+    _set_session_interviewed(client, session_id)
+
+    with patch("app.routers.agent.stream_onboarding_report", fake):
+        with client.stream("POST", f"/api/v1/sessions/{session_id}/agent/generate/stream") as resp:
+            body = "".join(resp.iter_text())
+
+    assert "event: failed" in body
+    resp = client.get(f"/api/v1/sessions/{session_id}")
+    assert resp.json()["status"] == "interviewed"
+
+
+def test_generate_agent_stream_before_interview(client: TestClient) -> None:
+    session_id = _create_session(client)
+    resp = client.post(f"/api/v1/sessions/{session_id}/agent/generate/stream")
+    assert resp.status_code == 400
@@ -0,0 +1,147 @@
+"""Tests for the deterministic answer-quality pre-filter."""
+
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.prompts.interview import VAGUE_ANSWER_FOLLOWUP_MAP
+from app.services.answer_quality import score_answer
+from app.services.interview_agent import create_interview, evaluate_and_maybe_follow_up, submit_answer
+
+DETAILED_PROCESS = """\
+1. No vencimento enviamos lembrete por WhatsApp e e-mail com o boleto e o Pix.
+2. Com 5 dias de atraso ligamos e oferecemos parcelamento em até 6x com juros de 1% ao mês.
+3. Após 30 dias negativamos no Serasa e oferecemos 10% de desconto para quitação à vista.
+4. Com 60 dias o caso vai para o jurídico e protestamos dívidas acima de R$ 1.000."""
+
+
+def _llm_client(payload: dict) -> AsyncMock:
+    choice = MagicMock()
+    choice.message.content = json.dumps(payload)
+    response = MagicMock()
+    response.choices = [choice]
+    client = AsyncMock()
+    client.chat.completions.create = AsyncMock(return_value=response)
+    return client
+
+
+async def _state_at_core_1():
+    state = await create_interview()
+    _, state = await submit_answer(state, "core_0", "Sofia", "text")
+    return state
+
+
+# ---------- score_answer ----------
+
+
+@pytest.mark.parametrize("answer", ["sim", "normal", "não sei", "  ", "mandamos boleto"])
+def test_short_answers_are_vague(answer):
+    assert score_answer(answer).verdict == "vague"
+
+
+def test_detailed_process_is_sufficient():
+    quality = score_answer(DETAILED_PROCESS)
+
+    assert quality.verdict == "sufficient"
+    assert quality.signals["steps"] >= 4
+    assert quality.signals["percentages"] == 2
+    assert quality.signals["amounts"] == 1
+    assert quality.signals["keyword_groups"] >= 5
+
+
+def test_middling_answer_is_uncertain():
+    quality = score_answer(
+        "A gente manda mensagem quando atrasa e depois tenta negociar com o cliente"
+    )
+    assert quality.verdict == "uncertain"
+    assert 0 < quality.score < 1
+
+
+def test_keywords_match_without_accents():
+    accented = score_answer("Ligação, notificação e negativação")
+    plain = score_answer("Ligacao, notificacao e negativacao")
+    assert accented.signals["keyword_groups"] == plain.signals["keyword_groups"] == 3
+
+
+@pytest.mark.parametrize(
+    "answer",
+    ["promessas de acordo", "medias gerais", "vamos descartar", "mesmo assim", "cortesia"],
+)
+def test_keywords_do_not_match_inside_words(answer):
+    """Only "acordo" counts; "mes", "dias", "carta" and "corte" sit inside other words."""
+    expected = 1 if "acordo" in answer else 0
+    assert score_answer(answer).signals["keyword_groups"] == expected
+
+
+def test_deadline_markers_counted():
+    quality = score_answer("D+5 WhatsApp, D + 15 ligação, 30 dias protesto")
+    assert quality.signals["deadlines"] == 3
+
+
+def test_thresholds_come_from_settings(monkeypatch):
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "ANSWER_QUALITY_SUFFICIENT_SCORE", 0.1)
+    quality = score_answer(
+        "A gente manda mensagem quando atrasa e depois tenta negociar com o cliente"
+    )
+    assert quality.verdict == "sufficient"
+
+
+# ---------- evaluate_and_maybe_follow_up ----------
+
+
+@pytest.mark.asyncio
+async def test_vague_answer_gets_templated_follow_up_without_llm():
+    state = await _state_at_core_1()
+    client = _llm_client({"needs_follow_up": False, "follow_up_question": None})
+
+    with patch("app.services.llm_gateway.get_llm_client", return_value=client):
+        with patch("app.services.interview_agent.settings") as mock_settings:
+            mock_settings.OPENAI_API_KEY = "test-key"
+            needs, question = await evaluate_and_maybe_follow_up(state, "core_1", "normal")
+
+    client.chat.completions.create.assert_not_called()
+    assert needs is True
+    assert question["question_id"] == "followup_core_1_1"
+    assert question["question_text"] == VAGUE_ANSWER_FOLLOWUP_MAP["core_1"]
+    assert question["phase"] == "follow_up"
+
+
+@pytest.mark.asyncio
+async def test_sufficient_answer_skips_llm():
+    state = await _state_at_core_1()
+    client = _llm_client({"needs_follow_up": True, "follow_up_question": "Mais?"})
+
+    with patch("app.services.llm_gateway.get_llm_client", return_value=client):
+        with patch("app.services.interview_agent.settings") as mock_settings:
+            mock_settings.OPENAI_API_KEY = "test-key"
+            needs, question = await evaluate_and_maybe_follow_up(
+                state, "core_1", DETAILED_PROCESS
+            )
+
+    client.chat.completions.create.assert_not_called()
+    assert (needs, question) == (False, None)
+
+
+@pytest.mark.asyncio
+async def test_uncertain_answer_consults_llm():
+    state = await _state_at_core_1()
+    client = _llm_client({
+        "needs_follow_up": True,
+        "follow_up_question": "Em quantos dias após o vencimento vocês negociam?",
+    })
+
+    with patch("app.services.llm_gateway.get_llm_client", return_value=client):
+        with patch("app.services.interview_agent.settings") as mock_settings:
+            mock_settings.OPENAI_API_KEY = "test-key"
+            needs, question = await evaluate_and_maybe_follow_up(
+                state,
+                "core_1",
+                "A gente manda mensagem quando atrasa e depois tenta negociar com o cliente",
+            )
+
+    client.chat.completions.create.assert_awaited_once()
+    assert needs is True
+    assert question["question_text"] == "Em quantos dias após o vencimento vocês negociam?"
@@ -6,6 +6,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 from openai import OpenAIError
 
+from app.config import settings
 from app.services.transcription import (
     ALLOWED_CONTENT_TYPES,
     MAX_FILE_SIZE,
@@ -26,7 +27,7 @@ async def test_transcribe_valid_audio():
     """Valid audio bytes with supported content type returns text + duration."""
     mock_response = _mock_transcription_response("Nós vendemos software de gestão.", 3.2)
 
-    with patch("app.services.transcription.AsyncOpenAI") as mock_openai_cls:
+    with patch("app.services.llm_gateway.get_llm_client") as mock_openai_cls:
         mock_client = AsyncMock()
         mock_client.audio.transcriptions.create.return_value = mock_response
         mock_openai_cls.return_value = mock_client
@@ -70,7 +71,7 @@ async def test_transcribe_api_error_retries():
     """First API call fails, second succeeds — returns text."""
     mock_response = _mock_transcription_response("Resposta após retry.", 1.5)
 
-    with patch("app.services.transcription.AsyncOpenAI") as mock_openai_cls:
+    with patch("app.services.llm_gateway.get_llm_client") as mock_openai_cls:
         mock_client = AsyncMock()
         mock_client.audio.transcriptions.create.side_effect = [
             OpenAIError("rate limit"),
@@ -87,8 +88,8 @@ async def test_transcribe_api_error_retries():
 
 @pytest.mark.asyncio
 async def test_transcribe_api_error_exhausted():
-    """Both API attempts fail — raises ValueError with user-friendly message."""
-    with patch("app.services.transcription.AsyncOpenAI") as mock_openai_cls:
+    """Every API attempt fails — raises ValueError with user-friendly message."""
+    with patch("app.services.llm_gateway.get_llm_client") as mock_openai_cls:
         mock_client = AsyncMock()
         mock_client.audio.transcriptions.create.side_effect = OpenAIError("server error")
         mock_openai_cls.return_value = mock_client
@@ -96,7 +97,7 @@ async def test_transcribe_api_error_exhausted():
         with pytest.raises(ValueError, match="Falha na transcrição"):
             await transcribe_audio(b"\x00" * 512, "audio/wav")
 
-    assert mock_client.audio.transcriptions.create.call_count == 2
+    assert mock_client.audio.transcriptions.create.call_count == settings.LLM_MAX_ATTEMPTS
 
 
 @pytest.mark.asyncio
@@ -105,7 +106,7 @@ async def test_transcribe_all_content_types():
     mock_response = _mock_transcription_response()
 
     for content_type, ext in ALLOWED_CONTENT_TYPES.items():
-        with patch("app.services.transcription.AsyncOpenAI") as mock_openai_cls:
+        with patch("app.services.llm_gateway.get_llm_client") as mock_openai_cls:
             mock_client = AsyncMock()
             mock_client.audio.transcriptions.create.return_value = mock_response
             mock_openai_cls.return_value = mock_client
@@ -88,3 +88,9 @@ def test_get_with_valid_key_passes_auth(unauth_client: TestClient):
         headers={"X-API-Key": TEST_API_KEY},
     )
     assert resp.status_code != 401
+
+
+def test_metrics_requires_key(unauth_client: TestClient):
+    assert unauth_client.get("/api/v1/metrics/llm").status_code == 401
+    resp = unauth_client.get("/api/v1/metrics/llm", headers={"X-API-Key": TEST_API_KEY})
+    assert resp.status_code == 200
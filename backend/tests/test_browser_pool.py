@@ -0,0 +1,236 @@
+"""Tests for the warm Chromium browser pool."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.browser_pool import BrowserPool
+from app.services.enrichment import scrape_website
+from app.utils.url_validation import ValidatedURL
+
+
+def _make_browser() -> MagicMock:
+    browser = MagicMock()
+    browser.is_connected.return_value = True
+    browser.close = AsyncMock()
+    browser.new_context = AsyncMock(side_effect=lambda: AsyncMock())
+    return browser
+
+
+def _mock_playwright(mock_pw: MagicMock) -> MagicMock:
+    """Wire async_playwright().start() to a driver whose launch() yields fresh browsers."""
+    driver = MagicMock()
+    driver.stop = AsyncMock()
+    driver.chromium.launch = AsyncMock(side_effect=lambda **kwargs: _make_browser())
+    mock_pw.return_value.start = AsyncMock(return_value=driver)
+    return driver
+
+
+@pytest.mark.asyncio
+@patch("app.services.browser_pool.async_playwright")
+async def test_pool_launches_warm_browsers(mock_pw: MagicMock):
+    """start() launches N browsers once; close() tears them down."""
+    driver = _mock_playwright(mock_pw)
+    pool = BrowserPool(size=2, max_contexts_per_browser=2, recycle_after_pages=0,
+                       health_check_interval_s=0)
+
+    await pool.start()
+    assert pool.started
+    assert driver.chromium.launch.await_count == 2
+
+    browsers = [b.browser for b in pool._browsers]
+    await pool.close()
+    assert not pool.started
+    for browser in browsers:
+        browser.close.assert_awaited_once()
+    driver.stop.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+@patch("app.services.browser_pool.async_playwright")
+async def test_pool_spreads_contexts_and_closes_them(mock_pw: MagicMock):
+    """Concurrent borrowers get contexts on the least-loaded browser."""
+    _mock_playwright(mock_pw)
+    pool = BrowserPool(size=2, max_contexts_per_browser=2, recycle_after_pages=0,
+                       health_check_interval_s=0)
+    await pool.start()
+
+    async with pool.context() as ctx1, pool.context() as ctx2:
+        loads = sorted(b.active_contexts for b in pool._browsers)
+        assert loads == [1, 1]
+
+    ctx1.close.assert_awaited_once()
+    ctx2.close.assert_awaited_once()
+    assert all(b.active_contexts == 0 for b in pool._browsers)
+    await pool.close()
+
+
+@pytest.mark.asyncio
+@patch("app.services.browser_pool.async_playwright")
+async def test_pool_waits_when_context_limit_reached(mock_pw: MagicMock):
+    """A borrower blocks until a slot frees up when every browser is full."""
+    _mock_playwright(mock_pw)
+    pool = BrowserPool(size=1, max_contexts_per_browser=1, recycle_after_pages=0,
+                       health_check_interval_s=0)
+    await pool.start()
+
+    release = asyncio.Event()
+    acquired_second = asyncio.Event()
+
+    async def first() -> None:
+        async with pool.context():
+            await release.wait()
+
+    async def second() -> None:
+        async with pool.context():
+            acquired_second.set()
+
+    t1 = asyncio.create_task(first())
+    await asyncio.sleep(0)
+    t2 = asyncio.create_task(second())
+    await asyncio.sleep(0.01)
+    assert not acquired_second.is_set()
+
+    release.set()
+    await asyncio.gather(t1, t2)
+    assert acquired_second.is_set()
+    await pool.close()
+
+
+@pytest.mark.asyncio
+@patch("app.services.browser_pool.async_playwright")
+async def test_pool_recycles_after_k_pages(mock_pw: MagicMock):
+    """A browser is replaced once it has served recycle_after_pages contexts."""
+    driver = _mock_playwright(mock_pw)
+    pool = BrowserPool(size=1, max_contexts_per_browser=1, recycle_after_pages=2,
+                       health_check_interval_s=0)
+    await pool.start()
+    original = pool._browsers[0].browser
+
+    async with pool.context():
+        pass
+    assert pool._browsers[0].browser is original
+
+    async with pool.context():
+        pass
+    await asyncio.gather(*pool._recycle_tasks)
+    original.close.assert_awaited_once()
+    assert pool._browsers[0].browser is not original
+    assert pool._browsers[0].pages_served == 0
+    assert driver.chromium.launch.await_count == 2
+    await pool.close()
+
+
+@pytest.mark.asyncio
+@patch("app.services.browser_pool.async_playwright")
+async def test_health_check_relaunches_disconnected_browser(mock_pw: MagicMock):
+    """check_health() replaces browsers that lost their connection."""
+    _mock_playwright(mock_pw)
+    pool = BrowserPool(size=2, max_contexts_per_browser=1, recycle_after_pages=0,
+                       health_check_interval_s=0)
+    await pool.start()
+    dead = pool._browsers[0].browser
+    dead.is_connected.return_value = False
+
+    replaced = await pool.check_health()
+    assert replaced == 1
+    assert pool._browsers[0].browser is not dead
+    assert pool._browsers[0].is_healthy()
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_context_requires_started_pool():
+    """Borrowing from a pool that was never started raises."""
+    pool = BrowserPool(size=1)
+    with pytest.raises(RuntimeError):
+        async with pool.context():
+            pass
+
+
+@pytest.mark.asyncio
+async def test_scrape_uses_pool_when_started():
+    """scrape_website renders through a pooled context instead of launching Chromium."""
+    mock_page = AsyncMock()
+    mock_page.inner_text.return_value = "  Pooled page text  "
+    mock_page.evaluate.return_value = 17
+    mock_page.eval_on_selector_all.return_value = []
+    mock_context = AsyncMock()
+    mock_context.new_page.return_value = mock_page
+
+    mock_pool = MagicMock()
+    mock_pool.started = True
+    mock_pool.context.return_value.__aenter__.return_value = mock_context
+
+    with (
+        patch("app.services.enrichment.resolve_validated_url",
+              side_effect=lambda u: ValidatedURL(url=u, hostname="example.com", ips=("93.184.216.34",))),
+        patch("app.services.enrichment._scrape_http", new_callable=AsyncMock, return_value=None),
+        patch("app.services.enrichment.browser_pool", mock_pool),
+        patch("app.services.enrichment.async_playwright") as mock_pw,
+        patch("app.services.enrichment.TEXT_POLL_INTERVAL_S", 0),
+    ):
+        result = await scrape_website("https://example.com")
+
+    assert result.text == "Pooled page text"
+    assert result.tier == "browser"
+    mock_pw.assert_not_called()
+
+
+@pytest.mark.asyncio
+@patch("app.services.browser_pool.async_playwright")
+async def test_recycle_runs_in_background(mock_pw: MagicMock):
+    """Releasing a retiring browser returns at once; others keep serving during the relaunch."""
+    driver = _mock_playwright(mock_pw)
+    launch_gate = asyncio.Event()
+
+    async def launch(**kwargs):
+        if driver.chromium.launch.await_count > 2:
+            await launch_gate.wait()
+        return _make_browser()
+
+    driver.chromium.launch = AsyncMock(side_effect=launch)
+    pool = BrowserPool(size=2, max_contexts_per_browser=1, recycle_after_pages=1,
+                       health_check_interval_s=0)
+    await pool.start()
+
+    async with asyncio.timeout(1):
+        async with pool.context():
+            pass
+        assert len(pool._recycle_tasks) == 1  # relaunch still blocked
+        async with pool.context():
+            pass
+
+    launch_gate.set()
+    await asyncio.gather(*pool._recycle_tasks)
+    assert driver.chromium.launch.await_count == 4
+    assert all(b.is_healthy() and b.pages_served == 0 for b in pool._browsers)
+    await pool.close()
+
+
+@pytest.mark.asyncio
+@patch("app.services.browser_pool.async_playwright")
+async def test_close_cancels_pending_recycle(mock_pw: MagicMock):
+    """close() does not wait for an in-flight relaunch to finish."""
+    driver = _mock_playwright(mock_pw)
+    launch_gate = asyncio.Event()
+
+    async def launch(**kwargs):
+        if driver.chromium.launch.await_count > 1:
+            await launch_gate.wait()
+        return _make_browser()
+
+    driver.chromium.launch = AsyncMock(side_effect=launch)
+    pool = BrowserPool(size=1, max_contexts_per_browser=1, recycle_after_pages=1,
+                       health_check_interval_s=0)
+    await pool.start()
+    async with pool.context():
+        pass
+    recycling = next(iter(pool._recycle_tasks))
+
+    async with asyncio.timeout(1):
+        await pool.close()
+    assert recycling.cancelled()
+    assert not pool._recycle_tasks
+    assert not pool.started
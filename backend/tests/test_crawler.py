@@ -0,0 +1,167 @@
+"""Tests for the bounded multi-page crawl used by website enrichment."""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+from app.services.crawler import (
+    PageText,
+    crawl_pages,
+    merge_pages,
+    select_crawl_targets,
+)
+from app.services.enrichment import scrape_website
+from app.services.http_client import _pinned_ips
+from app.utils.html_text import extract_links
+from app.utils.url_validation import ValidatedURL
+
+
+# --- Link discovery ---
+
+
+def test_extract_links_resolves_and_dedupes():
+    html = (
+        '<a href="/sobre">Sobre</a><a href="/sobre#time">Time</a>'
+        '<a href="https://outra.com/x">x</a><a href="mailto:a@b.com">mail</a>'
+    )
+    assert extract_links(html, "https://empresa.com.br/") == [
+        "https://empresa.com.br/sobre",
+        "https://outra.com/x",
+    ]
+
+
+def test_select_targets_same_origin_by_priority():
+    links = [
+        "https://empresa.com.br/blog/post-1",
+        "https://www.empresa.com.br/produtos",
+        "https://empresa.com.br/quem-somos",
+        "https://empresa.com.br/formas-de-pagamento",
+        "https://outra.com/sobre",
+        "https://empresa.com.br/Soluções",
+        "https://empresa.com.br/catalogo.pdf",
+        "https://empresa.com.br/",
+    ]
+    targets = select_crawl_targets(links, "https://empresa.com.br/", limit=4)
+    assert targets == [
+        (1, "https://empresa.com.br/formas-de-pagamento"),
+        (2, "https://empresa.com.br/quem-somos"),
+        (3, "https://empresa.com.br/Soluções"),
+        (3, "https://www.empresa.com.br/produtos"),
+    ]
+    assert len(select_crawl_targets(links, "https://empresa.com.br/", limit=2)) == 2
+
+
+# --- Concurrent fetch ---
+
+
+@pytest.mark.asyncio
+async def test_crawl_pages_respects_per_host_concurrency():
+    in_flight = 0
+    peak = 0
+
+    async def fetch(url: str) -> str:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return f"text of {url}"
+
+    targets = [(1, f"https://empresa.com.br/p{i}") for i in range(6)]
+    pages = await crawl_pages(targets, fetch, deadline_s=5, per_host_concurrency=2)
+    assert len(pages) == 6
+    assert peak == 2
+    assert [p.url for p in pages] == [u for _, u in targets]
+
+
+@pytest.mark.asyncio
+async def test_crawl_pages_drops_slow_and_failed_pages():
+    async def fetch(url: str) -> str | None:
+        if url.endswith("slow"):
+            await asyncio.sleep(5)
+        if url.endswith("boom"):
+            raise ValueError("private IP")
+        if url.endswith("empty"):
+            return None
+        return "ok"
+
+    targets = [(1, "https://e.com/fast"), (1, "https://e.com/slow"),
+               (2, "https://e.com/boom"), (3, "https://e.com/empty")]
+    pages = await crawl_pages(targets, fetch, deadline_s=0.1, per_host_concurrency=4)
+    assert [p.url for p in pages] == ["https://e.com/fast"]
+
+
+# --- Priority-based merge ---
+
+
+def test_merge_single_page_is_plain_truncation():
+    assert merge_pages([PageText(0, "https://e.com/", "abcdef")], 4) == "abcd"
+
+
+def test_merge_keeps_short_pages_and_weights_the_rest():
+    pages = [
+        PageText(3, "https://e.com/produtos", "P" * 5000),
+        PageText(0, "https://e.com/", "H" * 5000),
+        PageText(1, "https://e.com/pagamento", "pix e boleto"),
+    ]
+    merged = merge_pages(pages, 2000)
+    assert len(merged) <= 2000
+    sections = merged.split("\n\n")
+    assert sections[0].startswith("## Página: /\n")
+    assert sections[1] == "## Página: /pagamento\npix e boleto"
+    assert sections[2].startswith("## Página: /produtos\n")
+    # Homepage (weight 4) gets twice the room of a priority-3 page (weight 2)
+    assert sections[0].count("H") == pytest.approx(2 * sections[2].count("P"), abs=2)
+
+
+# --- scrape_website integration ---
+
+
+@pytest.mark.asyncio
+async def test_scrape_website_merges_crawled_pages():
+    homepage_html = (
+        "<body><p>" + "Bem-vindo à Empresa. " * 40 + "</p>"
+        '<a href="/sobre">Sobre</a><a href="/formas-de-pagamento">Pagamento</a>'
+        '<a href="/blog">Blog</a></body>'
+    )
+    subpages = {
+        "/sobre": "<p>Fundada em 1990.</p>",
+        "/formas-de-pagamento": "<p>Aceitamos Pix e boleto.</p>",
+    }
+
+    def transport(request: httpx.Request) -> httpx.Response:
+        # Requests keep the hostname and are pinned to the vetted IP
+        assert request.url.host == "empresa.com.br"
+        assert _pinned_ips.get()["empresa.com.br"] == ("93.184.216.34",)
+        html = subpages.get(request.url.path, homepage_html)
+        return httpx.Response(200, headers={"content-type": "text/html"}, content=html.encode())
+
+    validated: list[str] = []
+
+    def fake_resolve(url: str) -> ValidatedURL:
+        validated.append(url)
+        return ValidatedURL(url=url, hostname="empresa.com.br", ips=("93.184.216.34",))
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(transport))
+    with (
+        patch("app.services.enrichment.resolve_validated_url", side_effect=fake_resolve),
+        patch("app.services.enrichment.get_http_client", return_value=client),
+        patch("app.services.enrichment._scrape_browser", new_callable=AsyncMock) as mock_browser,
+    ):
+        result = await scrape_website("https://empresa.com.br/")
+    await client.aclose()
+
+    mock_browser.assert_not_awaited()
+    assert result.tier == "http"
+    assert "Aceitamos Pix e boleto." in result.text
+    assert "Fundada em 1990." in result.text
+    assert result.text.index("Pix") < result.text.index("1990")
+    assert result.pages == [
+        "https://empresa.com.br/",
+        "https://empresa.com.br/formas-de-pagamento",
+        "https://empresa.com.br/sobre",
+    ]
+    # Every crawled URL went through SSRF validation
+    assert {f"https://empresa.com.br{path}" for path in subpages} <= set(validated)
@@ -1,14 +1,32 @@
 """Tests for the enrichment scraping, LLM extraction, and API endpoints."""
 
 import json
+from urllib.parse import urlparse
 
+import httpx
 import pytest
 from unittest.mock import AsyncMock, patch, MagicMock
 
 from fastapi.testclient import TestClient
 
 from app.models.schemas import CompanyProfile
-from app.services.enrichment import scrape_website, extract_company_profile
+from app.services.http_client import _pinned_ips
+from app.utils.url_validation import ValidatedURL
+from app.services.enrichment import (
+    ScrapeResult,
+    _fetch_html,
+    _is_blocked_request,
+    _make_route_handler,
+    _wait_for_text_stable,
+    extract_company_profile,
+    scrape_website,
+)
+
+
+def _fake_resolve(url: str) -> ValidatedURL:
+    """Stand-in for resolve_validated_url: every host resolves to one public IP."""
+    url = url if "://" in url else f"https://{url}"
+    return ValidatedURL(url=url, hostname=urlparse(url).hostname or "", ips=("93.184.216.34",))
 
 
 # --- Scraping tests (from T05) ---
@@ -17,22 +35,27 @@ from app.services.enrichment import scrape_website, extract_company_profile
 @pytest.mark.asyncio
 async def test_scrape_real_website():
     """Scrape example.com and verify text is returned."""
-    text = await scrape_website("https://example.com")
-    assert len(text) > 0
-    assert "Example Domain" in text
+    result = await scrape_website("https://example.com")
+    assert len(result.text) > 0
+    assert "Example Domain" in result.text
 
 
 @pytest.mark.asyncio
 async def test_scrape_invalid_url():
     """Invalid URL returns empty string without raising."""
-    text = await scrape_website("not-a-valid-url")
-    assert text == ""
+    result = await scrape_website("not-a-valid-url")
+    assert result.text == ""
+    assert result.tier == ""
 
 
 @pytest.mark.asyncio
 async def test_scrape_timeout():
     """Timeout during navigation returns empty string."""
-    with patch("app.services.enrichment.async_playwright") as mock_pw:
+    with (
+        patch("app.services.enrichment.resolve_validated_url", side_effect=_fake_resolve),
+        patch("app.services.enrichment._fetch_html", new_callable=AsyncMock, return_value=None),
+        patch("app.services.enrichment.async_playwright") as mock_pw,
+    ):
         # Set up the mock chain: async_playwright() -> context manager -> chromium.launch() -> page
         mock_browser = AsyncMock()
         mock_page = AsyncMock()
@@ -47,8 +70,168 @@ async def test_scrape_timeout():
 
         mock_pw.return_value.__aenter__.return_value = mock_pw_instance
 
-        text = await scrape_website("https://example.com")
-        assert text == ""
+        result = await scrape_website("https://example.com")
+        assert result.text == ""
+
+
+# --- HTTP-first tier ---
+
+_SERVER_RENDERED_HTML = (
+    "<html><head><title>T</title><script>var x = 1;</script></head><body>"
+    "<h1>Empresa Teste</h1><p>" + "Vendemos software de cobrança para empresas. " * 20 + "</p>"
+    "</body></html>"
+)
+
+_JS_SHELL_HTML = (
+    '<html><head><script src="/bundle.js"></script></head>'
+    '<body><noscript>You need to enable JavaScript to run this app.</noscript>'
+    '<div id="root"></div></body></html>'
+)
+
+
+@pytest.mark.asyncio
+async def test_scrape_http_tier_skips_browser():
+    """Server-rendered HTML with enough text is served from the HTTP tier."""
+    with (
+        patch("app.services.enrichment.resolve_validated_url", side_effect=_fake_resolve),
+        patch("app.services.enrichment._fetch_html", new_callable=AsyncMock,
+              return_value=_SERVER_RENDERED_HTML),
+        patch("app.services.enrichment._scrape_browser", new_callable=AsyncMock) as mock_browser,
+    ):
+        result = await scrape_website("https://example.com")
+
+    assert result.tier == "http"
+    assert "Empresa Teste" in result.text
+    assert "var x" not in result.text
+    mock_browser.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_scrape_js_shell_falls_back_to_browser():
+    """A client-rendered shell falls back to the Chromium tier."""
+    with (
+        patch("app.services.enrichment.resolve_validated_url", side_effect=_fake_resolve),
+        patch("app.services.enrichment._fetch_html", new_callable=AsyncMock,
+              return_value=_JS_SHELL_HTML),
+        patch("app.services.enrichment._scrape_browser", new_callable=AsyncMock,
+              return_value=("Rendered by JS", [])) as mock_browser,
+    ):
+        result = await scrape_website("https://example.com")
+
+    assert result.tier == "browser"
+    assert result.text == "Rendered by JS"
+    mock_browser.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_scrape_long_text_js_shell_falls_back_to_browser():
+    """A shell with plenty of SEO fallback text still goes to the Chromium tier."""
+    html = _JS_SHELL_HTML.replace(
+        "</noscript>", "</noscript><p>" + "Cobrança fácil para sua empresa. " * 30 + "</p>"
+    )
+    with (
+        patch("app.services.enrichment.resolve_validated_url", side_effect=_fake_resolve),
+        patch("app.services.enrichment._fetch_html", new_callable=AsyncMock, return_value=html),
+        patch("app.services.enrichment._scrape_browser", new_callable=AsyncMock,
+              return_value=("Rendered by JS", [])) as mock_browser,
+    ):
+        result = await scrape_website("https://example.com")
+
+    assert result.tier == "browser"
+    mock_browser.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_scrape_http_error_falls_back_to_browser():
+    """Network errors in the HTTP tier fall back to Chromium."""
+    with (
+        patch("app.services.enrichment.resolve_validated_url", side_effect=_fake_resolve),
+        patch("app.services.enrichment._fetch_html", new_callable=AsyncMock,
+              side_effect=httpx.ConnectError("boom")),
+        patch("app.services.enrichment._scrape_browser", new_callable=AsyncMock,
+              return_value=("Browser text", [])),
+    ):
+        result = await scrape_website("https://example.com")
+
+    assert result.tier == "browser"
+    assert result.text == "Browser text"
+
+
+@pytest.mark.asyncio
+async def test_fetch_html_validates_redirects():
+    """A redirect to a private address aborts the scrape instead of following it."""
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(302, headers={"location": "http://127.0.0.1/admin"})
+
+    def fake_resolve(url: str) -> ValidatedURL:
+        if "127.0.0.1" in url:
+            raise ValueError("private")
+        return _fake_resolve(url)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    with (
+        patch("app.services.enrichment.resolve_validated_url", side_effect=fake_resolve),
+        patch("app.services.enrichment.get_http_client", return_value=client),
+        patch("app.services.enrichment._scrape_browser", new_callable=AsyncMock) as mock_browser,
+    ):
+        result = await scrape_website("https://example.com")
+
+    assert result.text == ""
+    mock_browser.assert_not_awaited()
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_fetch_html_follows_valid_redirect_and_skips_non_html():
+    """Valid redirects are followed; non-HTML responses return None."""
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/":
+            return httpx.Response(301, headers={"location": "/home"})
+        if request.url.path == "/home":
+            return httpx.Response(200, headers={"content-type": "text/html; charset=utf-8"},
+                                  content="<p>olá</p>".encode())
+        return httpx.Response(200, headers={"content-type": "application/pdf"}, content=b"%PDF")
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    with (
+        patch("app.services.enrichment.resolve_validated_url", side_effect=_fake_resolve),
+        patch("app.services.enrichment.get_http_client", return_value=client),
+    ):
+        assert await _fetch_html("https://example.com/") == "<p>olá</p>"
+        assert await _fetch_html("https://example.com/file.pdf") is None
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_fetch_html_unknown_charset_decodes_as_utf8():
+    """A bogus charset in Content-Type does not break decoding."""
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, headers={"content-type": "text/html; charset=x-bogus"},
+                              content="<p>olá</p>".encode())
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    with (
+        patch("app.services.enrichment.resolve_validated_url", side_effect=_fake_resolve),
+        patch("app.services.enrichment.get_http_client", return_value=client),
+    ):
+        assert await _fetch_html("https://example.com/") == "<p>olá</p>"
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_scrape_invalid_redirect_falls_back_to_browser():
+    """Errors outside httpx.HTTPError (e.g. InvalidURL) fall back instead of raising."""
+    with (
+        patch("app.services.enrichment.resolve_validated_url", side_effect=_fake_resolve),
+        patch("app.services.enrichment._fetch_html", new_callable=AsyncMock,
+              side_effect=httpx.InvalidURL("Invalid non-printable ASCII character in URL")),
+        patch("app.services.enrichment._scrape_browser", new_callable=AsyncMock,
+              return_value=("Browser text", [])),
+    ):
+        result = await scrape_website("https://example.com")
+
+    assert result.tier == "browser"
+    assert result.text == "Browser text"
 
 
 # --- LLM extraction tests (T06) ---
@@ -85,7 +268,7 @@ async def test_extract_profile_with_content():
     mock_completion = MagicMock()
     mock_completion.choices = [mock_choice]
 
-    with patch("app.services.enrichment.AsyncOpenAI") as mock_openai_cls:
+    with patch("app.services.llm_gateway.get_llm_client") as mock_openai_cls:
         mock_client = AsyncMock()
         mock_client.chat.completions.create.return_value = mock_completion
         mock_openai_cls.return_value = mock_client
@@ -150,9 +333,9 @@ def _create_session(client: TestClient) -> str:
     return resp.json()["session_id"]
 
 
-@patch("app.routers.enrichment.search_company", new_callable=AsyncMock)
-@patch("app.routers.enrichment.extract_company_profile", new_callable=AsyncMock)
-@patch("app.routers.enrichment.scrape_website", new_callable=AsyncMock)
+@patch("app.services.enrichment_pipeline.consolidate_results", new_callable=AsyncMock)
+@patch("app.services.enrichment_pipeline.extract_company_profile", new_callable=AsyncMock)
+@patch("app.services.enrichment_pipeline.scrape_website", new_callable=AsyncMock)
 def test_enrich_session(
     mock_scrape: AsyncMock,
     mock_extract: AsyncMock,
@@ -160,7 +343,7 @@ def test_enrich_session(
     client: TestClient,
 ) -> None:
     """POST enrich → status enriched, GET enrichment returns CompanyProfile."""
-    mock_scrape.return_value = "Some website text"
+    mock_scrape.return_value = ScrapeResult(text="Some website text", tier="http")
     mock_extract.return_value = MOCK_PROFILE
     mock_search.return_value = None
 
@@ -172,6 +355,7 @@ def test_enrich_session(
     data = resp.json()
     assert data["status"] == "enriched"
     assert data["enrichment_data"]["company_name"] == "TestCorp"
+    assert data["enrichment_data"]["scrape_tier"] == "http"
 
     # Verify via GET enrichment
     resp = client.get(f"/api/v1/sessions/{session_id}/enrichment")
@@ -191,9 +375,9 @@ def test_enrich_not_found(client: TestClient) -> None:
     assert resp.status_code == 404
 
 
-@patch("app.routers.enrichment.search_company", new_callable=AsyncMock)
-@patch("app.routers.enrichment.extract_company_profile", new_callable=AsyncMock)
-@patch("app.routers.enrichment.scrape_website", new_callable=AsyncMock)
+@patch("app.services.enrichment_pipeline.consolidate_results", new_callable=AsyncMock)
+@patch("app.services.enrichment_pipeline.extract_company_profile", new_callable=AsyncMock)
+@patch("app.services.enrichment_pipeline.scrape_website", new_callable=AsyncMock)
 def test_enrich_already_done(
     mock_scrape: AsyncMock,
     mock_extract: AsyncMock,
@@ -201,7 +385,7 @@ def test_enrich_already_done(
     client: TestClient,
 ) -> None:
     """POST enrich twice returns 409 on second call."""
-    mock_scrape.return_value = "Some text"
+    mock_scrape.return_value = ScrapeResult(text="Some text", tier="http")
     mock_extract.return_value = MOCK_PROFILE
     mock_search.return_value = None
 
@@ -227,3 +411,87 @@ def test_get_enrichment_session_not_found(client: TestClient) -> None:
     """GET enrichment for non-existent session returns 404."""
     resp = client.get("/api/v1/sessions/nonexistent-id/enrichment")
     assert resp.status_code == 404
+
+
+# --- Chromium request interception and adaptive wait ---
+
+
+@pytest.mark.parametrize("resource_type,url,blocked", [
+    ("image", "https://example.com/logo.png", True),
+    ("font", "https://example.com/font.woff2", True),
+    ("stylesheet", "https://example.com/site.css", True),
+    ("media", "https://example.com/video.mp4", True),
+    ("script", "https://www.googletagmanager.com/gtm.js", True),
+    ("xhr", "https://widget.intercom.io/ping", True),
+    ("document", "https://example.com/", False),
+    ("script", "https://example.com/app.js", False),
+    ("script", "https://notgoogle-analytics.com/x.js", False),
+])
+def test_is_blocked_request(resource_type: str, url: str, blocked: bool):
+    hosts = frozenset({"googletagmanager.com", "intercom.io", "google-analytics.com"})
+    assert _is_blocked_request(resource_type, url, hosts) is blocked
+
+
+@pytest.mark.asyncio
+async def test_route_handler_aborts_heavy_and_continues_third_party():
+    """Heavy resources are aborted; unvetted third-party subresources continue."""
+    handler = _make_route_handler()
+    image_route = AsyncMock()
+    image_route.request = MagicMock(resource_type="image", url="https://example.com/a.png")
+    cdn_route = AsyncMock()
+    cdn_route.request = MagicMock(resource_type="script", url="https://cdn.other.com/app.js")
+
+    await handler(image_route)
+    await handler(cdn_route)
+
+    image_route.abort.assert_awaited_once()
+    image_route.continue_.assert_not_awaited()
+    cdn_route.continue_.assert_awaited_once()
+    cdn_route.abort.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_route_handler_serves_documents_through_pinned_client():
+    """Documents and same-host requests are fetched from the vetted IP and fulfilled."""
+    seen: list[tuple[str, tuple[str, ...] | None]] = []
+
+    def transport(request: httpx.Request) -> httpx.Response:
+        seen.append((request.url.host, _pinned_ips.get().get(request.url.host)))
+        return httpx.Response(200, headers={"content-type": "text/html"}, content=b"<p>ok</p>")
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(transport))
+    handler = _make_route_handler()
+    doc_route = AsyncMock()
+    doc_route.request = MagicMock(resource_type="document", url="https://example.com/",
+                                  method="GET", headers={"accept": "text/html"},
+                                  post_data_buffer=None)
+    script_route = AsyncMock()
+    script_route.request = MagicMock(resource_type="script", url="https://example.com/app.js",
+                                     method="GET", headers={}, post_data_buffer=None)
+
+    with (
+        patch("app.services.enrichment.resolve_validated_url", side_effect=_fake_resolve),
+        patch("app.services.enrichment.get_http_client", return_value=client),
+    ):
+        await handler(doc_route)
+        await handler(script_route)
+
+    doc_route.fulfill.assert_awaited_once()
+    assert doc_route.fulfill.await_args.kwargs["body"] == b"<p>ok</p>"
+    script_route.fulfill.assert_awaited_once()
+    script_route.continue_.assert_not_awaited()
+    assert seen == [("example.com", ("93.184.216.34",))] * 2
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_route_handler_aborts_document_failing_validation():
+    """A navigation to a host that resolves privately is aborted, not fetched."""
+    handler = _make_route_handler()
+    route = AsyncMock()
+    route.request = MagicMock(resource_type="document", url="https://internal.example.com/")
+    with patch("app.services.enrichment.resolve_validated_url",
+               side_effect=ValueError("private")):
+        await handler(route)
+    route.abort.assert_awaited_once()
+    route.fulfill.assert_not_awaited()
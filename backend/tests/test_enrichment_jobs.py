@@ -0,0 +1,316 @@
+"""Tests for background enrichment jobs."""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.models.orm import OnboardingSession
+from app.services.enrichment_jobs import (
+    EnrichmentJob,
+    EnrichmentJobManager,
+    JobQueueFullError,
+    reset_interrupted_enrichments,
+)
+from tests.conftest import TestSessionLocal
+
+ENRICHMENT = {"company_name": "TestCorp", "segment": "Tecnologia", "scrape_tier": "http"}
+
+
+def _add_session(db: Session, status: str = "enriching") -> str:
+    session = OnboardingSession(
+        company_name="TestCorp", company_website="https://testcorp.com", status=status
+    )
+    db.add(session)
+    db.commit()
+    return session.id
+
+
+# --- EnrichmentJobManager ---
+
+
+@pytest.mark.asyncio
+@patch("app.services.enrichment_jobs.run_enrichment", new_callable=AsyncMock)
+async def test_job_enriches_session(mock_run: AsyncMock, db_session: Session):
+    mock_run.return_value = ENRICHMENT
+    session_id = _add_session(db_session)
+    manager = EnrichmentJobManager(workers=2, max_queued=10, history=10)
+
+    job = manager.submit(session_id, TestSessionLocal)
+    assert job.status == "queued"
+    job = await manager.wait(job.id)
+
+    assert job.status == "succeeded"
+    assert job.started_at is not None and job.finished_at is not None
+    db_session.expire_all()
+    session = db_session.get(OnboardingSession, session_id)
+    assert session.status == "enriched"
+    assert session.enrichment_data == ENRICHMENT
+
+
+@pytest.mark.asyncio
+@patch("app.services.enrichment_jobs.run_enrichment", new_callable=AsyncMock)
+async def test_failed_job_resets_session_status(mock_run: AsyncMock, db_session: Session):
+    mock_run.side_effect = RuntimeError("scrape exploded")
+    session_id = _add_session(db_session)
+    manager = EnrichmentJobManager(workers=1, max_queued=10, history=10)
+
+    job = await manager.wait(manager.submit(session_id, TestSessionLocal).id)
+
+    assert job.status == "failed"
+    assert job.error == "Enrichment failed"  # internal details are only logged
+    db_session.expire_all()
+    assert db_session.get(OnboardingSession, session_id).status == "created"
+
+
+@pytest.mark.asyncio
+@patch("app.services.enrichment_jobs.run_enrichment", new_callable=AsyncMock)
+async def test_worker_pool_bounds_concurrency(mock_run: AsyncMock, db_session: Session):
+    running = 0
+    peak = 0
+
+    async def slow_enrichment(*_args, **_kwargs):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return ENRICHMENT
+
+    mock_run.side_effect = slow_enrichment
+    manager = EnrichmentJobManager(workers=2, max_queued=10, history=10)
+    jobs = [manager.submit(_add_session(db_session), TestSessionLocal) for _ in range(5)]
+    await asyncio.gather(*(manager.wait(job.id) for job in jobs))
+
+    assert peak == 2
+    assert all(job.status == "succeeded" for job in jobs)
+
+
+@pytest.mark.asyncio
+@patch("app.services.enrichment_jobs.run_enrichment", new_callable=AsyncMock)
+async def test_submit_rejects_when_queue_full(mock_run: AsyncMock, db_session: Session):
+    release = asyncio.Event()
+
+    async def blocked(*_args, **_kwargs):
+        await release.wait()
+        return ENRICHMENT
+
+    mock_run.side_effect = blocked
+    manager = EnrichmentJobManager(workers=1, max_queued=1, history=10)
+    manager.submit(_add_session(db_session), TestSessionLocal)
+
+    with pytest.raises(JobQueueFullError):
+        manager.submit(_add_session(db_session), TestSessionLocal)
+
+    await manager.close()
+
+
+@pytest.mark.asyncio
+@patch("app.services.enrichment_jobs.run_enrichment", new_callable=AsyncMock)
+async def test_finished_jobs_are_pruned(mock_run: AsyncMock, db_session: Session):
+    mock_run.return_value = ENRICHMENT
+    manager = EnrichmentJobManager(workers=1, max_queued=10, history=2)
+    ids = []
+    for _ in range(4):
+        job = manager.submit(_add_session(db_session), TestSessionLocal)
+        await manager.wait(job.id)
+        ids.append(job.id)
+
+    assert manager.get(ids[0]) is None
+    assert manager.get(ids[-1]) is not None
+
+
+def test_reset_interrupted_enrichments(db_session: Session):
+    stuck = _add_session(db_session)
+    done = _add_session(db_session, status="enriched")
+
+    assert reset_interrupted_enrichments(db_session) == 1
+
+    db_session.expire_all()
+    assert db_session.get(OnboardingSession, stuck).status == "created"
+    assert db_session.get(OnboardingSession, done).status == "enriched"
+
+
+# --- Endpoints ---
+
+
+def _create_session(client: TestClient) -> str:
+    resp = client.post(
+        "/api/v1/sessions",
+        json={"company_name": "TestCorp", "website": "https://testcorp.com"},
+    )
+    return resp.json()["session_id"]
+
+
+@patch("app.routers.enrichment.enrichment_jobs")
+def test_background_enrich_returns_202(mock_jobs, client: TestClient) -> None:
+    mock_jobs.submit.return_value = EnrichmentJob(id="job-1", session_id="s")
+    mock_jobs.latest_for_session.return_value = EnrichmentJob(id="job-1", session_id="s")
+    session_id = _create_session(client)
+
+    resp = client.post(f"/api/v1/sessions/{session_id}/enrich?background=true")
+    assert resp.status_code == 202
+    assert resp.json() == {"status": "enriching", "job_id": "job-1"}
+    assert client.get(f"/api/v1/sessions/{session_id}").json()["status"] == "enriching"
+
+    # Result is not ready yet: GET /enrichment reports progress
+    resp = client.get(f"/api/v1/sessions/{session_id}/enrichment")
+    assert resp.status_code == 202
+    assert resp.json()["job_id"] == "job-1"
+
+    # A second trigger while the job runs is rejected
+    resp = client.post(f"/api/v1/sessions/{session_id}/enrich?background=true")
+    assert resp.status_code == 409
+
+
+@patch("app.routers.enrichment.enrichment_jobs")
+def test_background_enrich_queue_full_returns_503(mock_jobs, client: TestClient) -> None:
+    mock_jobs.submit.side_effect = JobQueueFullError("full")
+    session_id = _create_session(client)
+
+    resp = client.post(f"/api/v1/sessions/{session_id}/enrich?background=true")
+    assert resp.status_code == 503
+    assert client.get(f"/api/v1/sessions/{session_id}").json()["status"] == "created"
+
+
+@patch("app.routers.enrichment.enrichment_jobs")
+def test_get_enrichment_job(mock_jobs, client: TestClient) -> None:
+    job = EnrichmentJob(id="job-1", session_id="session-1", status="running")
+    mock_jobs.get.side_effect = lambda job_id: job if job_id == "job-1" else None
+
+    resp = client.get("/api/v1/sessions/session-1/enrichment/jobs/job-1")
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["job_id"] == "job-1"
+    assert data["status"] == "running"
+
+    assert client.get("/api/v1/sessions/other/enrichment/jobs/job-1").status_code == 404
+    assert client.get("/api/v1/sessions/session-1/enrichment/jobs/nope").status_code == 404
+
+
+@patch("app.services.enrichment_pipeline.scrape_website", new_callable=AsyncMock)
+def test_sync_enrich_failure_resets_status(mock_scrape: AsyncMock, client: TestClient) -> None:
+    """A failed blocking enrichment can be retried."""
+    mock_scrape.side_effect = RuntimeError("boom")
+    session_id = _create_session(client)
+
+    resp = client.post(f"/api/v1/sessions/{session_id}/enrich")
+    assert resp.status_code == 500
+    assert client.get(f"/api/v1/sessions/{session_id}").json()["status"] == "created"
+
+
+# --- Progress events ---
+
+
+@pytest.mark.asyncio
+@patch("app.services.enrichment_jobs.run_enrichment", new_callable=AsyncMock)
+async def test_job_stream_replays_and_follows_events(mock_run: AsyncMock, db_session: Session):
+    profile_sent = asyncio.Event()
+    release = asyncio.Event()
+
+    async def pipeline(*_args, on_event):
+        on_event("scrape_done", {"chars": 10, "tier": "http"})
+        on_event("profile_extracted", {"profile": {"company_name": "TestCorp", "segment": "Varejo"}})
+        profile_sent.set()
+        await release.wait()
+        on_event("web_research_consolidated", {"web_research": None})
+        return ENRICHMENT
+
+    mock_run.side_effect = pipeline
+    manager = EnrichmentJobManager(workers=1, max_queued=10, history=10)
+    job = manager.submit(_add_session(db_session), TestSessionLocal)
+    await asyncio.wait_for(profile_sent.wait(), timeout=1)
+
+    assert job.partial_profile == {"company_name": "TestCorp", "segment": "Varejo"}
+
+    received = []
+
+    async def consume():
+        async for event in job.stream():
+            received.append(event.name)
+
+    consumer = asyncio.create_task(consume())
+    await asyncio.sleep(0)
+    release.set()
+    await asyncio.wait_for(consumer, timeout=1)
+
+    assert received == [
+        "scrape_done", "profile_extracted", "web_research_consolidated", "enrichment_done",
+    ]
+    assert [e.seq for e in job.events] == [1, 2, 3, 4]
+
+
+@pytest.mark.asyncio
+async def test_job_stream_sends_heartbeats():
+    job = EnrichmentJob(id="job-1", session_id="s", status="running")
+
+    stream = job.stream(heartbeat_s=0.01)
+    assert await anext(stream) is None
+    job.publish("enrichment_failed", {"error": "Enrichment failed"})
+    assert (await anext(stream)).name == "enrichment_failed"
+    with pytest.raises(StopAsyncIteration):
+        await anext(stream)
+
+
+@patch("app.routers.enrichment.enrichment_jobs")
+def test_enrichment_events_endpoint_replays_finished_job(mock_jobs, client: TestClient) -> None:
+    session_id = _create_session(client)
+    job = EnrichmentJob(id="job-1", session_id=session_id, status="succeeded")
+    job.publish("scrape_started", {"url": "https://testcorp.com"})
+    job.publish("scrape_done", {"chars": 1200, "tier": "http"})
+    job.publish("enrichment_done", {"enrichment_data": ENRICHMENT})
+    mock_jobs.latest_for_session.return_value = job
+
+    with client.stream("GET", f"/api/v1/sessions/{session_id}/enrichment/events") as resp:
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/event-stream")
+        body = "".join(resp.iter_text())
+
+    assert "event: scrape_started" in body
+    assert 'data: {"chars": 1200, "tier": "http"}' in body
+    assert body.rstrip().endswith('"scrape_tier": "http"}}')
+
+
+@patch("app.services.enrichment_jobs.run_enrichment", new_callable=AsyncMock)
+def test_enrichment_events_endpoint_follows_blocking_enrich(
+    mock_run: AsyncMock, client: TestClient
+) -> None:
+    async def pipeline(*_args, on_event):
+        on_event("scrape_done", {"chars": 1200, "tier": "http"})
+        return ENRICHMENT
+
+    mock_run.side_effect = pipeline
+    session_id = _create_session(client)
+
+    resp = client.post(f"/api/v1/sessions/{session_id}/enrich")
+    assert resp.status_code == 200
+    assert resp.json()["enrichment_data"] == ENRICHMENT
+
+    with client.stream("GET", f"/api/v1/sessions/{session_id}/enrichment/events") as resp:
+        body = "".join(resp.iter_text())
+
+    # The blocking run's own events, not the stored-result replay
+    assert "event: scrape_done" in body
+    assert "event: enrichment_done" in body
+
+
+def test_enrichment_events_endpoint_without_job(client: TestClient) -> None:
+    session_id = _create_session(client)
+    resp = client.get(f"/api/v1/sessions/{session_id}/enrichment/events")
+    assert resp.status_code == 404
+
+
+@patch("app.routers.enrichment.enrichment_jobs")
+def test_get_enrichment_returns_partial_profile(mock_jobs, client: TestClient) -> None:
+    job = EnrichmentJob(id="job-1", session_id="s", status="running")
+    job.publish("profile_extracted", {"profile": {"company_name": "TestCorp", "segment": "Varejo"}})
+    mock_jobs.submit.return_value = job
+    mock_jobs.latest_for_session.return_value = job
+    session_id = _create_session(client)
+    client.post(f"/api/v1/sessions/{session_id}/enrich?background=true")
+
+    resp = client.get(f"/api/v1/sessions/{session_id}/enrichment")
+    assert resp.status_code == 202
+    assert resp.json()["partial_profile"]["segment"] == "Varejo"
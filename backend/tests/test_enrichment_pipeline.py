@@ -0,0 +1,165 @@
+"""Tests for the enrichment DAG executor and pipeline wiring."""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.models.schemas import CompanyProfile
+from app.services.enrichment import ScrapeResult
+from app.services.enrichment_pipeline import Stage, run_dag, run_enrichment
+
+# --- run_dag ---
+
+
+@pytest.mark.asyncio
+async def test_run_dag_passes_results_to_dependents():
+    async def a(_):
+        return 1
+
+    async def b(results):
+        return results["a"] + 1
+
+    dag = await run_dag([Stage("b", b, deps=("a",)), Stage("a", a)])
+    assert dag.results == {"a": 1, "b": 2}
+    assert set(dag.timings_ms()) == {"a", "b"}
+
+
+@pytest.mark.asyncio
+async def test_run_dag_runs_independent_stages_concurrently():
+    """Independent stages overlap; a dependent stage starts after its dep ends."""
+    async def slow(_):
+        await asyncio.sleep(0.05)
+        return "slow"
+
+    async def fast(_):
+        return "fast"
+
+    async def after_slow(_):
+        return "after"
+
+    dag = await run_dag([
+        Stage("slow", slow),
+        Stage("fast", fast),
+        Stage("after_slow", after_slow, deps=("slow",)),
+    ])
+    assert dag.timings["fast"].start_ms < dag.timings["slow"].duration_ms
+    assert dag.timings["after_slow"].start_ms >= dag.timings["slow"].duration_ms
+
+
+@pytest.mark.asyncio
+async def test_run_dag_propagates_failure_and_cancels_others():
+    cancelled = asyncio.Event()
+
+    async def boom(_):
+        raise RuntimeError("boom")
+
+    async def long(_):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    with pytest.raises(RuntimeError, match="boom"):
+        await run_dag([Stage("boom", boom), Stage("long", long)])
+    assert cancelled.is_set()
+
+
+@pytest.mark.asyncio
+async def test_run_dag_rejects_unknown_dependency():
+    async def a(_):
+        return None
+
+    with pytest.raises(ValueError, match="unknown"):
+        await run_dag([Stage("a", a, deps=("missing",))])
+
+
+# --- run_enrichment ---
+
+
+@pytest.mark.asyncio
+@patch("app.services.enrichment_pipeline.settings")
+@patch("app.services.enrichment_pipeline.consolidate_results", new_callable=AsyncMock)
+@patch("app.services.enrichment_pipeline.run_searches", new_callable=AsyncMock)
+@patch("app.services.enrichment_pipeline.extract_company_profile", new_callable=AsyncMock)
+@patch("app.services.enrichment_pipeline.scrape_website", new_callable=AsyncMock)
+async def test_run_enrichment_overlaps_base_search_with_scrape(
+    mock_scrape: AsyncMock,
+    mock_extract: AsyncMock,
+    mock_run_searches: AsyncMock,
+    mock_consolidate: AsyncMock,
+    mock_settings,
+    db_session: Session,
+):
+    """Base queries run during the scrape; the segment query uses the profile."""
+    mock_settings.SEARCH_API_KEY = "test-key"
+    base_search_started = asyncio.Event()
+
+    async def scrape(_url):
+        # The scrape only finishes once the base search is already running
+        await asyncio.wait_for(base_search_started.wait(), timeout=1)
+        return ScrapeResult(text="Texto do site", tier="http")
+
+    async def searches(queries, on_result=None):
+        base_search_started.set()
+        results = [[{"title": q, "link": q, "snippet": q}] for q in queries]
+        for query, result in zip(queries, results):
+            on_result(query, result)
+        return results
+
+    mock_scrape.side_effect = scrape
+    mock_run_searches.side_effect = searches
+    mock_extract.return_value = CompanyProfile(company_name="TestCorp", segment="Varejo")
+    mock_consolidate.return_value = {"company_description": "Loja"}
+
+    events: list[tuple[str, dict]] = []
+    result = await run_enrichment(
+        db_session, "TestCorp", "https://testcorp.com",
+        on_event=lambda name, data: events.append((name, data)),
+    )
+
+    assert result["segment"] == "Varejo"
+    assert result["web_research"] == {"company_description": "Loja"}
+    assert set(result["stage_timings_ms"]) == {
+        "scrape", "search_base", "profile", "search_segment", "web_research",
+    }
+
+    base_queries, segment_queries = (c.args[0] for c in mock_run_searches.await_args_list)
+    assert len(base_queries) == 2
+    assert segment_queries == ['"Varejo" inadimplência cobrança perfil devedor']
+
+    # Consolidation sees the results of all 3 queries
+    _, merged = mock_consolidate.await_args.args
+    assert len(merged) == 3
+
+    names = [name for name, _ in events]
+    assert names.count("search_query_done") == 3
+    assert names.index("scrape_started") < names.index("scrape_done")
+    assert names.index("scrape_done") < names.index("profile_extracted")
+    assert names[-1] == "web_research_consolidated"
+    assert dict(events)["scrape_done"] == {"chars": len("Texto do site"), "tier": "http"}
+    assert dict(events)["profile_extracted"]["profile"]["segment"] == "Varejo"
+
+
+@pytest.mark.asyncio
+@patch("app.services.enrichment_pipeline.settings")
+@patch("app.services.enrichment_pipeline.run_searches", new_callable=AsyncMock)
+@patch("app.services.enrichment_pipeline.extract_company_profile", new_callable=AsyncMock)
+@patch("app.services.enrichment_pipeline.scrape_website", new_callable=AsyncMock)
+async def test_run_enrichment_skips_search_without_api_key(
+    mock_scrape: AsyncMock,
+    mock_extract: AsyncMock,
+    mock_run_searches: AsyncMock,
+    mock_settings,
+    db_session: Session,
+):
+    mock_settings.SEARCH_API_KEY = ""
+    mock_scrape.return_value = ScrapeResult(text="", tier="")
+    mock_extract.return_value = CompanyProfile(company_name="TestCorp")
+
+    result = await run_enrichment(db_session, "TestCorp", "https://testcorp.com")
+
+    assert "web_research" not in result
+    mock_run_searches.assert_not_awaited()
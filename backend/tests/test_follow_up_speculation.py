@@ -0,0 +1,244 @@
+"""Tests for speculative follow-up evaluation of draft answers."""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.services.follow_up_speculation import FollowUpSpeculator
+from app.services.interview_agent import create_interview, submit_answer
+
+FOLLOW_UP = {
+    "question_id": "followup_core_1_1",
+    "question_text": "Quantos dias após o vencimento?",
+    "question_type": "text",
+    "options": None,
+    "pre_filled_value": None,
+    "is_required": False,
+    "supports_audio": True,
+    "phase": "follow_up",
+    "context_hint": None,
+}
+
+
+async def _state_at_core_1():
+    state = await create_interview()
+    _, state = await submit_answer(state, "core_0", "Sofia", "text")
+    return state
+
+
+class _SlowEvaluator:
+    """Records evaluated answers; each call waits until ``release`` is set."""
+
+    def __init__(self, verdict=(True, FOLLOW_UP)) -> None:
+        self.verdict = verdict
+        self.release = asyncio.Event()
+        self.started: list[str] = []
+        self.cancelled: list[str] = []
+
+    async def __call__(self, state, question_id, answer):
+        self.started.append(answer)
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled.append(answer)
+            raise
+        return self.verdict
+
+
+# ---------- FollowUpSpeculator ----------
+
+
+@pytest.mark.asyncio
+async def test_take_returns_speculated_verdict():
+    state = await _state_at_core_1()
+    evaluator = _SlowEvaluator()
+    speculator = FollowUpSpeculator(max_entries=10, ttl_s=60)
+
+    with patch("app.services.follow_up_speculation.evaluate_and_maybe_follow_up", evaluator):
+        assert speculator.speculate("s1", state, "core_1", "Mandamos WhatsApp") is True
+        await asyncio.sleep(0)
+        evaluator.release.set()
+        verdict = await speculator.take("s1", "core_1", "Mandamos WhatsApp ")
+
+    assert verdict == (True, FOLLOW_UP)
+    assert evaluator.started == ["Mandamos WhatsApp"]
+    assert speculator.stats()["hits"] == 1
+    assert speculator.stats()["entries"] == 0
+
+
+@pytest.mark.asyncio
+async def test_same_draft_is_not_evaluated_twice():
+    state = await _state_at_core_1()
+    evaluator = _SlowEvaluator()
+    speculator = FollowUpSpeculator(max_entries=10, ttl_s=60)
+
+    with patch("app.services.follow_up_speculation.evaluate_and_maybe_follow_up", evaluator):
+        speculator.speculate("s1", state, "core_1", "Mandamos WhatsApp")
+        assert speculator.speculate("s1", state, "core_1", "Mandamos WhatsApp") is False
+        await asyncio.sleep(0)
+        evaluator.release.set()
+        await speculator.take("s1", "core_1", "Mandamos WhatsApp")
+
+    assert evaluator.started == ["Mandamos WhatsApp"]
+
+
+@pytest.mark.asyncio
+async def test_new_draft_cancels_stale_evaluation():
+    state = await _state_at_core_1()
+    evaluator = _SlowEvaluator()
+    speculator = FollowUpSpeculator(max_entries=10, ttl_s=60)
+
+    with patch("app.services.follow_up_speculation.evaluate_and_maybe_follow_up", evaluator):
+        speculator.speculate("s1", state, "core_1", "Mandamos")
+        await asyncio.sleep(0)
+        speculator.speculate("s1", state, "core_1", "Mandamos WhatsApp no D+5")
+        await asyncio.sleep(0)
+        evaluator.release.set()
+        verdict = await speculator.take("s1", "core_1", "Mandamos WhatsApp no D+5")
+
+    assert evaluator.cancelled == ["Mandamos"]
+    assert verdict == (True, FOLLOW_UP)
+    assert speculator.stats()["cancelled"] == 1
+
+
+@pytest.mark.asyncio
+async def test_take_with_different_answer_misses_and_cancels():
+    state = await _state_at_core_1()
+    evaluator = _SlowEvaluator()
+    speculator = FollowUpSpeculator(max_entries=10, ttl_s=60)
+
+    with patch("app.services.follow_up_speculation.evaluate_and_maybe_follow_up", evaluator):
+        speculator.speculate("s1", state, "core_1", "Mandamos")
+        await asyncio.sleep(0)
+        assert await speculator.take("s1", "core_1", "Mandamos boleto") is None
+        await asyncio.sleep(0)
+
+    assert evaluator.cancelled == ["Mandamos"]
+    assert speculator.stats()["misses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_expired_speculation_is_ignored():
+    state = await _state_at_core_1()
+    evaluator = _SlowEvaluator()
+    evaluator.release.set()
+    speculator = FollowUpSpeculator(max_entries=10, ttl_s=0)
+
+    with patch("app.services.follow_up_speculation.evaluate_and_maybe_follow_up", evaluator):
+        speculator.speculate("s1", state, "core_1", "Mandamos")
+        await asyncio.sleep(0.01)
+        assert await speculator.take("s1", "core_1", "Mandamos") is None
+
+
+@pytest.mark.asyncio
+async def test_oldest_speculations_are_pruned():
+    state = await _state_at_core_1()
+    evaluator = _SlowEvaluator()
+    speculator = FollowUpSpeculator(max_entries=2, ttl_s=60)
+
+    with patch("app.services.follow_up_speculation.evaluate_and_maybe_follow_up", evaluator):
+        for session_id in ("s1", "s2", "s3"):
+            speculator.speculate(session_id, state, "core_1", "Mandamos")
+        await asyncio.sleep(0)
+        assert speculator.stats()["entries"] == 2
+        assert await speculator.take("s1", "core_1", "Mandamos") is None
+        await speculator.close()
+
+    # s1 was cancelled before it started; s2 and s3 by close()
+    assert len(evaluator.started) == 2
+    assert evaluator.cancelled == evaluator.started
+
+
+@pytest.mark.asyncio
+async def test_submit_answer_uses_precomputed_verdict():
+    state = await _state_at_core_1()
+
+    with patch(
+        "app.services.interview_agent.evaluate_and_maybe_follow_up", new_callable=AsyncMock
+    ) as mock_evaluate:
+        next_q, new_state = await submit_answer(
+            state, "core_1", "Mandamos WhatsApp", follow_up_verdict=(True, FOLLOW_UP)
+        )
+
+    mock_evaluate.assert_not_called()
+    assert next_q.question_id == "followup_core_1_1"
+    assert new_state["follow_up_count"] == 1
+
+
+# ---------- Endpoints ----------
+
+
+def _session_at_core_1(client: TestClient) -> str:
+    resp = client.post(
+        "/api/v1/sessions",
+        json={"company_name": "TestCorp", "website": "https://test.com"},
+    )
+    session_id = resp.json()["session_id"]
+    client.get(f"/api/v1/sessions/{session_id}/interview/next")
+    client.post(
+        f"/api/v1/sessions/{session_id}/interview/answer",
+        json={"question_id": "core_0", "answer": "Sofia", "source": "text"},
+    )
+    return session_id
+
+
+@patch("app.routers.interview.follow_up_speculator")
+def test_draft_endpoint_starts_speculation(mock_speculator, client: TestClient) -> None:
+    session_id = _session_at_core_1(client)
+
+    resp = client.post(
+        f"/api/v1/sessions/{session_id}/interview/draft",
+        json={"question_id": "core_1", "answer": "Mandamos WhatsApp"},
+    )
+
+    assert resp.status_code == 202
+    assert resp.json() == {"speculating": True}
+    args = mock_speculator.speculate.call_args.args
+    assert (args[0], args[2], args[3]) == (session_id, "core_1", "Mandamos WhatsApp")
+
+
+@patch("app.routers.interview.follow_up_speculator")
+def test_draft_endpoint_skips_questions_without_evaluation(
+    mock_speculator, client: TestClient
+) -> None:
+    resp = client.post(
+        "/api/v1/sessions",
+        json={"company_name": "TestCorp", "website": "https://test.com"},
+    )
+    session_id = resp.json()["session_id"]
+    client.get(f"/api/v1/sessions/{session_id}/interview/next")
+
+    # core_0 is optional: no follow-up evaluation to speculate on
+    resp = client.post(
+        f"/api/v1/sessions/{session_id}/interview/draft",
+        json={"question_id": "core_0", "answer": "Sofia"},
+    )
+    assert resp.json() == {"speculating": False}
+    mock_speculator.speculate.assert_not_called()
+
+    resp = client.post(
+        f"/api/v1/sessions/{session_id}/interview/draft",
+        json={"question_id": "core_1", "answer": "Sofia"},
+    )
+    assert resp.status_code == 400
+
+
+@patch("app.routers.interview.follow_up_speculator")
+def test_submit_reuses_speculated_verdict(mock_speculator, client: TestClient) -> None:
+    mock_speculator.take = AsyncMock(return_value=(True, FOLLOW_UP))
+    session_id = _session_at_core_1(client)
+
+    with patch(
+        "app.services.interview_agent.evaluate_and_maybe_follow_up", new_callable=AsyncMock
+    ) as mock_evaluate:
+        resp = client.post(
+            f"/api/v1/sessions/{session_id}/interview/answer",
+            json={"question_id": "core_1", "answer": "Mandamos WhatsApp", "source": "text"},
+        )
+
+    assert resp.status_code == 200
+    assert resp.json()["follow_up"]["question_id"] == "followup_core_1_1"
+    mock_speculator.take.assert_awaited_once_with(session_id, "core_1", "Mandamos WhatsApp")
+    mock_evaluate.assert_not_called()
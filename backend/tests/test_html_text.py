@@ -0,0 +1,56 @@
+"""Tests for HTML visible-text extraction and JS-shell detection."""
+
+from app.utils.html_text import extract_visible_text, looks_like_js_shell
+
+
+def test_extract_skips_scripts_styles_and_head():
+    html = (
+        "<html><head><title>Titulo</title><style>p{color:red}</style></head>"
+        "<body><script>alert('x')</script><p>Olá   mundo</p><noscript>JS off</noscript>"
+        "<ul><li>Pix</li><li>Boleto</li></ul></body></html>"
+    )
+    text = extract_visible_text(html)
+    assert text == "Olá mundo\nPix\nBoleto"
+
+
+def test_extract_decodes_entities_and_breaks_blocks():
+    html = "<div>Preço&nbsp;justo</div><div>Cobran&ccedil;a</div>texto<br>solto"
+    assert extract_visible_text(html).splitlines() == [
+        "Preço justo", "Cobrança", "texto", "solto",
+    ]
+
+
+def test_js_shell_detected_for_empty_mount_point():
+    html = '<body><div id="root"></div><script src="/app.js"></script></body>'
+    assert looks_like_js_shell(html, extract_visible_text(html)) is True
+
+
+def test_js_shell_detected_for_enable_javascript_notice():
+    html = "<body><noscript>Por favor, habilite o JavaScript.</noscript></body>"
+    assert looks_like_js_shell(html, "") is True
+
+
+def test_long_text_with_empty_mount_point_is_a_js_shell():
+    html = '<body><div id="root"></div><p>' + "conteúdo " * 100 + "</p></body>"
+    assert looks_like_js_shell(html, extract_visible_text(html)) is True
+
+
+def test_server_rendered_page_is_not_a_js_shell():
+    html = (
+        '<body><div id="root"><p>' + "conteúdo " * 100 + "</p></div>"
+        "<script>window.dataLayer = [];</script></body>"
+    )
+    assert looks_like_js_shell(html, extract_visible_text(html)) is False
+
+
+def test_script_heavy_page_is_a_js_shell():
+    html = "<body><p>Carregando...</p><script>" + "render();" * 500 + "</script></body>"
+    assert looks_like_js_shell(html, extract_visible_text(html)) is True
+
+
+def test_json_data_scripts_do_not_count_as_code():
+    html = (
+        '<body><p>Empresa de cobrança</p><script type="application/ld+json">'
+        + '{"a": 1}' * 500 + "</script></body>"
+    )
+    assert looks_like_js_shell(html, extract_visible_text(html)) is False
@@ -1,6 +1,7 @@
 """Tests for interview: core questions, LangGraph state, endpoints, follow-ups."""
 
 import json
+from unittest.mock import patch
 
 import pytest
 from fastapi.testclient import TestClient
@@ -114,8 +115,11 @@ async def test_state_serialization():
     state = await create_interview(enrichment_data=enrichment)
 
     json_str = json.dumps(serialize_state(state), ensure_ascii=False)
-    loaded = deserialize_state(json.loads(json_str))
+    # enrichment_data is not persisted with the state: it is hydrated on load
+    assert "TestCorp" not in json_str
+    loaded = deserialize_state(json.loads(json_str), enrichment_data=enrichment)
 
+    assert loaded == state
     assert loaded["phase"] == state["phase"]
     assert loaded["current_question"] == state["current_question"]
     assert len(loaded["core_questions_remaining"]) == len(state["core_questions_remaining"])
@@ -124,6 +128,44 @@ async def test_state_serialization():
     assert loaded["needs_follow_up"] == state["needs_follow_up"]
 
 
+@pytest.mark.asyncio
+async def test_state_serialization_compact_v2():
+    """Core questions are stored by id; follow-ups and their answers keep their text."""
+    state = await create_interview()
+    _, state = await submit_answer(state, "core_0", "Sofia", "text")
+    _, state = await submit_answer(state, "core_1", "Processo", "text")
+    _, state = await submit_answer(state, "core_2", "sim", "audio")  # policy follow-up
+
+    data = serialize_state(state)
+
+    assert data["v"] == 2
+    assert data["remaining"] == ["core_3", "core_4", "core_5", "core_6"]
+    assert data["current"]["question_id"] == "followup_core_2_1"
+    assert data["follow_up"] == "current"
+    assert data["answers"][2] == ["core_2", "sim", "audio"]
+    assert deserialize_state(data) == state
+
+
+def test_deserialize_legacy_state():
+    """Unversioned (v1) rows still load; the session's enrichment wins over the embedded copy."""
+    legacy = {
+        "enrichment_data": {"company_name": "Old"},
+        "core_questions_remaining": [],
+        "current_question": None,
+        "answers": [{"question_id": "core_0", "answer": "Sofia", "source": "text", "question_text": "Q0"}],
+        "phase": "review",
+        "needs_follow_up": False,
+        "follow_up_question": None,
+        "follow_up_count": 0,
+    }
+
+    assert deserialize_state(legacy)["enrichment_data"] == {"company_name": "Old"}
+    state = deserialize_state(legacy, enrichment_data={"company_name": "New"})
+    assert state["enrichment_data"] == {"company_name": "New"}
+    assert state["answers"] == legacy["answers"]
+    assert deserialize_state(serialize_state(state), state["enrichment_data"]) == state
+
+
 @pytest.mark.asyncio
 async def test_get_next_question_advances():
     """get_next_question pops the next core question from remaining."""
@@ -136,6 +178,21 @@ async def test_get_next_question_advances():
     assert len(new_state["core_questions_remaining"]) == 5
 
 
+@pytest.mark.asyncio
+async def test_graphs_are_not_rebuilt_per_call():
+    """Compiled graphs are reused; the builders only run at import time."""
+    with (
+        patch("app.services.interview_agent._build_full_graph", side_effect=AssertionError),
+        patch(
+            "app.services.interview_agent._build_next_question_graph",
+            side_effect=AssertionError,
+        ),
+    ):
+        state = await create_interview()
+        question, _ = await get_next_question(state)
+    assert question.question_id == "core_1"
+
+
 # ---------- Interview "next question" endpoint ----------
 
 
@@ -398,7 +455,7 @@ async def test_short_answer_triggers_follow_up():
     })
     mock_client = _mock_openai_response(mock_response)
 
-    with patch("app.services.interview_agent.AsyncOpenAI", return_value=mock_client):
+    with patch("app.services.llm_gateway.get_llm_client", return_value=mock_client):
         with patch("app.services.interview_agent.settings") as mock_settings:
             mock_settings.OPENAI_API_KEY = "test-key"
             next_q, new_state = await submit_answer(state, "core_1", "sim", "text")
@@ -430,7 +487,7 @@ async def test_detailed_answer_no_follow_up():
     })
     mock_client = _mock_openai_response(mock_response)
 
-    with patch("app.services.interview_agent.AsyncOpenAI", return_value=mock_client):
+    with patch("app.services.llm_gateway.get_llm_client", return_value=mock_client):
         with patch("app.services.interview_agent.settings") as mock_settings:
             mock_settings.OPENAI_API_KEY = "test-key"
             next_q, new_state = await submit_answer(
@@ -462,7 +519,7 @@ async def test_follow_up_answer_stored():
     })
     mock_client = _mock_openai_response(fu_response)
 
-    with patch("app.services.interview_agent.AsyncOpenAI", return_value=mock_client):
+    with patch("app.services.llm_gateway.get_llm_client", return_value=mock_client):
         with patch("app.services.interview_agent.settings") as mock_settings:
             mock_settings.OPENAI_API_KEY = "test-key"
             next_q, state2 = await submit_answer(state, "core_1", "sim", "text")
@@ -480,7 +537,7 @@ async def test_follow_up_answer_stored():
     })
     mock_client2 = _mock_openai_response(no_fu_response)
 
-    with patch("app.services.interview_agent.AsyncOpenAI", return_value=mock_client2):
+    with patch("app.services.llm_gateway.get_llm_client", return_value=mock_client2):
         with patch("app.services.interview_agent.settings") as mock_settings:
             mock_settings.OPENAI_API_KEY = "test-key"
             next_q2, state3 = await submit_answer(
@@ -525,7 +582,7 @@ def test_follow_up_endpoint_response(client: TestClient) -> None:
     })
     mock_client = _mock_openai_response(fu_response)
 
-    with patch("app.services.interview_agent.AsyncOpenAI", return_value=mock_client):
+    with patch("app.services.llm_gateway.get_llm_client", return_value=mock_client):
         with patch("app.services.interview_agent.settings") as mock_settings:
             mock_settings.OPENAI_API_KEY = "test-key"
             resp = client.post(
@@ -543,6 +600,132 @@ def test_follow_up_endpoint_response(client: TestClient) -> None:
     assert data["follow_up"]["question_id"] == "followup_core_1_1"
 
 
+# ---------- Batch answers endpoint ----------
+
+
+def _started_session(client: TestClient) -> str:
+    resp = client.post(
+        "/api/v1/sessions",
+        json={"company_name": "TestCorp", "website": "https://test.com"},
+    )
+    session_id = resp.json()["session_id"]
+    client.get(f"/api/v1/sessions/{session_id}/interview/next")
+    return session_id
+
+
+def _post_batch(client: TestClient, session_id: str, answers: list, needs_follow_up: bool = False):
+    """POST /interview/answers with the follow-up LLM mocked."""
+    evaluation = json.dumps({
+        "needs_follow_up": needs_follow_up,
+        "follow_up_question": "Pode descrever melhor o processo de cobrança?",
+        "reason": "Muito curto",
+    })
+    with patch(
+        "app.services.llm_gateway.get_llm_client",
+        return_value=_mock_openai_response(evaluation),
+    ):
+        with patch("app.services.interview_agent.settings") as mock_settings:
+            mock_settings.OPENAI_API_KEY = "test-key"
+            return client.post(
+                f"/api/v1/sessions/{session_id}/interview/answers",
+                json={"answers": [
+                    {"question_id": qid, "answer": answer, "source": "text"}
+                    for qid, answer in answers
+                ]},
+            )
+
+
+def test_batch_answers_whole_interview(client: TestClient) -> None:
+    session_id = _started_session(client)
+
+    resp = _post_batch(client, session_id, [
+        ("core_0", "Sofia"),
+        ("core_1", "Lembrete por WhatsApp 3 dias antes do vencimento, ligação no D+5 "
+                   "e negativação no Serasa após 30 dias de atraso"),
+        ("core_2", "nao"),
+        ("core_3", "sim"),
+        ("followup_core_3_1", "10% à vista"),
+        ("core_4", "nao"),
+        ("core_5", "nao"),
+        ("core_6", "Não"),
+    ])
+
+    assert resp.status_code == 200
+    data = resp.json()
+    assert (data["applied"], data["skipped"]) == (8, 0)
+    assert data["next_question"] is None
+    assert data["phase"] == "review"
+    assert data["progress"]["is_complete"] is True
+    assert data["progress"]["total_answered"] == 8
+
+    review = client.get(f"/api/v1/sessions/{session_id}/interview/review").json()
+    assert len(review["answers"]) == 8
+
+
+def test_batch_answers_stop_at_llm_follow_up(client: TestClient) -> None:
+    session_id = _started_session(client)
+
+    resp = _post_batch(
+        client, session_id,
+        [("core_0", "Sofia"), ("core_1", "sim"), ("core_2", "nao")],
+        needs_follow_up=True,
+    )
+
+    assert resp.status_code == 200
+    data = resp.json()
+    assert (data["applied"], data["skipped"]) == (2, 1)
+    assert data["follow_up"]["question_id"] == "followup_core_1_1"
+    assert data["progress"]["total_answered"] == 2
+
+    current = client.get(f"/api/v1/sessions/{session_id}/interview/next").json()
+    assert current["question_id"] == "followup_core_1_1"
+
+
+def test_batch_answers_stop_at_unanswered_policy_follow_up(client: TestClient) -> None:
+    session_id = _started_session(client)
+
+    resp = _post_batch(client, session_id, [
+        ("core_0", "Sofia"),
+        ("core_1", "Lembrete por WhatsApp 3 dias antes do vencimento, ligação no D+5 "
+                   "e negativação no Serasa após 30 dias de atraso"),
+        ("core_2", "sim"),
+        ("core_3", "nao"),
+    ])
+
+    data = resp.json()
+    assert (data["applied"], data["skipped"]) == (3, 1)
+    assert data["follow_up"]["question_id"] == "followup_core_2_1"
+    assert data["progress"]["core_answered"] == 3
+
+
+def test_batch_answers_mismatch_rejects_batch(client: TestClient) -> None:
+    session_id = _started_session(client)
+
+    resp = _post_batch(client, session_id, [("core_0", "Sofia"), ("core_2", "nao")])
+
+    assert resp.status_code == 400
+    assert "mismatch" in resp.json()["detail"]
+    progress = client.get(f"/api/v1/sessions/{session_id}/interview/progress").json()
+    assert progress["total_answered"] == 0
+
+
+def test_batch_answers_not_started(client: TestClient) -> None:
+    resp = client.post(
+        "/api/v1/sessions",
+        json={"company_name": "TestCorp", "website": "https://test.com"},
+    )
+    session_id = resp.json()["session_id"]
+
+    resp = client.post(
+        f"/api/v1/sessions/{session_id}/interview/answers",
+        json={"answers": [{"question_id": "core_0", "answer": "Sofia"}]},
+    )
+    assert resp.status_code == 400
+
+    resp = client.post(f"/api/v1/sessions/{session_id}/interview/answers", json={"answers": []})
+    assert resp.status_code == 422
+
+
 # ---------- Frustration detection ----------
 
 
@@ -562,7 +745,7 @@ async def test_frustration_signal_skips_follow_up():
     })
     mock_client = _mock_openai_response(mock_response)
 
-    with patch("app.services.interview_agent.AsyncOpenAI", return_value=mock_client):
+    with patch("app.services.llm_gateway.get_llm_client", return_value=mock_client):
         with patch("app.services.interview_agent.settings") as mock_settings:
             mock_settings.OPENAI_API_KEY = "test-key"
             next_q, new_state = await submit_answer(
@@ -693,7 +876,7 @@ async def test_core_0_optional_skips_follow_up():
     })
     mock_client = _mock_openai_response(mock_response)
 
-    with patch("app.services.interview_agent.AsyncOpenAI", return_value=mock_client):
+    with patch("app.services.llm_gateway.get_llm_client", return_value=mock_client):
         with patch("app.services.interview_agent.settings") as mock_settings:
             mock_settings.OPENAI_API_KEY = "test-key"
             next_q, new_state = await submit_answer(state, "core_0", "Sofia", "text")
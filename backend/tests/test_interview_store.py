@@ -0,0 +1,244 @@
+"""Tests for event-sourced interview persistence."""
+
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.orm import InterviewEvent, OnboardingSession
+from app.services import interview_store
+from app.services.interview_agent import (
+    STATE_FORMAT_VERSION,
+    create_interview,
+    deserialize_state,
+    serialize_state,
+    submit_answer,
+)
+from tests.conftest import TestSessionLocal
+
+ENRICHMENT = {"company_name": "TestCorp", "segment": "Tecnologia"}
+
+# Answers that never reach the follow-up LLM: core_0 and core_6 are optional,
+# core_2-5 are policy selects (core_3 "sim" opens its deterministic follow-up)
+POLICY_ANSWERS = [
+    ("core_2", "nao"),
+    ("core_3", "sim"),
+    ("followup_core_3_1", "10% à vista"),
+    ("core_4", "nao"),
+    ("core_5", "nao"),
+    ("core_6", "Não"),
+]
+
+
+def _add_session(db: Session) -> OnboardingSession:
+    session = OnboardingSession(
+        company_name="TestCorp",
+        company_website="https://testcorp.com",
+        enrichment_data=ENRICHMENT,
+        status="interviewing",
+    )
+    db.add(session)
+    db.commit()
+    return session
+
+
+async def _play_rest(db: Session, session: OnboardingSession) -> dict:
+    """Answer core_1 onwards, committing after each event."""
+    for question_id, answer in [("core_1", "processo"), *POLICY_ANSWERS]:
+        record = interview_store.load(db, session)
+        # core_1 follow-up verdict given up front: no LLM involved
+        verdict = (False, None) if question_id == "core_1" else None
+        _, state = await submit_answer(record.state, question_id, answer, follow_up_verdict=verdict)
+        interview_store.record_answer(db, session, record, state)
+        db.commit()
+    return state
+
+
+async def _play(db: Session, session: OnboardingSession) -> dict:
+    """Run a whole interview through the store."""
+    record = interview_store.record_started(db, session, await create_interview(ENRICHMENT))
+    _, state = await submit_answer(record.state, "core_0", "Sofia")
+    interview_store.record_answer(db, session, record, state)
+    db.commit()
+    return await _play_rest(db, session)
+
+
+def _event_count(db: Session, session_id: str) -> int:
+    return db.scalar(
+        select(func.count()).select_from(InterviewEvent).where(InterviewEvent.session_id == session_id)
+    )
+
+
+@pytest.mark.asyncio
+async def test_replay_rebuilds_final_state(db_session: Session, monkeypatch):
+    monkeypatch.setattr(settings, "INTERVIEW_SNAPSHOT_INTERVAL", 1000)
+    session = _add_session(db_session)
+
+    final_state = await _play(db_session, session)
+
+    record = interview_store.load(db_session, session)
+    assert final_state["phase"] == "review"
+    assert serialize_state(record.state) == serialize_state(final_state)
+    assert [r["question_id"] for r in record.responses] == [
+        "core_0", "core_1", "core_2", "core_3", "followup_core_3_1", "core_4", "core_5", "core_6",
+    ]
+    assert _event_count(db_session, session.id) == 9  # started + 8 answers
+
+
+@pytest.mark.asyncio
+async def test_snapshot_written_periodically_and_at_review(db_session: Session, monkeypatch):
+    monkeypatch.setattr(settings, "INTERVIEW_SNAPSHOT_INTERVAL", 4)
+    session = _add_session(db_session)
+
+    state = await create_interview(ENRICHMENT)
+    record = interview_store.record_started(db_session, session, state)
+    db_session.commit()
+    assert session.interview_state is None
+
+    _, state = await submit_answer(record.state, "core_0", "Sofia")
+    interview_store.record_answer(db_session, session, record, state)
+    db_session.commit()
+    # Two events, below the interval: the answer is only an appended row
+    assert session.interview_state is None
+    assert session.interview_responses is None
+
+    await _play_rest(db_session, session)
+    snapshot = session.interview_state
+    # The interview reached review: the snapshot covers every event
+    assert snapshot["phase"] == "review"
+    assert snapshot[interview_store.SNAPSHOT_SEQ_KEY] == _event_count(db_session, session.id)
+    assert len(session.interview_responses) == 8
+
+
+@pytest.mark.asyncio
+async def test_load_replays_events_after_snapshot(db_session: Session, monkeypatch):
+    monkeypatch.setattr(settings, "INTERVIEW_SNAPSHOT_INTERVAL", 3)
+    session = _add_session(db_session)
+    state = await create_interview(ENRICHMENT)
+    record = interview_store.record_started(db_session, session, state)
+    for question_id, answer in [("core_0", "Sofia"), ("core_1", "processo"), ("core_2", "nao")]:
+        verdict = (False, None) if question_id == "core_1" else None
+        _, state = await submit_answer(record.state, question_id, answer, follow_up_verdict=verdict)
+        interview_store.record_answer(db_session, session, record, state)
+    db_session.commit()
+
+    record = interview_store.load(db_session, session)
+    assert record.snapshot_seq == 3
+    assert record.seq == 4
+    assert record.state["current_question"]["question_id"] == "core_3"
+    assert [r["answer"] for r in record.responses] == ["Sofia", "processo", "nao"]
+
+
+@pytest.mark.asyncio
+async def test_legacy_row_is_a_snapshot_at_seq_zero(db_session: Session):
+    session = _add_session(db_session)
+    state = await create_interview(ENRICHMENT)
+    _, state = await submit_answer(state, "core_0", "Sofia")
+    session.interview_state = serialize_state(state)
+    session.interview_responses = [{"question_id": "core_0", "answer": "Sofia", "source": "text"}]
+    db_session.commit()
+
+    record = interview_store.load(db_session, session)
+    _, state = await submit_answer(record.state, "core_1", "processo", follow_up_verdict=(False, None))
+    interview_store.record_answer(db_session, session, record, state)
+    db_session.commit()
+
+    record = interview_store.load(db_session, session)
+    assert record.seq == 1
+    assert [r["question_id"] for r in record.responses] == ["core_0", "core_1"]
+    assert record.state["current_question"]["question_id"] == "core_2"
+
+
+@pytest.mark.asyncio
+async def test_migrate_legacy_states(db_session: Session):
+    session = _add_session(db_session)
+    state = await create_interview(ENRICHMENT)
+    _, state = await submit_answer(state, "core_0", "Sofia")
+    legacy = dict(state)  # v1: a plain copy, enrichment_data included
+    session.interview_state = legacy
+    updated_at = session.updated_at
+    db_session.commit()
+
+    assert interview_store.migrate_legacy_states(db_session) == 1
+    assert interview_store.migrate_legacy_states(db_session) == 0
+
+    db_session.refresh(session)
+    snapshot = session.interview_state
+    assert snapshot["v"] == STATE_FORMAT_VERSION
+    assert snapshot[interview_store.SNAPSHOT_SEQ_KEY] == 0
+    assert "enrichment_data" not in snapshot
+    assert session.updated_at.replace(tzinfo=None) == updated_at.replace(tzinfo=None)
+    assert interview_store.load(db_session, session).state == deserialize_state(legacy)
+
+
+@pytest.mark.asyncio
+async def test_migrate_reads_only_unversioned_rows(db_session: Session):
+    state = await create_interview(ENRICHMENT)
+    current = _add_session(db_session)
+    current.interview_state = serialize_state(state)
+    legacy = _add_session(db_session)
+    legacy.interview_state = dict(state)
+    db_session.commit()
+
+    with patch(
+        "app.services.interview_store.deserialize_state", wraps=deserialize_state
+    ) as spy:
+        assert interview_store.migrate_legacy_states(db_session) == 1
+
+    spy.assert_called_once()
+    assert spy.call_args.args[0].get("v") is None
+
+
+@pytest.mark.asyncio
+async def test_concurrent_answers_conflict(db_session: Session):
+    session = _add_session(db_session)
+    state = await create_interview(ENRICHMENT)
+    interview_store.record_started(db_session, session, state)
+    db_session.commit()
+
+    other_db = TestSessionLocal()
+    try:
+        other_session = other_db.get(OnboardingSession, session.id)
+        first = interview_store.load(db_session, session)
+        second = interview_store.load(other_db, other_session)
+        _, state = await submit_answer(first.state, "core_0", "Sofia")
+        interview_store.record_answer(db_session, session, first, state)
+        interview_store.record_answer(other_db, other_session, second, state)
+        db_session.commit()
+        with pytest.raises(IntegrityError):
+            other_db.commit()
+    finally:
+        other_db.close()
+
+
+def test_answers_append_events_via_api(client: TestClient) -> None:
+    resp = client.post(
+        "/api/v1/sessions",
+        json={"company_name": "TestCorp", "website": "https://test.com"},
+    )
+    session_id = resp.json()["session_id"]
+    client.get(f"/api/v1/sessions/{session_id}/interview/next")
+    client.post(
+        f"/api/v1/sessions/{session_id}/interview/answer",
+        json={"question_id": "core_0", "answer": "Sofia", "source": "text"},
+    )
+
+    db = TestSessionLocal()
+    try:
+        events = db.scalars(
+            select(InterviewEvent).where(InterviewEvent.session_id == session_id)
+            .order_by(InterviewEvent.seq)
+        ).all()
+        assert [(e.seq, e.kind) for e in events] == [(1, "started"), (2, "answered")]
+        assert events[1].payload["answer"] == ["core_0", "Sofia", "text"]
+        assert "enrichment_data" not in events[1].payload["transition"]
+        assert db.get(OnboardingSession, session_id).interview_state is None
+    finally:
+        db.close()
+
+    progress = client.get(f"/api/v1/sessions/{session_id}/interview/progress").json()
+    assert progress["total_answered"] == 1
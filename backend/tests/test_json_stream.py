@@ -0,0 +1,44 @@
+"""Tests for incremental JSON object parsing."""
+
+import json
+
+import pytest
+
+from app.utils.json_stream import JsonObjectStream
+
+DOC = {
+    "company": {"name": 'Acme "Ltda" {}', "tags": [1, {"x": "]"}]},
+    "score": 12.5,
+    "active": True,
+    "note": None,
+    "path": "a\\\\b",
+    "empty": [],
+    "text": "ação – cobrança",
+}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 64, 10_000])
+def test_members_are_emitted_in_order(chunk_size: int):
+    text = json.dumps(DOC, indent=2, ensure_ascii=False)
+    parser = JsonObjectStream()
+    members = []
+    for i in range(0, len(text), chunk_size):
+        members.extend(parser.feed(text[i:i + chunk_size]))
+
+    assert members == list(DOC.items())
+    assert parser.done
+
+
+def test_member_is_emitted_as_soon_as_it_closes():
+    parser = JsonObjectStream()
+    assert parser.feed('{"company": {"name": "Acme"') == []
+    assert parser.feed('}, "score": 1') == [("company", {"name": "Acme"})]
+    # A number may still continue until the separator arrives
+    assert parser.feed("0") == []
+    assert parser.feed("}") == [("score", 10)]
+    assert parser.done
+
+
+def test_rejects_non_object():
+    with pytest.raises(json.JSONDecodeError):
+        JsonObjectStream().feed("[1, 2]")
@@ -0,0 +1,104 @@
+"""Tests for LLM admission control and the metrics endpoint."""
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.services.llm_admission import AdmissionController
+
+
+async def _hold(controller: AdmissionController, model: str, release: asyncio.Event, **kwargs):
+    async with controller.admit(model, **kwargs):
+        await release.wait()
+
+
+async def test_concurrency_is_limited_per_model():
+    controller = AdmissionController(max_concurrency=2, tokens_per_minute=0)
+    release = asyncio.Event()
+    holders = [asyncio.create_task(_hold(controller, "m", release)) for _ in range(3)]
+    await asyncio.sleep(0)
+
+    snapshot = controller.snapshot()
+    assert snapshot["in_flight"] == {"m": 2}
+    assert snapshot["queue_depth"]["default"] == 1
+
+    # Another model is not held up by the full one
+    async with controller.admit("other"):
+        assert controller.snapshot()["in_flight"] == {"m": 2, "other": 1}
+
+    release.set()
+    await asyncio.gather(*holders)
+    assert controller.snapshot()["in_flight"] == {}
+
+
+async def test_interactive_is_served_before_bulk():
+    controller = AdmissionController(max_concurrency=1, tokens_per_minute=0)
+    release = asyncio.Event()
+    blocker = asyncio.create_task(_hold(controller, "m", release))
+    await asyncio.sleep(0)
+
+    order: list[str] = []
+
+    async def request(priority: str):
+        async with controller.admit("m", priority=priority):
+            order.append(priority)
+
+    waiting = [
+        asyncio.create_task(request("bulk")),
+        asyncio.create_task(request("default")),
+        asyncio.create_task(request("interactive")),
+    ]
+    await asyncio.sleep(0)
+    assert controller.snapshot()["queue_depth"] == {"interactive": 1, "default": 1, "bulk": 1}
+
+    release.set()
+    await asyncio.gather(blocker, *waiting)
+    assert order == ["interactive", "default", "bulk"]
+
+
+async def test_token_budget_delays_requests():
+    """A request that doesn't fit the remaining budget waits for the refill."""
+    controller = AdmissionController(max_concurrency=10, tokens_per_minute=6000)  # 100/s
+    async with controller.admit("m", estimated_tokens=6000):
+        pass
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    async with controller.admit("m", estimated_tokens=5):
+        pass
+    assert loop.time() - started >= 0.03
+    assert controller.snapshot()["wait_ms"]["default"]["count"] == 2
+
+
+async def test_record_usage_refunds_overestimate():
+    controller = AdmissionController(max_concurrency=10, tokens_per_minute=1000)
+    async with controller.admit("m", estimated_tokens=800) as admission:
+        admission.record_usage(100)
+    assert controller.snapshot()["tokens_available"] >= 900
+
+
+async def test_cancelled_waiter_leaves_queue():
+    controller = AdmissionController(max_concurrency=1, tokens_per_minute=0)
+    release = asyncio.Event()
+    blocker = asyncio.create_task(_hold(controller, "m", release))
+    await asyncio.sleep(0)
+
+    waiter = asyncio.create_task(_hold(controller, "m", release))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert controller.snapshot()["queue_depth"]["default"] == 0
+
+    release.set()
+    await blocker
+    assert controller.snapshot()["in_flight"] == {}
+
+
+def test_llm_metrics_endpoint(client: TestClient):
+    resp = client.get("/api/v1/metrics/llm")
+    assert resp.status_code == 200
+    admission = resp.json()["admission"]
+    assert set(admission["queue_depth"]) == {"interactive", "default", "bulk"}
+    assert "tokens_available" in admission
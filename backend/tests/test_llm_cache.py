@@ -0,0 +1,169 @@
+"""Tests for the content-addressed LLM response cache."""
+
+import json
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.models.orm import LLMCacheEntry
+from app.services import llm_cache
+from app.services.llm_gateway import chat_completion
+from tests.conftest import TestSessionLocal
+
+MESSAGES = [
+    {"role": "system", "content": "sys"},
+    {"role": "user", "content": "hi"},
+]
+
+
+def _response(content: str) -> MagicMock:
+    response = MagicMock()
+    response.choices = [MagicMock()]
+    response.choices[0].message.content = content
+    return response
+
+
+async def _call(**kwargs):
+    return await chat_completion(
+        call_site="test",
+        messages=MESSAGES,
+        response_format={"type": "json_object"},
+        temperature=0.2,
+        parse=lambda r: json.loads(r.choices[0].message.content),
+        **kwargs,
+    )
+
+
+def test_cache_key_covers_all_inputs():
+    base = llm_cache.cache_key("m", MESSAGES, 0.2, {"type": "json_object"})
+    assert base == llm_cache.cache_key("m", list(MESSAGES), 0.2, {"type": "json_object"})
+    assert base != llm_cache.cache_key("m", MESSAGES, 0.3, {"type": "json_object"})
+    assert base != llm_cache.cache_key("other", MESSAGES, 0.2, {"type": "json_object"})
+    assert base != llm_cache.cache_key("m", MESSAGES, 0.2, None)
+    assert base != llm_cache.cache_key("m", MESSAGES[1:], 0.2, {"type": "json_object"})
+
+
+async def test_identical_call_is_served_from_cache():
+    with patch("app.services.llm_gateway.get_llm_client") as mock_client:
+        create = mock_client.return_value.chat.completions.create = AsyncMock(
+            return_value=_response('{"a": 1}')
+        )
+        assert await _call(cache=True) == {"a": 1}
+        assert await _call(cache=True) == {"a": 1}
+
+    assert create.await_count == 1
+    stats = llm_cache.stats()
+    assert (stats["hits"], stats["misses"], stats["stores"]) == (1, 1, 1)
+    assert stats["by_call_site"]["test"]["hits"] == 1
+
+
+async def test_calls_without_opt_in_are_not_cached():
+    with patch("app.services.llm_gateway.get_llm_client") as mock_client:
+        create = mock_client.return_value.chat.completions.create = AsyncMock(
+            return_value=_response('{"a": 1}')
+        )
+        await _call()
+        await _call()
+
+    assert create.await_count == 2
+    assert llm_cache.stats()["entries"] == 0
+
+
+async def test_bypass_skips_lookup_and_refreshes_entry():
+    with patch("app.services.llm_gateway.get_llm_client") as mock_client:
+        create = mock_client.return_value.chat.completions.create = AsyncMock(
+            side_effect=[_response('{"a": 1}'), _response('{"a": 2}')]
+        )
+        assert await _call(cache=True) == {"a": 1}
+        assert await _call(cache=True, bypass_cache=True) == {"a": 2}
+        assert await _call(cache=True) == {"a": 2}
+
+    assert create.await_count == 2
+
+
+async def test_unparseable_entry_is_dropped():
+    key = llm_cache.cache_key("gpt-4.1-mini", MESSAGES, 0.2, {"type": "json_object"})
+    llm_cache.put(key, "gpt-4.1-mini", "not json", "test")
+
+    with patch("app.services.llm_gateway.get_llm_client") as mock_client:
+        create = mock_client.return_value.chat.completions.create = AsyncMock(
+            return_value=_response('{"a": 1}')
+        )
+        assert await _call(cache=True) == {"a": 1}
+
+    assert create.await_count == 1
+    assert llm_cache.get(key) == '{"a": 1}'
+
+
+async def test_disabled_cache_always_calls_api(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(settings, "LLM_CACHE_ENABLED", False)
+    with patch("app.services.llm_gateway.get_llm_client") as mock_client:
+        create = mock_client.return_value.chat.completions.create = AsyncMock(
+            return_value=_response('{"a": 1}')
+        )
+        await _call(cache=True)
+        await _call(cache=True)
+
+    assert create.await_count == 2
+
+
+def test_lru_eviction_keeps_recently_used(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(settings, "LLM_CACHE_MAX_BYTES", 25)
+    llm_cache.put("old", "m", "x" * 10)
+    llm_cache.put("used", "m", "y" * 10)
+
+    # Make "old" the least recently used, then touch "used"
+    with TestSessionLocal() as db:
+        db.get(LLMCacheEntry, "old").last_accessed_at = (
+            datetime.now(timezone.utc) - timedelta(hours=1)
+        )
+        db.commit()
+    assert llm_cache.get("used") is not None
+
+    llm_cache.put("new", "m", "z" * 10)
+
+    assert llm_cache.get("old") is None
+    assert llm_cache.get("used") is not None
+    assert llm_cache.get("new") is not None
+    stats = llm_cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["size_bytes"] == 20
+
+
+def test_metrics_endpoint_reports_cache(client: TestClient):
+    resp = client.get("/api/v1/metrics/llm")
+    assert resp.status_code == 200
+    cache = resp.json()["cache"]
+    assert {"hits", "misses", "hit_rate", "entries", "size_bytes"} <= set(cache)
+
+
+def test_running_total_tracks_overwrites_and_invalidation():
+    llm_cache.put("a", "m", "x" * 10)
+    llm_cache.put("a", "m", "x" * 4)
+    llm_cache.put("b", "m", "y" * 6)
+    llm_cache.invalidate("b")
+
+    assert llm_cache._total_bytes == 4
+    assert llm_cache.stats()["size_bytes"] == 4
+
+
+def test_eviction_drops_several_entries_at_once(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(settings, "LLM_CACHE_MAX_BYTES", 30)
+    for i, key in enumerate(["first", "second", "third"]):
+        llm_cache.put(key, "m", "x" * 10)
+        with TestSessionLocal() as db:
+            db.get(LLMCacheEntry, key).last_accessed_at = (
+                datetime.now(timezone.utc) - timedelta(hours=3 - i)
+            )
+            db.commit()
+
+    llm_cache.put("big", "m", "z" * 20)
+
+    assert llm_cache.get("first") is None
+    assert llm_cache.get("second") is None
+    assert llm_cache.get("third") is not None
+    assert llm_cache.stats()["evictions"] == 2
+    assert llm_cache._total_bytes == 30
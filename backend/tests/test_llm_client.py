@@ -0,0 +1,62 @@
+"""Tests for the shared OpenAI client."""
+
+from unittest.mock import patch
+
+import pytest
+
+from app.services import llm_client
+from app.services.llm_client import close_llm_client, get_llm_client
+
+
+@pytest.fixture(autouse=True)
+async def _reset_client():
+    await close_llm_client()
+    with patch.object(llm_client.settings, "OPENAI_API_KEY", "test-key"):
+        yield
+    await close_llm_client()
+
+
+async def test_client_is_shared():
+    client = get_llm_client()
+    assert get_llm_client() is client
+
+
+async def test_close_creates_fresh_client():
+    client = get_llm_client()
+    await close_llm_client()
+    assert get_llm_client() is not client
+
+
+async def test_pool_limits_come_from_settings():
+    with patch("app.services.llm_client.settings") as mock_settings:
+        mock_settings.OPENAI_API_KEY = "test-key"
+        mock_settings.LLM_HTTP2 = False
+        mock_settings.LLM_TIMEOUT_S = 30.0
+        mock_settings.LLM_CONNECT_TIMEOUT_S = 2.0
+        mock_settings.LLM_MAX_CONNECTIONS = 7
+        mock_settings.LLM_MAX_KEEPALIVE_CONNECTIONS = 3
+        mock_settings.LLM_KEEPALIVE_EXPIRY_S = 15.0
+        http_client = llm_client._build_http_client()
+
+    pool = http_client._transport._pool
+    assert pool._max_connections == 7
+    assert pool._max_keepalive_connections == 3
+    assert pool._keepalive_expiry == 15.0
+    await http_client.aclose()
+
+
+async def test_http2_falls_back_without_h2(caplog):
+    with (
+        patch("app.services.llm_client._http2_available", return_value=False),
+        patch.object(llm_client.settings, "LLM_HTTP2", True),
+    ):
+        http_client = llm_client._build_http_client()
+    assert http_client._transport._pool._http2 is False
+    assert "'h2' is not installed" in caplog.text
+    await http_client.aclose()
+
+
+def test_http2_is_off_by_default():
+    from app.config import Settings
+
+    assert Settings.model_fields["LLM_HTTP2"].default is False
@@ -0,0 +1,254 @@
+"""Tests for the LLM gateway: error classification, backoff and deadlines."""
+
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+from openai import (
+    APIConnectionError,
+    AuthenticationError,
+    BadRequestError,
+    InternalServerError,
+    OpenAIError,
+    RateLimitError,
+)
+
+from app.config import settings
+from app.services.llm_admission import admission_controller
+from app.services.llm_gateway import (
+    LLMCallError,
+    backoff_delay,
+    call_with_retry,
+    chat_completion,
+    is_retryable,
+    retry_after_seconds,
+    stream_chat_completion,
+    usage_stats,
+)
+
+_REQUEST = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+
+
+class _FakeStream:
+    """Stand-in for ``openai.AsyncStream``: async-iterable with an async close()."""
+
+    def __init__(self, chunks):
+        self._chunks = chunks
+        self.close = AsyncMock()
+
+    def __aiter__(self):
+        return self._chunks
+
+
+def _delta_chunk(content: str) -> MagicMock:
+    chunk = MagicMock()
+    chunk.usage = None
+    chunk.choices = [MagicMock()]
+    chunk.choices[0].delta.content = content
+    return chunk
+
+
+def _status_error(cls, status: int, headers: dict | None = None, code: str | None = None):
+    response = httpx.Response(status, headers=headers or {}, request=_REQUEST)
+    body = {"code": code} if code else None  # the SDK passes the "error" object
+    return cls("error", response=response, body=body)
+
+
+# --- Classification ---
+
+
+@pytest.mark.parametrize("exc,retryable", [
+    (_status_error(RateLimitError, 429), True),
+    (_status_error(RateLimitError, 429, code="insufficient_quota"), False),
+    (_status_error(InternalServerError, 503), True),
+    (_status_error(BadRequestError, 400), False),
+    (_status_error(AuthenticationError, 401), False),
+    (APIConnectionError(request=_REQUEST), True),
+    (TimeoutError(), True),
+    (json.JSONDecodeError("bad", "", 0), True),
+    (KeyError("expert_recommendations"), True),
+    (OpenAIError("unknown"), True),
+    (ValueError("sanity check"), False),
+    (RuntimeError("bug"), False),
+])
+def test_is_retryable(exc: BaseException, retryable: bool):
+    assert is_retryable(exc) is retryable
+
+
+def test_retry_after_header_variants():
+    assert retry_after_seconds(_status_error(RateLimitError, 429, {"retry-after": "3"})) == 3.0
+    assert retry_after_seconds(
+        _status_error(RateLimitError, 429, {"retry-after-ms": "250"})
+    ) == 0.25
+    future = datetime.now(timezone.utc) + timedelta(seconds=30)
+    from_date = retry_after_seconds(
+        _status_error(RateLimitError, 429, {"retry-after": format_datetime(future)})
+    )
+    assert 25 < from_date <= 30
+    assert retry_after_seconds(_status_error(RateLimitError, 429)) is None
+    assert retry_after_seconds(OpenAIError("no response")) is None
+
+
+def test_backoff_delay_is_capped(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(settings, "LLM_RETRY_BASE_DELAY_S", 1.0)
+    monkeypatch.setattr(settings, "LLM_RETRY_MAX_DELAY_S", 4.0)
+    for attempt in range(1, 10):
+        assert 0 <= backoff_delay(attempt) <= min(4.0, 2 ** (attempt - 1))
+
+
+# --- Retry loop ---
+
+
+async def test_retries_transient_errors_until_success():
+    call = AsyncMock(side_effect=[_status_error(InternalServerError, 500), "ok"])
+    assert await call_with_retry(call, call_site="test", deadline_s=5) == "ok"
+    assert call.await_count == 2
+
+
+async def test_non_retryable_error_fails_immediately():
+    call = AsyncMock(side_effect=_status_error(AuthenticationError, 401))
+    with pytest.raises(LLMCallError) as info:
+        await call_with_retry(call, call_site="test", deadline_s=5)
+    assert call.await_count == 1
+    assert isinstance(info.value.last_error, AuthenticationError)
+
+
+async def test_value_error_propagates_unchanged():
+    call = AsyncMock(side_effect=ValueError("sanity check failed"))
+    with pytest.raises(ValueError, match="sanity check failed"):
+        await call_with_retry(call, call_site="test", deadline_s=5)
+    assert call.await_count == 1
+
+
+async def test_gives_up_when_retry_after_exceeds_deadline():
+    """A server-requested wait longer than the remaining budget is not slept."""
+    call = AsyncMock(side_effect=_status_error(RateLimitError, 429, {"retry-after": "30"}))
+    with patch("app.services.llm_gateway.asyncio.sleep", new_callable=AsyncMock) as sleep:
+        with pytest.raises(LLMCallError):
+            await call_with_retry(call, call_site="test", deadline_s=5)
+    assert call.await_count == 1
+    sleep.assert_not_awaited()
+
+
+async def test_honours_retry_after():
+    call = AsyncMock(side_effect=[
+        _status_error(RateLimitError, 429, {"retry-after": "2"}),
+        "ok",
+    ])
+    with patch("app.services.llm_gateway.asyncio.sleep", new_callable=AsyncMock) as sleep:
+        assert await call_with_retry(call, call_site="test", deadline_s=10) == "ok"
+    assert sleep.await_args.args[0] >= 2
+
+
+async def test_slow_call_is_cut_at_deadline():
+    async def hang():
+        await asyncio.sleep(10)
+
+    with pytest.raises(LLMCallError) as info:
+        await call_with_retry(hang, call_site="test", deadline_s=0.05)
+    assert isinstance(info.value.last_error, TimeoutError)
+
+
+async def test_attempts_are_capped(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(settings, "LLM_MAX_ATTEMPTS", 3)
+    call = AsyncMock(side_effect=OpenAIError("flaky"))
+    with pytest.raises(LLMCallError) as info:
+        await call_with_retry(call, call_site="test", deadline_s=5)
+    assert call.await_count == 3
+    assert info.value.attempts == 3
+
+
+async def test_chat_completion_retries_malformed_output():
+    bad = MagicMock()
+    bad.choices = [MagicMock()]
+    bad.choices[0].message.content = "not json"
+    good = MagicMock()
+    good.choices = [MagicMock()]
+    good.choices[0].message.content = '{"a": 1}'
+
+    with patch("app.services.llm_gateway.get_llm_client") as mock_client:
+        create = mock_client.return_value.chat.completions.create = AsyncMock(
+            side_effect=[bad, good]
+        )
+        result = await chat_completion(
+            call_site="test",
+            messages=[{"role": "user", "content": "hi"}],
+            response_format={"type": "json_object"},
+            temperature=0.1,
+            parse=lambda r: json.loads(r.choices[0].message.content),
+        )
+
+    assert result == {"a": 1}
+    assert create.await_count == 2
+    assert create.await_args.kwargs["temperature"] == 0.1
+
+
+async def test_stream_failure_mid_stream_is_not_retried():
+    async def chunks():
+        yield _delta_chunk('{"a": ')
+        raise APIConnectionError(request=_REQUEST)
+
+    stream = _FakeStream(chunks())
+    with patch("app.services.llm_gateway.get_llm_client") as mock_client:
+        create = mock_client.return_value.chat.completions.create = AsyncMock(
+            side_effect=[_status_error(InternalServerError, 503), stream]
+        )
+        received = []
+        with pytest.raises(LLMCallError):
+            async for delta in stream_chat_completion(
+                call_site="test", messages=[{"role": "user", "content": "hi"}]
+            ):
+                received.append(delta)
+
+    # Opening the stream was retried, the broken stream was not
+    assert create.await_count == 2
+    assert received == ['{"a": ']
+    stream.close.assert_awaited_once()
+
+
+async def test_abandoned_stream_is_closed():
+    """A consumer that stops early (e.g. client disconnect) still closes the HTTP stream."""
+
+    async def chunks():
+        for content in ("a", "b", "c"):
+            yield _delta_chunk(content)
+
+    stream = _FakeStream(chunks())
+    with patch("app.services.llm_gateway.get_llm_client") as mock_client:
+        mock_client.return_value.chat.completions.create = AsyncMock(return_value=stream)
+        deltas = stream_chat_completion(
+            call_site="test", messages=[{"role": "user", "content": "hi"}]
+        )
+        assert await anext(deltas) == "a"
+        await deltas.aclose()
+
+    stream.close.assert_awaited_once()
+    assert admission_controller.snapshot()["in_flight"] == {}
+
+
+async def test_cached_prompt_tokens_are_recorded_per_call_site():
+    response = MagicMock()
+    response.usage = SimpleNamespace(
+        prompt_tokens=2000,
+        completion_tokens=300,
+        total_tokens=2300,
+        prompt_tokens_details=SimpleNamespace(cached_tokens=1536),
+    )
+
+    with patch("app.services.llm_gateway.get_llm_client") as mock_client:
+        mock_client.return_value.chat.completions.create = AsyncMock(return_value=response)
+        for _ in range(2):
+            await chat_completion(
+                call_site="test.usage", messages=[{"role": "user", "content": "hi"}]
+            )
+
+    stats = usage_stats()["test.usage"]
+    assert stats["calls"] == 2
+    assert stats["prompt_tokens"] == 4000
+    assert stats["cached_tokens"] == 3072
+    assert stats["cached_ratio"] == 0.768
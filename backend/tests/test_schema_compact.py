@@ -0,0 +1,83 @@
+"""Tests for compact schema rendering."""
+
+import json
+
+from app.models.schemas import OnboardingReport, SimulationResult
+from app.prompts.schema_compact import (
+    compact_schema,
+    inline_refs,
+    render_schema,
+    response_format_for,
+    typescript_outline,
+)
+
+
+def _walk(node):
+    if isinstance(node, dict):
+        yield node
+        for value in node.values():
+            yield from _walk(value)
+    elif isinstance(node, list):
+        for value in node:
+            yield from _walk(value)
+
+
+def test_inline_refs_removes_indirection():
+    schema = inline_refs(OnboardingReport.model_json_schema())
+    assert "$defs" not in schema
+    assert not any("$ref" in node for node in _walk(schema))
+    assert "tone_style" in schema["properties"]["communication"]["properties"]
+
+
+def test_compact_schema_drops_noise_but_keeps_meaning():
+    schema = compact_schema(OnboardingReport.model_json_schema())
+    nodes = list(_walk(schema))
+    assert not any("title" in node for node in nodes)
+    assert not any(node.get("default") == "" for node in nodes)
+
+    # Meaningful defaults, constraints, enums and required fields survive
+    guardrails = schema["properties"]["guardrails"]["properties"]
+    assert guardrails["must_identify_as_ai"]["default"] is True
+    assert guardrails["follow_up_interval_days"]["minimum"] == 1
+    tone = schema["properties"]["communication"]["properties"]["tone_style"]
+    assert "friendly" in tone["enum"]
+    assert schema["properties"]["expert_recommendations"]["minLength"] == 200
+    assert set(schema["required"]) == {"company", "expert_recommendations"}
+
+
+def test_compact_schema_collapses_nullable_unions():
+    schema = compact_schema(SimulationResult.model_json_schema())
+    metrics = schema["properties"]["scenarios"]["items"]["properties"]["metrics"]
+    assert metrics["properties"]["final_installments"]["type"] == ["integer", "null"]
+
+
+def test_typescript_outline():
+    outline = typescript_outline(SimulationResult.model_json_schema())
+    assert 'role: "agent" | "debtor";' in outline
+    assert "negotiated_discount_pct?: number | null;" in outline
+    assert "metadata?: Record<string, any>;" in outline
+
+    report = typescript_outline(OnboardingReport.model_json_schema())
+    assert "expert_recommendations: string; // min length 200" in report
+    assert "payment_methods?: string[];" in report
+
+
+def test_render_schema_sizes():
+    schema = OnboardingReport.model_json_schema()
+    full = render_schema(schema, "full")
+    compact = render_schema(schema, "compact")
+    outline = render_schema(schema, "typescript")
+
+    assert json.loads(full) == schema
+    assert json.loads(compact) == compact_schema(schema)
+    assert len(outline) < len(compact) < len(full) / 2
+    assert render_schema(schema, "structured") is None
+
+
+def test_response_format_for():
+    schema = SimulationResult.model_json_schema()
+    assert response_format_for("SimulationResult", schema, "compact") == {"type": "json_object"}
+    structured = response_format_for("SimulationResult", schema, "structured")
+    assert structured["type"] == "json_schema"
+    assert structured["json_schema"]["name"] == "SimulationResult"
+    assert "$defs" not in structured["json_schema"]["schema"]
@@ -0,0 +1,230 @@
+"""Tests for the domain-keyed scrape result cache."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.models.orm import ScrapeCacheEntry
+from app.models.schemas import CompanyProfile
+from app.services.enrichment import ScrapeResult
+from app.services.scrape_cache import (
+    cached_research,
+    content_hash,
+    evict_lru,
+    get_entry,
+    is_fresh,
+    normalize_domain,
+    store_entry,
+)
+
+MOCK_PROFILE = CompanyProfile(
+    company_name="TestCorp",
+    segment="Tecnologia",
+    products_description="Software de cobrança",
+)
+
+WEB_RESEARCH = {"company_description": "Empresa de software"}
+
+
+def _create_session(
+    client: TestClient, website: str = "https://testcorp.com", company_name: str = "TestCorp"
+) -> str:
+    resp = client.post(
+        "/api/v1/sessions", json={"company_name": company_name, "website": website}
+    )
+    return resp.json()["session_id"]
+
+
+# --- Unit tests ---
+
+
+def test_normalize_domain():
+    assert normalize_domain("https://WWW.Empresa.com.br/contato") == "empresa.com.br"
+    assert normalize_domain("http://empresa.com.br.") == "empresa.com.br"
+    assert normalize_domain("empresa.com.br") == "empresa.com.br"
+    assert normalize_domain("https://empresa.com.br:8443/") == "empresa.com.br:8443"
+    assert normalize_domain("https://empresa.com.br:443/") == "empresa.com.br"
+
+
+def test_content_hash_is_stable():
+    assert content_hash("abc") == content_hash("abc")
+    assert content_hash("abc") != content_hash("abd")
+    assert len(content_hash("")) == 64
+
+
+def test_store_and_get_entry(db_session: Session):
+    store_entry(db_session, "testcorp.com", "text", content_hash("text"), "http",
+                MOCK_PROFILE.model_dump(), "TestCorp", WEB_RESEARCH)
+    entry = get_entry(db_session, "testcorp.com")
+    assert entry is not None
+    assert entry.company_profile["segment"] == "Tecnologia"
+    assert cached_research(entry, "Testcorp ") == WEB_RESEARCH
+    assert cached_research(entry, "OtherCorp") is None
+    assert is_fresh(entry)
+    assert get_entry(db_session, "other.com") is None
+
+
+def test_entry_expires_after_ttl(db_session: Session):
+    store_entry(db_session, "testcorp.com", "text", content_hash("text"), "http",
+                MOCK_PROFILE.model_dump(), "TestCorp", None)
+    entry = get_entry(db_session, "testcorp.com")
+    entry.fetched_at = datetime.now(timezone.utc) - timedelta(days=30)
+    db_session.commit()
+    with patch("app.services.scrape_cache.settings") as mock_settings:
+        mock_settings.SCRAPE_CACHE_TTL_SECONDS = 3600
+        assert not is_fresh(entry)
+
+
+def test_lru_eviction(db_session: Session):
+    """Entries beyond the limit are evicted least-recently-used first."""
+    base = datetime.now(timezone.utc) - timedelta(hours=1)
+    for i, domain in enumerate(["a.com", "b.com", "c.com"]):
+        db_session.add(ScrapeCacheEntry(
+            domain=domain, website_text="t", content_hash="h", company_profile={},
+            fetched_at=base, last_accessed_at=base + timedelta(minutes=i),
+        ))
+    db_session.commit()
+
+    # Touch a.com so b.com becomes the least recently used
+    get_entry(db_session, "a.com")
+
+    with patch("app.services.scrape_cache.settings") as mock_settings:
+        mock_settings.SCRAPE_CACHE_MAX_ENTRIES = 2
+        assert evict_lru(db_session) == 1
+
+    remaining = {e.domain for e in db_session.query(ScrapeCacheEntry).all()}
+    assert remaining == {"a.com", "c.com"}
+
+
+# --- Endpoint tests ---
+
+
+@patch("app.services.enrichment_pipeline.settings")
+@patch("app.services.enrichment_pipeline.run_searches", new_callable=AsyncMock)
+@patch("app.services.enrichment_pipeline.consolidate_results", new_callable=AsyncMock)
+@patch("app.services.enrichment_pipeline.extract_company_profile", new_callable=AsyncMock)
+@patch("app.services.enrichment_pipeline.scrape_website", new_callable=AsyncMock)
+def test_enrich_serves_cache_hit_for_same_domain(
+    mock_scrape: AsyncMock,
+    mock_extract: AsyncMock,
+    mock_search: AsyncMock,
+    mock_run_searches: AsyncMock,
+    mock_settings,
+    client: TestClient,
+) -> None:
+    """A second session for the same domain skips scrape, LLM and search."""
+    mock_settings.SEARCH_API_KEY = "test-key"
+    mock_run_searches.return_value = [[]]
+    mock_scrape.return_value = ScrapeResult(text="Some website text", tier="http")
+    mock_extract.return_value = MOCK_PROFILE
+    mock_search.return_value = WEB_RESEARCH
+
+    first = _create_session(client)
+    assert client.post(f"/api/v1/sessions/{first}/enrich").status_code == 200
+
+    second = _create_session(client, website="https://www.testcorp.com/sobre")
+    resp = client.post(f"/api/v1/sessions/{second}/enrich")
+    assert resp.status_code == 200
+    data = resp.json()["enrichment_data"]
+    assert data["scrape_tier"] == "cache"
+    assert data["segment"] == "Tecnologia"
+    assert data["web_research"] == WEB_RESEARCH
+
+    assert mock_scrape.await_count == 1
+    assert mock_extract.await_count == 1
+    assert mock_search.await_count == 1
+    assert mock_run_searches.await_count == 2  # base queries + segment query
+
+
+@patch("app.services.enrichment_pipeline.settings")
+@patch("app.services.enrichment_pipeline.run_searches", new_callable=AsyncMock)
+@patch("app.services.enrichment_pipeline.consolidate_results", new_callable=AsyncMock)
+@patch("app.services.enrichment_pipeline.extract_company_profile", new_callable=AsyncMock)
+@patch("app.services.enrichment_pipeline.scrape_website", new_callable=AsyncMock)
+def test_enrich_cache_hit_redoes_research_for_other_company_name(
+    mock_scrape: AsyncMock,
+    mock_extract: AsyncMock,
+    mock_search: AsyncMock,
+    mock_run_searches: AsyncMock,
+    mock_settings,
+    client: TestClient,
+) -> None:
+    """Same site under another company name: scrape and profile reused, research redone."""
+    mock_settings.SEARCH_API_KEY = "test-key"
+    mock_run_searches.return_value = [[]]
+    mock_scrape.return_value = ScrapeResult(text="Some website text", tier="http")
+    mock_extract.return_value = MOCK_PROFILE
+    other_research = {"company_description": "Outra empresa"}
+    mock_search.side_effect = [WEB_RESEARCH, other_research]
+
+    first = _create_session(client)
+    assert client.post(f"/api/v1/sessions/{first}/enrich").status_code == 200
+
+    second = _create_session(client, company_name="OtherCorp")
+    data = client.post(f"/api/v1/sessions/{second}/enrich").json()["enrichment_data"]
+    assert data["company_name"] == "OtherCorp"
+    assert data["scrape_tier"] == "cache"
+    assert data["web_research"] == other_research
+    assert mock_search.await_args.args[0] == "OtherCorp"
+
+    # The research for OtherCorp is now the cached one
+    third = _create_session(client, company_name="othercorp")
+    data = client.post(f"/api/v1/sessions/{third}/enrich").json()["enrichment_data"]
+    assert data["web_research"] == other_research
+
+    assert mock_scrape.await_count == 1
+    assert mock_extract.await_count == 1
+    assert mock_search.await_count == 2
+
+
+@patch("app.services.enrichment_pipeline.consolidate_results", new_callable=AsyncMock)
+@patch("app.services.enrichment_pipeline.extract_company_profile", new_callable=AsyncMock)
+@patch("app.services.enrichment_pipeline.scrape_website", new_callable=AsyncMock)
+def test_enrich_stale_entry_with_same_hash_skips_llm(
+    mock_scrape: AsyncMock,
+    mock_extract: AsyncMock,
+    mock_search: AsyncMock,
+    client: TestClient,
+    db_session: Session,
+) -> None:
+    """An expired entry is re-scraped, but unchanged content reuses the profile."""
+    mock_scrape.return_value = ScrapeResult(text="Same text", tier="http")
+    mock_search.return_value = None
+
+    store_entry(db_session, "testcorp.com", "Same text", content_hash("Same text"), "http",
+                MOCK_PROFILE.model_dump(), "TestCorp", None)
+    entry = db_session.get(ScrapeCacheEntry, "testcorp.com")
+    entry.fetched_at = datetime.now(timezone.utc) - timedelta(days=365)
+    db_session.commit()
+
+    session_id = _create_session(client)
+    resp = client.post(f"/api/v1/sessions/{session_id}/enrich")
+    assert resp.status_code == 200
+    data = resp.json()["enrichment_data"]
+    assert data["segment"] == "Tecnologia"
+    assert data["scrape_tier"] == "http"
+
+    mock_scrape.assert_awaited_once()
+    mock_extract.assert_not_awaited()
+
+
+@patch("app.services.enrichment_pipeline.consolidate_results", new_callable=AsyncMock)
+@patch("app.services.enrichment_pipeline.extract_company_profile", new_callable=AsyncMock)
+@patch("app.services.enrichment_pipeline.scrape_website", new_callable=AsyncMock)
+def test_enrich_does_not_cache_failed_extraction(
+    mock_scrape: AsyncMock,
+    mock_extract: AsyncMock,
+    mock_search: AsyncMock,
+    client: TestClient,
+    db_session: Session,
+) -> None:
+    """A minimal (name-only) profile is never cached."""
+    mock_scrape.return_value = ScrapeResult(text="Some text", tier="http")
+    mock_extract.return_value = CompanyProfile(company_name="TestCorp")
+    mock_search.return_value = None
+
+    session_id = _create_session(client)
+    assert client.post(f"/api/v1/sessions/{session_id}/enrich").status_code == 200
+    assert db_session.get(ScrapeCacheEntry, "testcorp.com") is None
@@ -5,6 +5,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from fastapi.testclient import TestClient
+from openai import OpenAIError
 from pydantic import ValidationError
 
 from app.models.schemas import (
@@ -14,8 +15,8 @@ from app.models.schemas import (
     SimulationResult,
     SimulationScenario,
 )
-from app.prompts.simulation import build_simulation_prompt
-from app.services.simulation import generate_simulation
+from app.prompts.simulation import build_simulation_prompt, static_prefix
+from app.services.simulation import _apply_sanity_checks, generate_simulation
 
 
 def _valid_report() -> OnboardingReport:
@@ -158,6 +159,15 @@ def test_prompt_includes_scenario_instructions():
     assert "escalated" in prompt or "no_resolution" in prompt
 
 
+def test_prompt_report_data_follows_static_prefix():
+    """Instructions and schema form a stable prefix; report data comes last."""
+    prompt = build_simulation_prompt(_valid_report())
+
+    assert prompt.startswith(static_prefix())
+    assert "SimulationResult" in static_prefix()
+    assert "CollectAI" not in static_prefix()
+
+
 # --- Schema Tests ---
 
 
@@ -182,6 +192,21 @@ def test_simulation_schema_invalid_resolution():
         SimulationResult(**data)
 
 
+def test_sanity_checks_flag_never_say_terms():
+    """Agent messages using a never_say term are flagged, accents and case ignored."""
+    data = _mock_simulation_response()
+    data["scenarios"][1]["conversation"][2]["content"] = "Seu nome vai para o SERASA e o SPC."
+    data["scenarios"][1]["conversation"][3]["content"] = "Vou te colocar no serasa!"  # debtor
+
+    warnings = _apply_sanity_checks(data, ["Serasa", "ação judicial", "spc"])
+
+    assert warnings == [
+        "Cenário 2: agente disse termo proibido 'Serasa'",
+        "Cenário 2: agente disse termo proibido 'spc'",
+    ]
+    assert _apply_sanity_checks(_mock_simulation_response(), ["Serasa"]) == []
+
+
 # --- Service Tests ---
 
 
@@ -195,7 +220,7 @@ async def test_generate_simulation():
     mock_response.choices = [MagicMock()]
     mock_response.choices[0].message.content = json.dumps(mock_data)
 
-    with patch("app.services.simulation.AsyncOpenAI") as mock_openai:
+    with patch("app.services.llm_gateway.get_llm_client") as mock_openai:
         mock_client = AsyncMock()
         mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
         mock_openai.return_value = mock_client
@@ -221,10 +246,10 @@ async def test_generate_retries_on_failure():
     mock_response.choices = [MagicMock()]
     mock_response.choices[0].message.content = json.dumps(mock_data)
 
-    with patch("app.services.simulation.AsyncOpenAI") as mock_openai:
+    with patch("app.services.llm_gateway.get_llm_client") as mock_openai:
         mock_client = AsyncMock()
         mock_client.chat.completions.create = AsyncMock(
-            side_effect=[Exception("API error"), mock_response]
+            side_effect=[OpenAIError("API error"), mock_response]
         )
         mock_openai.return_value = mock_client
 
@@ -237,17 +262,17 @@ async def test_generate_retries_on_failure():
 
 @pytest.mark.asyncio
 async def test_generate_both_attempts_fail():
-    """Both OpenAI calls fail → raises ValueError."""
+    """Every OpenAI call fails → raises ValueError."""
     report = _valid_report()
 
-    with patch("app.services.simulation.AsyncOpenAI") as mock_openai:
+    with patch("app.services.llm_gateway.get_llm_client") as mock_openai:
         mock_client = AsyncMock()
         mock_client.chat.completions.create = AsyncMock(
-            side_effect=[Exception("fail 1"), Exception("fail 2")]
+            side_effect=OpenAIError("fail")
         )
         mock_openai.return_value = mock_client
 
-        with pytest.raises(ValueError, match="2 tentativas"):
+        with pytest.raises(ValueError, match="Falha na geração"):
             await generate_simulation(report)
 
 
@@ -0,0 +1,70 @@
+"""Tests for accent-insensitive multi-phrase matching."""
+
+import pytest
+
+from app.prompts.agent_generator import SKIP_ANSWERS
+from app.services.interview_agent import FRUSTRATION_SIGNALS, _FRUSTRATION_MATCHER
+from app.utils.text_signals import SignalMatcher, fold, normalize
+
+
+def test_fold_strips_accents_and_case():
+    assert fold("Ligação  JÁ") == "ligacao  ja"
+
+
+def test_normalize_collapses_whitespace():
+    assert normalize("  Você\n deveria\tsaber ") == "voce deveria saber"
+
+
+def test_matcher_finds_overlapping_phrases():
+    matcher = SignalMatcher(["he", "she", "his", "hers"], whole_words=False)
+    assert matcher.find_all("ushers") == ["she", "he", "hers"]
+
+
+def test_matcher_whole_words():
+    matcher = SignalMatcher(["spc", "cansei"])
+    assert matcher.find_all("spcx cansei.") == ["cansei"]
+    assert matcher.search("nao cansei") == "cansei"
+    assert matcher.search("descansei") is None
+
+
+def test_matcher_stems_match_word_prefixes_only():
+    matcher = SignalMatcher(["parcel*", "mes"])
+    assert matcher.find_all("parcelamento todo mes") == ["parcel*", "mes"]
+    assert matcher.search("vamos reparcelar") is None
+    assert matcher.search("promessas") is None
+    assert matcher.search("mesmo assim") is None
+
+
+def test_matcher_returns_phrases_as_given():
+    matcher = SignalMatcher(["Ação Judicial", "acao judicial"])
+    assert len(matcher) == 1
+    assert matcher.search("haverá ACAO   judicial") == "Ação Judicial"
+
+
+def test_empty_matcher():
+    assert SignalMatcher([]).search("qualquer coisa") is None
+
+
+@pytest.mark.parametrize(
+    "answer",
+    [
+        "voce deveria saber isso",
+        "Já respondi",
+        "ja   respondi isso antes",
+        "ISSO É ÓBVIO!",
+        "Sério, que saco",
+    ],
+)
+def test_frustration_variants_detected(answer):
+    assert _FRUSTRATION_MATCHER.search(answer) is not None
+
+
+def test_frustration_matches_legacy_loop():
+    """Everything the old lowercase substring loop caught is still caught."""
+    for signal in FRUSTRATION_SIGNALS:
+        assert _FRUSTRATION_MATCHER.search(f"Olha, {signal.upper()}.") == signal
+
+
+@pytest.mark.parametrize("answer", ["Não", "nao", " N ", "Não respondida", "passo"])
+def test_skip_answers_normalized(answer):
+    assert normalize(answer) in SKIP_ANSWERS
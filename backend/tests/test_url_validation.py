@@ -5,7 +5,16 @@ from unittest.mock import patch
 
 import pytest
 
-from app.utils.url_validation import _is_private_ip, validate_url, validate_url_scheme
+from app.services.http_client import PinnedNetworkBackend, PinnedTransport, send_pinned
+from app.utils.url_validation import (
+    ValidatedURL,
+    _is_private_ip,
+    clear_dns_cache,
+    resolve_public_ips,
+    resolve_validated_url,
+    validate_url_async,
+    validate_url_scheme,
+)
 
 
 # ─── TestIsPrivateIp ─────────────────────────────────────────────────────────
@@ -145,103 +154,293 @@ def _mock_addrinfo(ip: str, family: int = socket.AF_INET):
 class TestValidateUrl:
     """Tests for the full validator (with DNS resolution)."""
 
+    @pytest.fixture(autouse=True)
+    def _fresh_cache(self):
+        clear_dns_cache()
+        yield
+        clear_dns_cache()
+
     # --- public IPs pass ---
 
+    @pytest.mark.asyncio
     @patch("app.utils.url_validation.socket.getaddrinfo")
-    def test_public_ip_passes(self, mock_dns) -> None:
+    async def test_public_ip_passes(self, mock_dns) -> None:
         mock_dns.return_value = _mock_addrinfo("93.184.216.34")
-        result = validate_url("https://example.com")
+        result = await validate_url_async("https://example.com")
         assert result == "https://example.com"
 
+    @pytest.mark.asyncio
     @patch("app.utils.url_validation.socket.getaddrinfo")
-    def test_public_ipv6_passes(self, mock_dns) -> None:
+    async def test_public_ipv6_passes(self, mock_dns) -> None:
         mock_dns.return_value = _mock_addrinfo("2606:4700::6810:85e5", socket.AF_INET6)
-        result = validate_url("https://example.com")
+        result = await validate_url_async("https://example.com")
         assert result == "https://example.com"
 
     # --- private IPs rejected via DNS ---
 
+    @pytest.mark.asyncio
     @patch("app.utils.url_validation.socket.getaddrinfo")
-    def test_rejects_dns_to_loopback(self, mock_dns) -> None:
+    async def test_rejects_dns_to_loopback(self, mock_dns) -> None:
         mock_dns.return_value = _mock_addrinfo("127.0.0.1")
         with pytest.raises(ValueError, match="private/reserved"):
-            validate_url("https://evil.com")
+            await validate_url_async("https://evil.com")
 
+    @pytest.mark.asyncio
     @patch("app.utils.url_validation.socket.getaddrinfo")
-    def test_rejects_dns_to_10_x(self, mock_dns) -> None:
+    async def test_rejects_dns_to_10_x(self, mock_dns) -> None:
         mock_dns.return_value = _mock_addrinfo("10.0.0.1")
         with pytest.raises(ValueError, match="private/reserved"):
-            validate_url("https://evil.com")
+            await validate_url_async("https://evil.com")
 
+    @pytest.mark.asyncio
     @patch("app.utils.url_validation.socket.getaddrinfo")
-    def test_rejects_dns_to_172_16(self, mock_dns) -> None:
+    async def test_rejects_dns_to_172_16(self, mock_dns) -> None:
         mock_dns.return_value = _mock_addrinfo("172.16.0.1")
         with pytest.raises(ValueError, match="private/reserved"):
-            validate_url("https://evil.com")
+            await validate_url_async("https://evil.com")
 
+    @pytest.mark.asyncio
     @patch("app.utils.url_validation.socket.getaddrinfo")
-    def test_rejects_dns_to_192_168(self, mock_dns) -> None:
+    async def test_rejects_dns_to_192_168(self, mock_dns) -> None:
         mock_dns.return_value = _mock_addrinfo("192.168.1.1")
         with pytest.raises(ValueError, match="private/reserved"):
-            validate_url("https://evil.com")
+            await validate_url_async("https://evil.com")
 
+    @pytest.mark.asyncio
     @patch("app.utils.url_validation.socket.getaddrinfo")
-    def test_rejects_dns_to_metadata(self, mock_dns) -> None:
+    async def test_rejects_dns_to_metadata(self, mock_dns) -> None:
         mock_dns.return_value = _mock_addrinfo("169.254.169.254")
         with pytest.raises(ValueError, match="private/reserved"):
-            validate_url("https://evil.com")
+            await validate_url_async("https://evil.com")
 
+    @pytest.mark.asyncio
     @patch("app.utils.url_validation.socket.getaddrinfo")
-    def test_rejects_dns_to_ipv6_loopback(self, mock_dns) -> None:
+    async def test_rejects_dns_to_ipv6_loopback(self, mock_dns) -> None:
         mock_dns.return_value = _mock_addrinfo("::1", socket.AF_INET6)
         with pytest.raises(ValueError, match="private/reserved"):
-            validate_url("https://evil.com")
+            await validate_url_async("https://evil.com")
 
+    @pytest.mark.asyncio
     @patch("app.utils.url_validation.socket.getaddrinfo")
-    def test_rejects_dns_to_ipv4_mapped_ipv6(self, mock_dns) -> None:
+    async def test_rejects_dns_to_ipv4_mapped_ipv6(self, mock_dns) -> None:
         mock_dns.return_value = _mock_addrinfo("::ffff:127.0.0.1", socket.AF_INET6)
         with pytest.raises(ValueError, match="private/reserved"):
-            validate_url("https://evil.com")
+            await validate_url_async("https://evil.com")
 
     # --- DNS rebinding: multiple IPs, one private ---
 
+    @pytest.mark.asyncio
     @patch("app.utils.url_validation.socket.getaddrinfo")
-    def test_rejects_if_any_ip_is_private(self, mock_dns) -> None:
+    async def test_rejects_if_any_ip_is_private(self, mock_dns) -> None:
         mock_dns.return_value = [
             (socket.AF_INET, socket.SOCK_STREAM, 6, "", ("93.184.216.34", 0)),
             (socket.AF_INET, socket.SOCK_STREAM, 6, "", ("10.0.0.1", 0)),
         ]
         with pytest.raises(ValueError, match="private/reserved"):
-            validate_url("https://rebind.example.com")
+            await validate_url_async("https://rebind.example.com")
 
     # --- unresolvable hostname ---
 
+    @pytest.mark.asyncio
     @patch("app.utils.url_validation.socket.getaddrinfo")
-    def test_rejects_unresolvable_hostname(self, mock_dns) -> None:
+    async def test_rejects_unresolvable_hostname(self, mock_dns) -> None:
         mock_dns.side_effect = socket.gaierror("Name resolution failed")
         with pytest.raises(ValueError, match="Could not resolve"):
-            validate_url("https://nonexistent.invalid")
+            await validate_url_async("https://nonexistent.invalid")
 
     # --- scheme-level blocks also apply ---
 
-    def test_file_scheme_blocked(self) -> None:
+    @pytest.mark.asyncio
+    async def test_file_scheme_blocked(self) -> None:
         with pytest.raises(ValueError, match="Scheme.*not allowed"):
-            validate_url("file:///etc/passwd")
+            await validate_url_async("file:///etc/passwd")
 
-    def test_localhost_blocked(self) -> None:
+    @pytest.mark.asyncio
+    async def test_localhost_blocked(self) -> None:
         with pytest.raises(ValueError, match="localhost.*not allowed"):
-            validate_url("https://localhost:8000/admin")
+            await validate_url_async("https://localhost:8000/admin")
 
     # --- literal public IP passes without DNS ---
 
-    def test_literal_public_ip_passes(self) -> None:
-        result = validate_url("https://93.184.216.34")
+    @pytest.mark.asyncio
+    async def test_literal_public_ip_passes(self) -> None:
+        result = await validate_url_async("https://93.184.216.34")
         assert result == "https://93.184.216.34"
 
     # --- no scheme → prepends https then resolves ---
 
+    @pytest.mark.asyncio
     @patch("app.utils.url_validation.socket.getaddrinfo")
-    def test_no_scheme_resolves(self, mock_dns) -> None:
+    async def test_no_scheme_resolves(self, mock_dns) -> None:
         mock_dns.return_value = _mock_addrinfo("93.184.216.34")
-        result = validate_url("example.com")
+        result = await validate_url_async("example.com")
         assert result == "https://example.com"
+
+
+# ─── TestValidateUrlAsync ─────────────────────────────────────────────────────
+
+
+class TestValidateUrlAsync:
+    """Tests for the non-blocking DNS resolution and its cache."""
+
+    @pytest.fixture(autouse=True)
+    def _fresh_cache(self):
+        clear_dns_cache()
+        yield
+        clear_dns_cache()
+
+    @pytest.mark.asyncio
+    @patch("app.utils.url_validation.socket.getaddrinfo")
+    async def test_vetted_resolution_is_cached(self, mock_dns) -> None:
+        mock_dns.return_value = _mock_addrinfo("93.184.216.34")
+        assert await resolve_public_ips("Example.com") == ["93.184.216.34"]
+        assert await resolve_public_ips("example.com") == ["93.184.216.34"]
+        assert mock_dns.call_count == 1
+
+    @pytest.mark.asyncio
+    @patch("app.utils.url_validation.socket.getaddrinfo")
+    async def test_private_resolution_is_not_cached(self, mock_dns) -> None:
+        mock_dns.return_value = _mock_addrinfo("127.0.0.1")
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                await resolve_public_ips("evil.com")
+        assert mock_dns.call_count == 2
+
+    @pytest.mark.asyncio
+    @patch("app.utils.url_validation.socket.getaddrinfo")
+    async def test_cache_entry_expires(self, mock_dns) -> None:
+        mock_dns.return_value = _mock_addrinfo("93.184.216.34")
+        with patch("app.utils.url_validation.time.monotonic", return_value=1000.0):
+            await resolve_public_ips("example.com")
+        with patch("app.utils.url_validation.time.monotonic", return_value=2000.0):
+            await resolve_public_ips("example.com")
+        assert mock_dns.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_literal_ip_skips_dns(self) -> None:
+        with patch("app.utils.url_validation.socket.getaddrinfo") as mock_dns:
+            assert await resolve_public_ips("93.184.216.34") == ["93.184.216.34"]
+        mock_dns.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_slow_dns_does_not_block_loop(self) -> None:
+        """Other coroutines keep running while a lookup is in flight."""
+        import asyncio
+        import time as _time
+
+        def slow_lookup(*args, **kwargs):
+            _time.sleep(0.2)
+            return _mock_addrinfo("93.184.216.34")
+
+        ticks = 0
+
+        async def ticker() -> None:
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        with patch("app.utils.url_validation.socket.getaddrinfo", side_effect=slow_lookup):
+            await resolve_public_ips("slow.example.com")
+        task.cancel()
+        assert ticks >= 5
+
+
+# ─── DNS pinning ──────────────────────────────────────────────────────────────
+
+
+class TestResolveValidatedUrl:
+    """resolve_validated_url() hands the vetted IPs to the fetcher."""
+
+    @pytest.fixture(autouse=True)
+    def _fresh_cache(self):
+        clear_dns_cache()
+        yield
+        clear_dns_cache()
+
+    @pytest.mark.asyncio
+    @patch("app.utils.url_validation.socket.getaddrinfo")
+    async def test_returns_vetted_ips(self, mock_dns) -> None:
+        mock_dns.return_value = [
+            (socket.AF_INET, socket.SOCK_STREAM, 6, "", ("93.184.216.34", 0)),
+            (socket.AF_INET6, socket.SOCK_STREAM, 6, "", ("2606:4700::6810:85e5", 0, 0, 0)),
+        ]
+        validated = await resolve_validated_url("https://Example.com/path")
+        assert validated.url == "https://Example.com/path"
+        assert validated.hostname == "example.com"
+        assert validated.ips == ("93.184.216.34", "2606:4700::6810:85e5")
+
+    @pytest.mark.asyncio
+    async def test_send_pinned_falls_back_to_next_ip(self) -> None:
+        import httpcore
+        import httpx
+
+        dialed: list[str] = []
+
+        class FakeBackend(httpcore.AsyncNetworkBackend):
+            async def connect_tcp(self, host, port, **kwargs):
+                dialed.append(host)
+                if host == "203.0.113.1":
+                    raise httpcore.ConnectError("unreachable")
+                return httpcore.AsyncMockStream(
+                    [b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\n", b"ok"]
+                )
+
+        transport = PinnedTransport(
+            httpx.Limits(), network_backend=PinnedNetworkBackend(FakeBackend())
+        )
+        client = httpx.AsyncClient(transport=transport)
+        validated = ValidatedURL(
+            url="http://example.com/", hostname="example.com",
+            ips=("203.0.113.1", "93.184.216.34"),
+        )
+        resp = await send_pinned(client, validated)
+        await resp.aread()
+        await resp.aclose()
+        await client.aclose()
+        assert resp.text == "ok"
+        assert dialed == ["203.0.113.1", "93.184.216.34"]
+        # The URL (Host header, SNI, pool key) keeps the hostname
+        assert resp.request.url.host == "example.com"
+
+    @pytest.mark.asyncio
+    async def test_unpinned_host_is_never_dialed(self) -> None:
+        import httpcore
+
+        with pytest.raises(httpcore.ConnectError, match="No vetted IPs"):
+            await PinnedNetworkBackend().connect_tcp("example.com", 443)
+
+    @pytest.mark.asyncio
+    async def test_hosts_sharing_an_ip_do_not_share_connections(self) -> None:
+        """Connections are pooled per hostname even when both hosts pin one IP."""
+        import asyncio
+
+        import httpx
+
+        connections = 0
+
+        async def serve(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            nonlocal connections
+            connections += 1
+            while await reader.readuntil(b"\r\n\r\n"):
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok")
+                await writer.drain()
+
+        server = await asyncio.start_server(serve, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        client = httpx.AsyncClient(transport=PinnedTransport(httpx.Limits()))
+        try:
+            for host in ("a.example", "b.example", "a.example"):
+                validated = ValidatedURL(
+                    url=f"http://{host}:{port}/", hostname=host, ips=("127.0.0.1",)
+                )
+                resp = await send_pinned(client, validated)
+                assert await resp.aread() == b"ok"
+                await resp.aclose()
+        finally:
+            await client.aclose()
+            server.close()
+
+        # a.example reuses its own connection; b.example never gets it
+        assert connections == 2
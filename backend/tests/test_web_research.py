@@ -8,10 +8,12 @@ from unittest.mock import AsyncMock, MagicMock, patch
 from app.models.schemas import WebResearchResult
 from app.prompts.web_research import build_consolidation_prompt
 from app.services.web_research import (
-    _build_search_queries,
     _consolidate_snippets,
     _run_search_query,
-    search_company,
+    build_base_queries,
+    build_segment_query,
+    consolidate_results,
+    run_searches,
 )
 
 
@@ -43,20 +45,19 @@ def test_web_research_result_schema():
 
 
 def test_build_search_queries_with_segment():
-    """With segment, query 3 searches sector collection dynamics."""
-    queries = _build_search_queries("Empresa ABC", "Construção Civil")
-    assert len(queries) == 3
+    """With segment, the sector query searches sector collection dynamics."""
+    queries = build_base_queries("Empresa ABC")
+    assert len(queries) == 2
     assert "Empresa ABC" in queries[0]
     assert "Empresa ABC" in queries[1]
-    assert "Construção Civil" in queries[2]
-    assert "inadimplência" in queries[2]
+    query = build_segment_query("Empresa ABC", "Construção Civil")
+    assert "Construção Civil" in query
+    assert "inadimplência" in query
 
 
 def test_build_search_queries_no_segment():
-    """Without segment, query 3 falls back to company + market."""
-    queries = _build_search_queries("Empresa ABC")
-    assert len(queries) == 3
-    assert "Empresa ABC" in queries[2]
+    """Without segment, the sector query falls back to company + market."""
+    assert "Empresa ABC" in build_segment_query("Empresa ABC")
 
 
 # --- Search query tests ---
@@ -117,7 +118,7 @@ async def test_run_search_query_empty_results(mock_client_cls: MagicMock):
 
 
 @pytest.mark.asyncio
-@patch("app.services.web_research.AsyncOpenAI")
+@patch("app.services.llm_gateway.get_llm_client")
 async def test_consolidate_snippets(mock_openai_cls: MagicMock):
     """LLM consolidation parses response into WebResearchResult fields."""
     consolidation_data = {
@@ -149,16 +150,22 @@ async def test_consolidate_snippets(mock_openai_cls: MagicMock):
     assert result["collection_relevant_insights"] == "Clientes PME com alta rotatividade"
 
 
-# --- Integration: search_company orchestrator ---
+# --- Integration: run_searches + consolidate_results ---
+
+
+async def _research(company_name: str) -> dict | None:
+    """Search and consolidation as the enrichment pipeline chains them."""
+    queries = [*build_base_queries(company_name), build_segment_query(company_name)]
+    return await consolidate_results(company_name, await run_searches(queries))
 
 
 @pytest.mark.asyncio
 @patch("app.services.web_research._consolidate_snippets", new_callable=AsyncMock)
 @patch("app.services.web_research._run_search_query", new_callable=AsyncMock)
-async def test_search_company_returns_result(
+async def test_research_returns_result(
     mock_search: AsyncMock, mock_consolidate: AsyncMock
 ):
-    """Happy path: search_company returns dict with 5 fields."""
+    """Happy path: search + consolidation return a dict with 5 fields."""
     mock_search.return_value = [
         {"title": "R1", "link": "https://a.com", "snippet": "S1"},
         {"title": "R2", "link": "https://b.com", "snippet": "S2"},
@@ -173,7 +180,7 @@ async def test_search_company_returns_result(
 
     with patch("app.services.web_research.settings") as mock_settings:
         mock_settings.SEARCH_API_KEY = "test-key"
-        result = await search_company("TestCorp", "https://testcorp.com")
+        result = await _research("TestCorp")
 
     assert result is not None
     assert result["company_description"] == "Desc"
@@ -185,32 +192,32 @@ async def test_search_company_returns_result(
 
 
 @pytest.mark.asyncio
-async def test_search_company_no_api_key():
+async def test_research_no_api_key():
     """Returns None when SEARCH_API_KEY is not set."""
     with patch("app.services.web_research.settings") as mock_settings:
         mock_settings.SEARCH_API_KEY = ""
-        result = await search_company("TestCorp", "https://testcorp.com")
+        result = await _research("TestCorp")
 
     assert result is None
 
 
 @pytest.mark.asyncio
 @patch("app.services.web_research._run_search_query", new_callable=AsyncMock)
-async def test_search_company_search_failure(mock_search: AsyncMock):
+async def test_research_search_failure(mock_search: AsyncMock):
     """Returns None when all search queries fail (empty results)."""
     mock_search.return_value = []
 
     with patch("app.services.web_research.settings") as mock_settings:
         mock_settings.SEARCH_API_KEY = "test-key"
-        result = await search_company("TestCorp", "https://testcorp.com")
+        result = await _research("TestCorp")
 
     assert result is None
 
 
 @pytest.mark.asyncio
-@patch("app.services.web_research.AsyncOpenAI")
+@patch("app.services.llm_gateway.get_llm_client")
 @patch("app.services.web_research._run_search_query", new_callable=AsyncMock)
-async def test_search_company_llm_failure(
+async def test_research_llm_failure(
     mock_search: AsyncMock, mock_openai_cls: MagicMock
 ):
     """Returns empty-fields dict when LLM consolidation fails."""
@@ -225,7 +232,7 @@ async def test_search_company_llm_failure(
     with patch("app.services.web_research.settings") as mock_settings:
         mock_settings.SEARCH_API_KEY = "test-key"
         mock_settings.OPENAI_API_KEY = "test-openai-key"
-        result = await search_company("TestCorp", "https://testcorp.com")
+        result = await _research("TestCorp")
 
     assert result is not None
     assert result["company_description"] == ""
@@ -247,7 +254,7 @@ async def test_snippets_deduplicated_by_link(
 
     with patch("app.services.web_research.settings") as mock_settings:
         mock_settings.SEARCH_API_KEY = "test-key"
-        await search_company("TestCorp", "https://testcorp.com")
+        await _research("TestCorp")
 
     # Consolidation should receive only 1 unique snippet, not 3
     call_args = mock_consolidate.call_args